@@ -57,6 +57,8 @@
 
 # backend/config.py
 
+import os
+
 # ──────────────────────────────────────────────
 # LLM Configuration
 # ──────────────────────────────────────────────
@@ -79,6 +81,7 @@ MAX_MCTS_DEPTH          = 3   # Max depth for MCTS planning tree
 R_MCTS_RETRIEVAL_TIMEOUT  = 4    # seconds per Wikipedia API call
 R_MCTS_RETRIEVAL_TOP_K    = 2    # snippets to fetch per (query, action) pair
 R_MCTS_MAX_DEPTH          = 3    # tree depth for R-MCTS
+R_MCTS_PREFETCH_WORKERS   = 6    # concurrent retrievals (one per candidate action)
 
 # WM-MCTS (World-Model-Guided MCTS)
 # Uses local LLM to score each candidate action before expanding
@@ -88,6 +91,8 @@ WM_MCTS_MAX_DEPTH         = 3    # tree depth for WM-MCTS
 # Seeds retriever once from Wikipedia before search starts
 RAG_MCTS_MAX_DEPTH        = 3    # tree depth for MCTS-RAG
 RAG_MCTS_SEED_LIMIT       = 2    # Wikipedia results to seed retriever with
+RAG_MCTS_RETRIEVER        = "lexical"    # "lexical" (mcts/rag_index.py) | "semantic" (mcts/semantic_index.py —
+                                         # shared store: one user's retrieved text can reach another's prompt)
 
 # ──────────────────────────────────────────────
 # Rate Limiting
@@ -101,6 +106,21 @@ REQUEST_TIMEOUT      = 10    # 10 seconds timeout for web requests
 # ──────────────────────────────────────────────
 MAX_SEARCH_RESULTS  = 8      # Limit search results for faster processing
 MAX_SCRAPE_CONTENT  = 3000   # Max characters for scraped content
+HTML_PARSER         = "lxml" # BeautifulSoup backend — falls back to html.parser if missing
+PARSE_POOL_WORKERS  = max((os.cpu_count() or 2) - 1, 1)   # parse processes (0 = parse inline)
+PARSE_POOL_TIMEOUT  = 15     # seconds to wait for one parse job
+
+# Streaming downloads (tools/stream_fetch.py) — byte cap per use case.
+# Result pages also stop early once the cards the extractors need are in.
+FETCH_CHUNK_SIZE    = 32 * 1024
+FETCH_MAX_BYTES     = {
+    "cookies":        0,                  # session warm-up — headers only
+    "api":            None,               # JSON APIs — never truncated
+    "search_results": 2 * 1024 * 1024,    # Amazon / Flipkart / Bing / DDG result pages
+    "product_page":   1536 * 1024,        # official store and generic price pages
+    "page":           1024 * 1024,        # planner page fetch (text kept: 3000 chars)
+    "scrape":         2 * 1024 * 1024,    # URL scraper (output kept: MAX_SCRAPE_CONTENT)
+}
 
 # ──────────────────────────────────────────────
 # E-commerce
@@ -113,7 +133,175 @@ PRICE_RANGE_MAX     = 500000  # Maximum valid price in INR
 # ──────────────────────────────────────────────────────────────────
 # E-commerce Tier Scraper Timeouts
 # ──────────────────────────────────────────────────────────────────
-TIER1_TIMEOUT   = 12    # Price comparison sites (smartprix, 91mobiles etc)
-TIER2_TIMEOUT   = 10    # Direct platform scraping (amazon, flipkart)
-TIER3_TIMEOUT   = 8     # Search engine snippets (bing)
-SCRAPE_RETRIES  = 2     # Retry attempts per platform
\ No newline at end of file
+TIER1_TIMEOUT   = 12    # Official brand stores / generic sites
+TIER2_TIMEOUT   = 10    # Direct platform scraping (amazon, flipkart, myntra)
+TIER3_TIMEOUT   = 8     # Search engine snippets (bing, ddg, direct site search)
+# Per-fetch timeouts above are further cut to the remaining overall
+# deadline (tools/deadline.py) when a comparison runs with one.
+PRICE_COMPARE_DEADLINE = None   # seconds — default overall budget for chat comparisons (None = unbounded)
+DEADLINE_FALLBACK_MIN  = 1.5    # seconds a fallback engine needs when its latency is unknown
+SCRAPE_RETRIES  = 2     # Retry attempts per platform
+
+# Per-platform circuit breaker (tools/platform_health.py)
+PLATFORM_BREAKER_THRESHOLD    = 3      # consecutive blocks/timeouts before opening
+PLATFORM_BREAKER_COOLDOWN     = 300    # seconds an open breaker skips the platform
+PLATFORM_BREAKER_MAX_COOLDOWN = 1800   # cap for the doubled cooldown after failed probes
+
+# Bulk comparison scheduler (tools/scheduler.py) — caps are global across
+# concurrent bulk requests and apply per fetched host (a domain covers its
+# subdomains); hosts not listed, e.g. each official store, get "default".
+BULK_MAX_PRODUCTS       = 100   # products per /ecommerce/bulk request (the rest are "skipped")
+BULK_MAX_WORKERS        = 8     # platform jobs in flight per bulk request
+BULK_DOMAIN_CONCURRENCY = {     # simultaneous fetches per host, all requests together
+    "default":        2,
+    "amazon.in":      2,
+    "flipkart.com":   2,
+    "myntra.com":     3,        # JSON API — tolerates more
+    "bing.com":       2,        # search fallbacks
+    "duckduckgo.com": 2,
+}
+
+
+# ──────────────────────────────────────────────────────────────────
+# Local cache directory (HTTP cache, indexes, learned statistics)
+# ──────────────────────────────────────────────────────────────────
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+# ──────────────────────────────────────────────────────────────────
+# Warm marketplace sessions (tools/session_pool.py)
+# ──────────────────────────────────────────────────────────────────
+SESSION_POOL_ENABLED = True
+SESSION_POOL_PATH    = os.path.join(CACHE_DIR, "sessions.json")   # cookie jars
+SESSION_POOL_SIZE    = 2       # idle warm sessions kept per platform
+SESSION_POOL_REFRESH = 1800    # seconds before a cookie jar is re-warmed
+
+
+# ──────────────────────────────────────────────────────────────────
+# Official-store catalog mirror (tools/catalog_mirror.py)
+# ──────────────────────────────────────────────────────────────────
+CATALOG_MIRROR_ENABLED    = True
+CATALOG_DB_PATH           = os.path.join(CACHE_DIR, "catalog.sqlite3")
+CATALOG_REFRESH           = 6 * 3600    # re-sync a Shopify catalog after this
+CATALOG_RETRY_NON_SHOPIFY = 7 * 86400   # re-probe sites without /products.json
+CATALOG_PAGE_LIMIT        = 250         # products per /products.json page (Shopify max)
+CATALOG_MAX_PAGES         = 40
+CATALOG_PAGE_DELAY        = 1.0         # seconds between pages — stay polite
+CATALOG_MIN_MATCH         = 0.6         # share of query tokens a title must contain
+
+
+# ──────────────────────────────────────────────────────────────────
+# Retrieval backends + cache shared by R-MCTS and MCTS-RAG (mcts/retrieval.py)
+# ──────────────────────────────────────────────────────────────────
+RETRIEVAL_BACKENDS          = ("bm25", "wikipedia")   # tried in order until one has results
+BM25_INDEX_DIR              = os.path.join(CACHE_DIR, "bm25")   # python -m mcts.bm25 build <corpus>
+BM25_K1                     = 1.2
+BM25_B                      = 0.75
+RETRIEVAL_CACHE_ENABLED     = True
+RETRIEVAL_CACHE_TTL         = 24 * 3600   # seconds a search result is reused
+RETRIEVAL_CACHE_EMPTY_TTL   = 300         # seconds an empty result is reused (memory only)
+RETRIEVAL_CACHE_MAX_ENTRIES = 5000        # least recently used terms evicted
+RETRIEVAL_CACHE_PATH        = os.path.join(CACHE_DIR, "retrieval.json")   # None = memory only
+RETRIEVAL_CACHE_SAVE_EVERY  = 20          # persist after this many new terms
+
+
+# ──────────────────────────────────────────────────────────────────
+# MCTS-RAG semantic chunk store (mcts/semantic_index.py)
+# ──────────────────────────────────────────────────────────────────
+RAG_EMBED_DIM              = 512     # hashed n-gram embedding size
+RAG_LSH_TABLES             = 16      # random-projection hash tables
+RAG_LSH_BITS               = 12      # hyperplanes per table (2^bits buckets)
+RAG_LSH_MIN_SIZE           = 5000    # below this many chunks, scan exactly
+RAG_SEMANTIC_MIN_SIM       = 0.16    # cosine similarity a store chunk needs (precision 1.0 on the docstring check)
+RAG_CHUNK_STORE_DIR        = os.path.join(CACHE_DIR, "rag_chunks")
+RAG_CHUNK_STORE_MAX        = 20000   # newest chunks kept (~40 MB of vectors)
+RAG_CHUNK_STORE_SAVE_EVERY = 50      # persist after this many new chunks
+
+
+# ──────────────────────────────────────────────────────────────────
+# LLM plan-score cache for WM-MCTS / MCTS-RAG (mcts/eval_cache.py)
+# ──────────────────────────────────────────────────────────────────
+EVAL_CACHE_ENABLED     = True
+EVAL_CACHE_DB_PATH     = os.path.join(CACHE_DIR, "eval_cache.sqlite3")
+EVAL_CACHE_TTL         = 7 * 86400   # seconds an LLM plan rating is reused
+EVAL_CACHE_MAX_ENTRIES = 20000       # in-memory tier (LRU)
+
+
+# ──────────────────────────────────────────────────────────────────
+# Distilled plan-value model (mcts/value_model.py)
+# ──────────────────────────────────────────────────────────────────
+VALUE_MODEL_MODE        = "front"   # "off" | "front" (LLM when uncertain) | "replace"
+VALUE_MODEL_PATH        = os.path.join(CACHE_DIR, "value_model.npz")   # python -m mcts.value_model train
+VALUE_MODEL_MAX_STD     = 0.75      # "front": predictions less certain than this go to the LLM
+VALUE_MODEL_RIDGE       = 1.0       # L2 prior strength
+VALUE_MODEL_MIN_SAMPLES = 50        # logged LLM ratings needed before training
+
+
+# ──────────────────────────────────────────────────────────────────
+# Cross-request action statistics for MCTS warm starts (mcts/action_stats.py)
+# ──────────────────────────────────────────────────────────────────
+ACTION_STATS_ENABLED      = True
+ACTION_STATS_PATH         = os.path.join(CACHE_DIR, "action_stats.json")
+ACTION_STATS_HALF_LIFE    = 3 * 86400   # seconds for learned visits to lose half their weight
+ACTION_STATS_PRIOR_WEIGHT = 0.1         # pseudo-visits per aggregated visit
+ACTION_STATS_MAX_PRIOR    = 3.0         # cap, so a few real simulations can still overrule
+ACTION_STATS_SAVE_EVERY   = 10          # persist after this many recorded searches
+
+
+# ──────────────────────────────────────────────────────────────────
+# Memoized plans of query-independent variants (mcts/plan_memo.py)
+# ──────────────────────────────────────────────────────────────────
+PLAN_MEMO_ENABLED     = False              # opt-in: seeds Basic-MCTS, so each category always gets one plan
+PLAN_MEMO_SEED        = 7                  # RNG seed of memoized searches; None = global RNG, no memo
+PLAN_MEMO_SIMULATIONS = tuple(range(1, 16))  # the only simulation counts memoized (built at startup)
+
+# ──────────────────────────────────────────────────────────────────
+# Price result cache per (product, platform) (tools/price_cache.py)
+# ──────────────────────────────────────────────────────────────────
+PRICE_CACHE_ENABLED      = True
+PRICE_CACHE_TTL          = {          # seconds a scraped price counts as fresh
+    "default":  900,
+    "amazon":   600,
+    "flipkart": 600,
+    "myntra":   1800,
+    "official": 3600,                 # brand stores reprice rarely
+    "fallback": 1800,                 # Bing / DDG / direct-search snippets
+}
+PRICE_CACHE_NEGATIVE_TTL = 120        # "no price found" is remembered this long
+PRICE_CACHE_MAX_STALE    = 2 * 3600   # never serve a price staler than ttl + this
+PRICE_CACHE_STALE_WHILE_REVALIDATE = True   # stale price now, refresh in background
+PRICE_CACHE_MAX_ENTRIES  = 5000
+
+
+# ──────────────────────────────────────────────────────────────────
+# Canonical product keys + resolved product pages (tools/product_index.py)
+# ──────────────────────────────────────────────────────────────────
+PRODUCT_INDEX_PATH        = os.path.join(CACHE_DIR, "product_index.json")
+PRODUCT_INDEX_MAX_AGE     = 7 * 86400   # re-resolve product pages after a week
+PRODUCT_INDEX_MAX_ENTRIES = 5000        # least recently seen products evicted
+PRODUCT_INDEX_SAVE_EVERY  = 5           # persist after this many updates
+
+
+# ──────────────────────────────────────────────────────────────────
+# Adaptive selector ordering (tools/selector_stats.py)
+# ──────────────────────────────────────────────────────────────────
+SELECTOR_STATS_PATH       = os.path.join(CACHE_DIR, "selector_stats.json")
+SELECTOR_STATS_DECAY      = 0.8   # per-scrape decay — lower adapts faster to layout changes
+SELECTOR_STATS_SAVE_EVERY = 10    # persist after this many recorded scrapes
+
+
+# ──────────────────────────────────────────────────────────────────
+# HTTP Response Cache (tools/http_cache.py)
+# ──────────────────────────────────────────────────────────────────
+HTTP_CACHE_ENABLED      = True
+HTTP_CACHE_DIR          = os.path.join(CACHE_DIR, "http")
+HTTP_CACHE_DEFAULT_TTL  = 300     # seconds — when origin sends no freshness info
+HTTP_CACHE_MAX_STALE    = 86400   # never serve a copy staler than this (SWR / errors)
+HTTP_CACHE_STALE_WHILE_REVALIDATE = False   # serve stale + refresh in background
+HTTP_CACHE_MAX_BYTES    = 512 * 1024 * 1024   # on-disk cap — least recently used entries go first
+# Per-domain fresh lifetimes (seconds) — replace origin Cache-Control freshness;
+# serving them stale still follows HTTP_CACHE_STALE_WHILE_REVALIDATE.
+# Matches the host and any subdomain ("wikipedia.org" covers "en.wikipedia.org").
+HTTP_CACHE_DOMAIN_TTL   = {
+    "wikipedia.org": 6 * 3600,    # API sends max-age=0 — search results change slowly
+}
@@ -187,12 +187,12 @@
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from models import QueryRequest
 from agent import handle_query
 from tools.mail import send_email, fetch_unread_emails
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import traceback
 
 app = FastAPI()
@@ -214,6 +214,31 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def start_workers():
+    """Start the warm session pool and the catalog mirror; build the plan memo table when enabled."""
+    from tools import session_pool, catalog_mirror
+    from mcts import plan_memo
+    session_pool.start()
+    catalog_mirror.start()
+    plan_memo.build()
+
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    """Stop background workers and flush learned selector / product / retrieval data."""
+    from tools import parse_pool, selector_stats, product_index, session_pool, catalog_mirror
+    from mcts import retrieval, semantic_index, action_stats
+    session_pool.stop()
+    catalog_mirror.stop()
+    parse_pool.shutdown()
+    selector_stats.save()
+    product_index.save()
+    retrieval.save()
+    semantic_index.save()
+    action_stats.save()
+
+
 # ------------------------------------------------------------------
 # Request models
 # ------------------------------------------------------------------
@@ -236,6 +261,17 @@ class MCTSVariantRequest(BaseModel):
     simulations: Optional[int] = 5
 
 
+class CompareRequest(BaseModel):
+    query:  str                       # e.g. "compare hp laptop prices"
+    format: str = "ndjson"            # stream only: ndjson | sse
+    deadline: Optional[float] = None  # seconds — unfinished platforms come back "timed_out"
+
+
+class BulkCompareRequest(BaseModel):
+    products: List[str]               # e.g. ["hp laptop", "boat airdopes 141"]
+    deadline: Optional[float] = None  # seconds for the whole batch
+
+
 class BenchmarkRequest(BaseModel):
     query:       str
     simulations: Optional[int] = 5
@@ -288,6 +324,73 @@ def fetch_emails_endpoint():
     return {"message": result}
 
 
+# ------------------------------------------------------------------
+# Structured price comparison
+# ------------------------------------------------------------------
+
+@app.post("/ecommerce/compare")
+def ecommerce_compare(request: CompareRequest):
+    """Typed per-platform price records (price, rating, source, latency, cache age)."""
+    from tools.ecommerce import compare_prices
+    return compare_prices(request.query, request.deadline)
+
+
+@app.post("/ecommerce/compare/stream")
+def ecommerce_compare_stream(request: CompareRequest):
+    """
+    Streams one event per platform as soon as its scrape finishes:
+    start → result × N → done. format = "ndjson" (one JSON object per
+    line) or "sse" (text/event-stream, event name = event field).
+    """
+    import json
+    from tools.ecommerce import compare_prices_stream
+
+    sse = request.format.lower() == "sse"
+
+    def _events():
+        for ev in compare_prices_stream(request.query, request.deadline):
+            data = json.dumps(ev, ensure_ascii=False)
+            yield f"event: {ev['event']}\ndata: {data}\n\n" if sse else data + "\n"
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ------------------------------------------------------------------
+# Bulk price comparison
+# ------------------------------------------------------------------
+
+@app.post("/ecommerce/bulk")
+def ecommerce_bulk(request: BulkCompareRequest):
+    """
+    Price a list of products at once — platform fetches are scheduled
+    globally (per-host caps, round-robin across platforms, shared
+    sessions). Returns per-product comparisons, products/min,
+    per-platform success rates and the products skipped over
+    BULK_MAX_PRODUCTS.
+    """
+    from tools.scheduler import compare_bulk
+    return compare_bulk(request.products, request.deadline)
+
+
+# ------------------------------------------------------------------
+# E-commerce platform health
+# ------------------------------------------------------------------
+
+@app.get("/ecommerce/health")
+def ecommerce_health():
+    """Circuit-breaker state per platform / fallback engine, price cache, session pool and catalog mirror."""
+    from tools.platform_health import snapshot
+    from tools.price_cache import stats
+    from tools import session_pool, catalog_mirror
+    return {"platforms": snapshot(), "price_cache": stats(),
+            "session_pool": session_pool.snapshot(),
+            "catalog_mirror": catalog_mirror.stats()}
+
+
 # ------------------------------------------------------------------
 # MCTS variant endpoint
 # ------------------------------------------------------------------
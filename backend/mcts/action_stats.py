@@ -0,0 +1,190 @@
+# backend/mcts/action_stats.py
+"""
+Persistent action-value statistics that warm-start the planning trees.
+
+Every run_* call used to start from an empty tree, although the action
+pools come from four fixed categories (mcts/categories.py) and the same
+branches win again and again. After each search, record() folds the
+tree's visit counts and rewards into aggregated statistics per
+(variant, category):
+
+  actions  action → [visits, total reward]
+  pairs    "previous>action" → [visits, total reward]  ("^" = root)
+
+New searches take a priors() snapshot. Children created during the
+search are seeded with pseudo-visits at their prior mean, with the pair
+statistic preferred over the single-action one:
+
+  visits  min(prior visits × ACTION_STATS_PRIOR_WEIGHT, ACTION_STATS_MAX_PRIOR)
+  reward  visits × prior mean
+
+Random-expansion variants can also expand the best-known action first.
+Good plans therefore show up in the first few simulations, which matters
+at the 3–5 simulations the endpoints allow. Statistics decay with a
+half-life of ACTION_STATS_HALF_LIFE seconds, so stale knowledge fades.
+They persist to ACTION_STATS_PATH.
+"""
+
+import json
+import os
+import threading
+import time
+
+from config import (
+    ACTION_STATS_ENABLED, ACTION_STATS_PATH, ACTION_STATS_HALF_LIFE,
+    ACTION_STATS_PRIOR_WEIGHT, ACTION_STATS_MAX_PRIOR, ACTION_STATS_SAVE_EVERY,
+)
+from mcts.categories import category
+
+ROOT     = "^"
+_MIN_N   = 0.05          # decayed entries below this many visits are dropped
+
+_lock    = threading.Lock()
+_data    = None          # variant → category → {"t", "actions", "pairs"}
+_pending = 0
+
+
+# ──────────────────────────────────────────────────────────────────
+# Storage
+# ──────────────────────────────────────────────────────────────────
+def _load():
+    global _data
+    if _data is None:
+        try:
+            with open(ACTION_STATS_PATH, 'r', encoding='utf-8') as f:
+                _data = json.load(f)
+        except (OSError, ValueError):
+            _data = {}
+    return _data
+
+
+def _save_locked():
+    global _pending
+    try:
+        os.makedirs(os.path.dirname(ACTION_STATS_PATH), exist_ok=True)
+        tmp = f"{ACTION_STATS_PATH}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(_data, f, indent=1)
+        os.replace(tmp, ACTION_STATS_PATH)
+        _pending = 0
+    except OSError:
+        pass
+
+
+def _table_locked(variant: str, cat: str) -> dict:
+    """Statistics of (variant, category), decayed to now."""
+    now   = time.time()
+    table = _load().setdefault(variant, {}).setdefault(
+        cat, {"t": now, "actions": {}, "pairs": {}})
+    factor = 0.5 ** (max(now - table["t"], 0.0) / ACTION_STATS_HALF_LIFE)
+    if factor < 1.0:
+        for kind in ("actions", "pairs"):
+            stats = table[kind]
+            for key, (n, q) in list(stats.items()):
+                if n * factor < _MIN_N:
+                    del stats[key]
+                else:
+                    stats[key] = [n * factor, q * factor]
+        table["t"] = now
+    return table
+
+
+# ──────────────────────────────────────────────────────────────────
+# Warm start
+# ──────────────────────────────────────────────────────────────────
+class Priors:
+    """Snapshot of one (variant, category) for the duration of a search."""
+
+    def __init__(self, actions: dict = None, pairs: dict = None):
+        self.actions = actions or {}
+        self.pairs   = pairs or {}
+
+    def __bool__(self):
+        return bool(self.actions)
+
+    def prior(self, steps):
+        """(visits, mean reward) for the last step of steps, or None."""
+        if not steps:
+            return None
+        prev  = steps[-2] if len(steps) > 1 else ROOT
+        entry = self.pairs.get(f"{prev}>{steps[-1]}") or self.actions.get(steps[-1])
+        if not entry or entry[0] <= 0:
+            return None
+        return entry[0], entry[1] / entry[0]
+
+    def seed(self, node):
+        """Give a freshly created child its prior pseudo-visits."""
+        p = self.prior(node.state.steps)
+        if p is None:
+            return node
+        n0 = min(p[0] * ACTION_STATS_PRIOR_WEIGHT, ACTION_STATS_MAX_PRIOR)
+        node._prior_visits      = n0
+        node._prior_reward      = n0 * p[1]
+        node._number_of_visits += n0
+        node._total_reward     += n0 * p[1]
+        return node
+
+    def best(self, steps, actions):
+        """The action with the best prior mean after steps, or None if none is known."""
+        scored = [(p[1], a) for a in actions
+                  for p in [self.prior(list(steps) + [a])] if p is not None]
+        return max(scored)[1] if scored else None
+
+
+def priors(variant: str, query: str) -> Priors:
+    if not ACTION_STATS_ENABLED:
+        return Priors()
+    with _lock:
+        table = _table_locked(variant, category(query))
+        return Priors({k: tuple(v) for k, v in table["actions"].items()},
+                      {k: tuple(v) for k, v in table["pairs"].items()})
+
+
+def record(variant: str, query: str, root):
+    """Fold a finished search tree's real visits and rewards into the statistics."""
+    global _pending
+    if not ACTION_STATS_ENABLED:
+        return
+    updates, stack = [], list(root.children)
+    while stack:
+        node = stack.pop()
+        stack.extend(node.children)
+        steps = node.state.steps
+        n = node.n - getattr(node, "_prior_visits", 0.0)
+        q = node.q - getattr(node, "_prior_reward", 0.0)
+        if steps and n > 0:
+            prev = steps[-2] if len(steps) > 1 else ROOT
+            updates.append((steps[-1], f"{prev}>{steps[-1]}", n, q))
+    if not updates:
+        return
+    with _lock:
+        table = _table_locked(variant, category(query))
+        for action, pair, n, q in updates:
+            for stats, key in ((table["actions"], action), (table["pairs"], pair)):
+                cur = stats.get(key, [0.0, 0.0])
+                stats[key] = [cur[0] + n, cur[1] + q]
+        _pending += 1
+        if _pending >= ACTION_STATS_SAVE_EVERY:
+            _save_locked()
+
+
+def save():
+    """Flush pending updates (FastAPI shutdown hook)."""
+    with _lock:
+        if _data is not None and _pending:
+            _save_locked()
+
+
+def snapshot() -> dict:
+    """Best-known actions per variant and category (mean reward, visits)."""
+    with _lock:
+        out = {}
+        for variant, cats in _load().items():
+            for cat in list(cats):
+                table = _table_locked(variant, cat)
+                ranked = sorted(((q / n, n, a) for a, (n, q) in table["actions"].items()
+                                 if n > 0), reverse=True)
+                out.setdefault(variant, {})[cat] = [
+                    {"action": a, "mean": round(m, 2), "visits": round(n, 1)}
+                    for m, n, a in ranked]
+        return out
@@ -270,10 +270,14 @@ def run_benchmark_action(
 
     # ── Run all 4 variants ────────────────────────────────────────
     raw_results = []
+    from mcts import plan_memo
     for variant_key, runner in VARIANT_RUNNERS.items():
         try:
             t0     = time.perf_counter()
-            result = runner(planning_query, simulations)
+            if variant_key in plan_memo.PURE:      # time the real search, not a memo lookup
+                result = plan_memo.search(variant_key, planning_query, simulations)
+            else:
+                result = runner(planning_query, simulations)
             elapsed = (time.perf_counter() - t0) * 1000
 
             # Override time if variant provides its own (more accurate)
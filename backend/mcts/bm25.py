@@ -0,0 +1,257 @@
+# backend/mcts/bm25.py
+"""
+Local BM25 index — offline retrieval backend for R-MCTS / MCTS-RAG.
+
+Build once from a local corpus, then mcts/retrieval.py answers searches
+in-process instead of calling the Wikipedia API:
+
+  python -m mcts.bm25 build enwiki-latest-abstract.xml.gz   # from backend/
+  python -m mcts.bm25 build corpus.jsonl --out .cache/bm25
+  python -m mcts.bm25 query "budget gaming laptop" -k 3
+
+Corpus formats: Wikipedia abstract dumps (.xml / .xml.gz, <doc> with
+<title> and <abstract>), JSON lines ({"title", "text"}) or plain text
+(one document per line).
+
+On-disk layout (BM25_INDEX_DIR):
+  meta.json     document count, average length, k1, b
+  vocab.json    term → [offset, df] into the postings arrays
+  docs.npy      int32 doc ids, grouped by term (postings)
+  tfs.npy       uint16 term frequencies, parallel to docs.npy
+  doc_len.npy   int32 token count per document
+  text.bin      "title\\ttext" of every document, UTF-8, concatenated
+  text_off.npy  int64 start offset of each document in text.bin
+
+The arrays are opened with mmap_mode="r": a cold start reads only the
+vocabulary; postings and document text are paged in on demand.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import threading
+from array import array
+
+import numpy as np
+
+from config import BM25_INDEX_DIR, BM25_K1, BM25_B
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOP  = frozenset(
+    "a an and are as at be by for from has he in is it its of on or that the "
+    "to was were will with this which who what how".split())
+_TF_MAX = np.iinfo(np.uint16).max
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN.findall((text or "").lower())
+            if len(t) > 1 and t not in _STOP]
+
+
+# ──────────────────────────────────────────────────────────────────
+# Corpus readers → (title, text)
+# ──────────────────────────────────────────────────────────────────
+def _read_abstracts(path: str):
+    import xml.etree.ElementTree as ET
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        title = None
+        for _, el in ET.iterparse(f, events=("end",)):
+            if el.tag == "title":
+                title = (el.text or "").removeprefix("Wikipedia: ")
+            elif el.tag == "abstract":
+                text = (el.text or "").strip()
+                if title and text:
+                    yield title, text
+            elif el.tag == "doc":
+                el.clear()
+
+
+def _read_jsonl(path: str):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            try:
+                d = json.loads(line)
+            except ValueError:
+                continue
+            if d.get("text"):
+                yield d.get("title", ""), d["text"]
+
+
+def _read_lines(path: str):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.strip():
+                yield "", line.strip()
+
+
+def read_corpus(path: str):
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".xml"):
+        return _read_abstracts(path)
+    if name.endswith((".jsonl", ".json")):
+        return _read_jsonl(path)
+    return _read_lines(path)
+
+
+# ──────────────────────────────────────────────────────────────────
+# Build
+# ──────────────────────────────────────────────────────────────────
+def build(corpus: str, out_dir: str = BM25_INDEX_DIR, k1: float = BM25_K1,
+          b: float = BM25_B) -> dict:
+    """Index corpus into out_dir; returns the meta dict."""
+    os.makedirs(out_dir, exist_ok=True)
+    postings = {}                                  # term → (array docs, array tfs)
+    doc_len  = array("i")
+    offsets  = array("q")
+    pos      = 0
+    with open(os.path.join(out_dir, "text.bin"), "wb") as text_out:
+        for doc_id, (title, text) in enumerate(read_corpus(corpus)):
+            counts = {}
+            for tok in tokenize(f"{title} {text}"):
+                counts[tok] = counts.get(tok, 0) + 1
+            for tok, tf in counts.items():
+                p = postings.get(tok)
+                if p is None:
+                    p = postings[tok] = (array("i"), array("H"))
+                p[0].append(doc_id)
+                p[1].append(min(tf, _TF_MAX))
+            doc_len.append(sum(counts.values()))
+            raw = f"{title}\t{text}".encode("utf-8")
+            offsets.append(pos)
+            text_out.write(raw)
+            pos += len(raw)
+    offsets.append(pos)
+
+    vocab, start = {}, 0
+    docs = np.empty(sum(len(d) for d, _ in postings.values()), dtype=np.int32)
+    tfs  = np.empty(len(docs), dtype=np.uint16)
+    for tok in sorted(postings):
+        d, t = postings[tok]
+        docs[start:start + len(d)] = d
+        tfs[start:start + len(t)]  = t
+        vocab[tok] = [start, len(d)]
+        start += len(d)
+
+    lengths = np.frombuffer(doc_len, dtype=np.int32) if len(doc_len) else np.zeros(0, np.int32)
+    meta = {"docs": len(doc_len), "avgdl": float(lengths.mean()) if len(lengths) else 0.0,
+            "terms": len(vocab), "postings": int(len(docs)), "k1": k1, "b": b}
+    np.save(os.path.join(out_dir, "docs.npy"), docs)
+    np.save(os.path.join(out_dir, "tfs.npy"), tfs)
+    np.save(os.path.join(out_dir, "doc_len.npy"), lengths)
+    np.save(os.path.join(out_dir, "text_off.npy"), np.frombuffer(offsets, dtype=np.int64))
+    with open(os.path.join(out_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(vocab, f)
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+    return meta
+
+
+# ──────────────────────────────────────────────────────────────────
+# Query
+# ──────────────────────────────────────────────────────────────────
+class Index:
+    """Memory-mapped BM25 index built by build()."""
+
+    def __init__(self, path: str = BM25_INDEX_DIR):
+        def _np(name):
+            return np.load(os.path.join(path, name), mmap_mode="r")
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, "vocab.json"), encoding="utf-8") as f:
+            self.vocab = json.load(f)
+        self.docs, self.tfs = _np("docs.npy"), _np("tfs.npy")
+        self.doc_len, self.text_off = _np("doc_len.npy"), _np("text_off.npy")
+        self.text = np.memmap(os.path.join(path, "text.bin"), dtype=np.uint8, mode="r") \
+            if self.text_off[-1] else np.zeros(0, np.uint8)
+
+    def document(self, doc_id: int) -> tuple:
+        """(title, text) of a document."""
+        raw = bytes(self.text[self.text_off[doc_id]:self.text_off[doc_id + 1]])
+        title, _, text = raw.decode("utf-8", errors="replace").partition("\t")
+        return title, text
+
+    def search(self, query: str, k: int = 3) -> list:
+        """Top-k [(score, doc_id)] for query, best first."""
+        n, avgdl = self.meta["docs"], self.meta["avgdl"] or 1.0
+        k1, b    = self.meta["k1"], self.meta["b"]
+        ids, contrib = [], []
+        for tok in set(tokenize(query)):
+            entry = self.vocab.get(tok)
+            if entry is None:
+                continue
+            start, df = entry
+            docs = self.docs[start:start + df]
+            tf   = self.tfs[start:start + df].astype(np.float32)
+            idf  = np.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            norm = k1 * (1.0 - b + b * self.doc_len[docs] / avgdl)
+            ids.append(docs)
+            contrib.append(idf * tf * (k1 + 1.0) / (tf + norm))
+        if not ids:
+            return []
+        uniq, inv = np.unique(np.concatenate(ids), return_inverse=True)
+        scores    = np.bincount(inv, weights=np.concatenate(contrib))
+        k         = min(k, len(uniq))
+        top       = np.argpartition(-scores, k - 1)[:k]
+        top       = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), int(uniq[i])) for i in top]
+
+
+_lock   = threading.Lock()
+_index  = None
+_loaded = False
+
+
+def default_index():
+    """Index at BM25_INDEX_DIR, or None when none was built."""
+    global _index, _loaded
+    with _lock:
+        if not _loaded:
+            _loaded = True
+            try:
+                _index = Index(BM25_INDEX_DIR)
+            except (OSError, ValueError):
+                _index = None
+        return _index
+
+
+def search(term: str, limit: int = 2) -> list:
+    """Snippets ("Title: text", ≤400 chars) — None when no local index exists."""
+    index = default_index()
+    if index is None:
+        return None
+    out = []
+    for _, doc_id in index.search(term, limit):
+        title, text = index.document(doc_id)
+        out.append((f"{title}: {text}" if title else text)[:400])
+    return out
+
+
+def main(argv=None):
+    ap  = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    bp  = sub.add_parser("build", help="index a corpus file")
+    bp.add_argument("corpus")
+    bp.add_argument("--out", default=BM25_INDEX_DIR)
+    qp  = sub.add_parser("query", help="search the index")
+    qp.add_argument("query")
+    qp.add_argument("-k", type=int, default=3)
+    qp.add_argument("--index", default=BM25_INDEX_DIR)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        meta = build(args.corpus, args.out)
+        print(f"✅ {meta['docs']} documents, {meta['terms']} terms, "
+              f"{meta['postings']} postings → {args.out}")
+    else:
+        index = Index(args.index)
+        for score, doc_id in index.search(args.query, args.k):
+            title, text = index.document(doc_id)
+            print(f"{score:7.3f}  {title or '-'}: {text[:120]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# backend/mcts/categories.py
+"""
+Task categories of the planning variants.
+
+Every variant picks its action pool from the same keyword test on the
+lower-cased query, checked in this order (first match wins):
+
+  shopping  buy, purchase, compare, price, shop
+  travel    plan, book, trip, schedule, itinerary
+  research  analyze, data, research, study
+  generic   anything else
+
+(Basic-MCTS also sends "itinerary" to travel; the other variants only
+differ there.) Learned components key their statistics by category, so
+what was learned from "buy a laptop" applies to "compare phone prices".
+"""
+
+CATEGORIES = ("shopping", "travel", "research", "generic")
+
+KEYWORDS = (
+    ("shopping", ("buy", "purchase", "compare", "price", "shop")),
+    ("travel",   ("plan", "book", "trip", "schedule", "itinerary")),
+    ("research", ("analyze", "data", "research", "study")),
+)
+
+
+def category(query: str) -> str:
+    q = (query or "").lower()
+    for name, words in KEYWORDS:
+        if any(w in q for w in words):
+            return name
+    return "generic"
@@ -0,0 +1,166 @@
+# backend/mcts/eval_cache.py
+"""
+Shared plan-evaluation cache for the LLM-scored MCTS variants.
+
+WM-MCTS and MCTS-RAG ask the LLM to rate (task, steps) plans.
+/mcts/benchmark-action runs the variants back to back on the same
+planning query, and the planner functions send the same prompts for
+every user, so the same plan is rated again and again. get_or_score()
+puts two tiers in front of the LLM:
+
+  memory  LRU of EVAL_CACHE_MAX_ENTRIES scores
+  SQLite  EVAL_CACHE_DB_PATH — survives restarts, shared by workers
+
+key     mode + full normalized query (lower-case, whitespace collapsed)
+        + the exact step tuple; mode keeps the rubrics apart ("wm"
+        rates the plan alone, "rag" rates it against retrieved context)
+        + for "rag", a hash of that context: the context changes between
+        requests, and a rating made against one context is not reused
+        for another
+ttl     EVAL_CACHE_TTL seconds
+
+Only LLM ratings are stored. When the LLM is unreachable the variants
+fall back to their heuristics, which are cheap to recompute and must not
+pin a stand-in score once the LLM is back. The stored ratings double as
+the training log of the distilled value model (mcts/value_model.py),
+which get_or_score() consults between the cache and the LLM.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import (
+    EVAL_CACHE_ENABLED, EVAL_CACHE_DB_PATH, EVAL_CACHE_TTL, EVAL_CACHE_MAX_ENTRIES,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    key        TEXT PRIMARY KEY,
+    mode       TEXT NOT NULL,
+    query      TEXT,
+    steps      TEXT,
+    score      REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+_lock    = threading.Lock()
+_db      = None
+_memory  = OrderedDict()     # key → (created_at, score)
+_stats   = {"memory": 0, "disk": 0, "miss": 0}
+
+
+def _conn():
+    global _db
+    if _db is None:
+        os.makedirs(os.path.dirname(EVAL_CACHE_DB_PATH), exist_ok=True)
+        _db = sqlite3.connect(EVAL_CACHE_DB_PATH, check_same_thread=False)
+        _db.executescript(_SCHEMA)
+    return _db
+
+
+def normalize(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+def cache_key(query: str, steps, mode: str, context: str = None) -> str:
+    parts = [mode, normalize(query), *steps]
+    if context is not None:
+        parts.append("ctx:" + hashlib.sha1(context.encode("utf-8")).hexdigest())
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _remember_locked(key: str, created_at: float, score: float):
+    _memory[key] = (created_at, score)
+    _memory.move_to_end(key)
+    while len(_memory) > EVAL_CACHE_MAX_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def lookup(query: str, steps, mode: str, context: str = None):
+    """Cached LLM score for the plan (rated against context), or None."""
+    if not EVAL_CACHE_ENABLED:
+        return None
+    key = cache_key(query, steps, mode, context)
+    now = time.time()
+    with _lock:
+        entry = _memory.get(key)
+        if entry and now - entry[0] < EVAL_CACHE_TTL:
+            _memory.move_to_end(key)
+            _stats["memory"] += 1
+            return entry[1]
+        try:
+            row = _conn().execute("SELECT score, created_at FROM scores WHERE key = ?",
+                                  (key,)).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row and now - row[1] < EVAL_CACHE_TTL:
+            _remember_locked(key, row[1], row[0])
+            _stats["disk"] += 1
+            return row[0]
+        _stats["miss"] += 1
+    return None
+
+
+def store(query: str, steps, mode: str, score: float, context: str = None):
+    """Remember an LLM score for the plan in both tiers."""
+    if not EVAL_CACHE_ENABLED:
+        return
+    key = cache_key(query, steps, mode, context)
+    now = time.time()
+    with _lock:
+        _remember_locked(key, now, score)
+        try:
+            db = _conn()
+            db.execute("INSERT OR REPLACE INTO scores VALUES (?,?,?,?,?,?)",
+                       (key, mode, normalize(query), " -> ".join(steps), score, now))
+            db.commit()
+        except sqlite3.Error:
+            pass
+
+
+def get_or_score(query: str, steps, mode: str, score_fn, context: str = None) -> tuple:
+    """
+    (score, source) for the plan; source is "cache", "model" (confident
+    value-model prediction), "llm" or "fallback". score_fn() →
+    (score, from_llm) runs only when neither cache nor model answers;
+    its score is cached only when from_llm is true. context is the text
+    the LLM rates the plan against ("rag"); it is part of the cache key.
+    The value model does not see it (mcts/value_model.py).
+    """
+    from mcts import value_model
+
+    steps = tuple(steps)
+    score = lookup(query, steps, mode, context)
+    if score is not None:
+        return score, "cache"
+    score = value_model.score(mode, query, steps)
+    if score is not None:
+        return score, "model"
+    score, from_llm = score_fn()
+    if from_llm:
+        store(query, steps, mode, score, context)
+    return score, "llm" if from_llm else "fallback"
+
+
+def rows(mode: str = None):
+    """Logged LLM ratings → (mode, query, steps tuple, score) (value-model training)."""
+    with _lock:
+        data = _conn().execute(
+            "SELECT mode, query, steps, score FROM scores"
+            + (" WHERE mode = ?" if mode else ""), (mode,) if mode else ()).fetchall()
+    for m, q, steps, score in data:
+        yield m, q, tuple(steps.split(" -> ")) if steps else (), score
+
+
+def stats() -> dict:
+    with _lock:
+        try:
+            rows = _conn().execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        except sqlite3.Error:
+            rows = None
+        return {**_stats, "memory_entries": len(_memory), "disk_entries": rows}
@@ -0,0 +1,100 @@
+# backend/mcts/plan_memo.py
+"""
+Plan memoization for variants whose result is a pure function of the
+query category.
+
+Basic-MCTS never looks at the query text beyond its keyword category
+(mcts/categories.py): the action pool and the evaluate() heuristic
+depend only on the category, and with a seeded RNG the whole search is
+a function of (category, depth, simulations, seed). /ask,
+plan_lead_generation, plan_monitor and plan_qa_test still reran that
+search on every call.
+
+PURE lists such variants. For them get() serves the plan and score from
+a table keyed by (variant, category, depth, simulations, seed). build()
+fills the table at startup. Only the simulation counts in
+PLAN_MEMO_SIMULATIONS are memoized, which bounds the table; any other
+count runs a search. Responses carry "memoized": true/false and the
+"category" they were resolved to. A memoized response's time_ms is the
+lookup time; search_time_ms is the time of the search behind it.
+Benchmarks call search(), which always runs the search.
+
+Memoization is opt-in (PLAN_MEMO_ENABLED). Seeding changes behaviour:
+every query of a category gets the same plan. When memoization is off,
+or PLAN_MEMO_SEED is None, the variants use the global RNG as before and
+nothing is memoized.
+"""
+
+import threading
+import time
+
+from config import PLAN_MEMO_ENABLED, PLAN_MEMO_SEED, PLAN_MEMO_SIMULATIONS, MAX_MCTS_DEPTH
+from mcts.categories import CATEGORIES, KEYWORDS, category
+
+# variant key → (loader of its raw search function, tree depth)
+PURE = {
+    "basic-mcts": (lambda: _variant("basic_mcts.py").search, MAX_MCTS_DEPTH),
+}
+
+# a query that resolves to each category (what build() plans for)
+SAMPLE_QUERY = {name: words[0] for name, words in KEYWORDS}
+SAMPLE_QUERY["generic"] = "general task"
+
+_lock  = threading.Lock()
+_table = {}              # (variant, category, depth, simulations, seed) → result
+
+
+def _variant(filename: str):
+    from mcts.variants import _load_variant
+    return _load_variant(filename)
+
+
+def memoizable(variant: str) -> bool:
+    return PLAN_MEMO_ENABLED and PLAN_MEMO_SEED is not None and variant in PURE
+
+
+def search(variant: str, query: str, simulations: int) -> dict:
+    """Run the variant's search without the table (benchmarks time the real search)."""
+    loader, _ = PURE[variant]
+    seed = PLAN_MEMO_SEED if memoizable(variant) else None
+    return dict(loader()(query, simulations, seed), memoized=False,
+                category=category(query))
+
+
+def get(variant: str, query: str, simulations: int) -> dict:
+    """Result of the variant for query — from the table when it is pure."""
+    loader, depth = PURE[variant]
+    if not memoizable(variant) or simulations not in PLAN_MEMO_SIMULATIONS:
+        return search(variant, query, simulations)
+
+    t0  = time.perf_counter()
+    cat = category(query)
+    key = (variant, cat, depth, simulations, PLAN_MEMO_SEED)
+    with _lock:
+        hit = _table.get(key)
+    if hit is not None:
+        return dict(hit, plan=list(hit["plan"]), memoized=True, category=cat,
+                    time_ms=round((time.perf_counter() - t0) * 1000, 3),
+                    search_time_ms=hit["time_ms"])
+    result = loader()(query, simulations, PLAN_MEMO_SEED)
+    with _lock:
+        _table[key] = dict(result, plan=list(result["plan"]))
+    return dict(result, memoized=False, category=cat)
+
+
+def build() -> int:
+    """Precompute every pure variant × category × PLAN_MEMO_SIMULATIONS (startup hook)."""
+    if not PLAN_MEMO_ENABLED or PLAN_MEMO_SEED is None:
+        return 0
+    built = 0
+    for variant in PURE:
+        for cat in CATEGORIES:
+            for sims in PLAN_MEMO_SIMULATIONS:
+                get(variant, SAMPLE_QUERY[cat], sims)
+                built += 1
+    return built
+
+
+def stats() -> dict:
+    with _lock:
+        return {"entries": len(_table), "seed": PLAN_MEMO_SEED}
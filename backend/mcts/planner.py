@@ -223,7 +223,6 @@ import re
 import time
 import random
 import requests
-from bs4 import BeautifulSoup
 
 
 def _ensure_path():
@@ -270,63 +269,203 @@ def _run_mcts(query: str, variant_key: str = "basic-mcts",
 # Shared web helpers
 # ──────────────────────────────────────────────────────────────────
 def _fetch_page(url: str, timeout: int = 10) -> dict:
-    """Fetch a URL and return structured content."""
+    """Fetch a URL (through the on-disk HTTP cache) and return structured content."""
+    _ensure_path()
+    from tools.http_cache import cached_get
+    from tools import parse_pool
+    from tools.extractors import extract_page
     try:
-        s = _session()
-        r = s.get(url, timeout=timeout)
+        r = cached_get(url, session=_session(), timeout=timeout, use_case="page")
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, 'html.parser')
-        for tag in soup(['script', 'style', 'nav', 'footer']):
-            tag.decompose()
-        text     = soup.get_text(separator=' ', strip=True)
-        title    = (soup.find('h1') or soup.find('title'))
-        headings = [h.get_text(strip=True) for h in soup.find_all(['h2','h3'])[:6]]
-        paras    = [p.get_text(strip=True) for p in soup.find_all('p')
-                    if len(p.get_text()) > 60][:5]
-        emails   = list(set(re.findall(
-            r'\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Z|a-z]{2,}\b', text)))[:5]
-        phones   = list(set(re.findall(r'(?:\+91[\s\-]?)?[6-9]\d{9}', text)))[:3]
-        prices   = list(set(re.findall(r'₹\s*[\d,]+', text)))[:5]
-        return {
+        page = parse_pool.run(extract_page, r.content, url, parse_pool.charset(r))
+        page.update({
             "url":      url,
-            "title":    title.get_text(strip=True)[:100] if title else url,
-            "headings": headings,
-            "paras":    paras,
-            "emails":   emails,
-            "phones":   phones,
-            "prices":   prices,
-            "text":     text[:3000],
             "status":   r.status_code,
             "load_ms":  0,
             "size_kb":  len(r.content) / 1024,
+            "truncated": r.truncated,
             "headers":  dict(r.headers),
-        }
+        })
+        return page
     except Exception as e:
         return {"url": url, "error": str(e)[:80]}
 
 
+def _instrumented_fetch(url: str, timeout: int = 10, max_redirects: int = 5) -> dict:
+    """
+    Single GET with per-phase timings (curl-style, per final hop):
+      dns_ms      — getaddrinfo
+      connect_ms  — TCP handshake
+      tls_ms      — TLS handshake (0 for http)
+      ttfb_ms     — hop start → response headers received
+      download_ms — headers → last body byte
+      total_ms    — whole fetch including redirects
+    Body is returned decompressed; size_bytes vs transfer_bytes shows
+    the compression saving. Raises on network errors.
+
+    This is a raw socket client: it ignores proxy settings and cookies.
+    Use _timed_fetch(), which falls back to requests when it cannot apply.
+    """
+    import socket
+    import ssl
+    import zlib
+    import http.client
+    from urllib.parse import urlsplit, urljoin
+    from requests.structures import CaseInsensitiveDict
+
+    t_start   = time.perf_counter()
+    redirects = 0
+    while True:
+        parts = urlsplit(url)
+        https = parts.scheme == "https"
+        host  = parts.hostname
+        port  = parts.port or (443 if https else 80)
+        path  = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        t0    = time.perf_counter()
+        addrs = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        t_dns = time.perf_counter()
+        for i, addr in enumerate(addrs):          # every resolved address, in order
+            sock = socket.socket(addr[0], addr[1], addr[2])
+            sock.settimeout(timeout)
+            try:
+                sock.connect(addr[4])
+                break
+            except OSError:
+                sock.close()
+                if i == len(addrs) - 1:
+                    raise
+        try:
+            t_conn = time.perf_counter()
+            if https:
+                sock = ssl.create_default_context().wrap_socket(
+                    sock, server_hostname=host)
+            t_tls = time.perf_counter()
+
+            conn = (http.client.HTTPSConnection if https else
+                    http.client.HTTPConnection)(host, port, timeout=timeout)
+            conn.sock = sock
+            conn.request("GET", path, headers={
+                "User-Agent":      random.choice(_UA),
+                "Accept":          "text/html,application/xhtml+xml,*/*;q=0.8",
+                "Accept-Language": "en-IN,en;q=0.9",
+                "Accept-Encoding": "gzip, deflate",
+                "Connection":      "close",
+            })
+            resp    = conn.getresponse()
+            t_first = time.perf_counter()
+            raw     = resp.read()
+            t_end   = time.perf_counter()
+            headers = CaseInsensitiveDict(resp.getheaders())
+        finally:
+            sock.close()
+
+        location = headers.get("Location")
+        if resp.status in (301, 302, 303, 307, 308) and location \
+                and redirects < max_redirects:
+            url        = urljoin(url, location)
+            redirects += 1
+            continue
+        break
+
+    encoding = (headers.get("Content-Encoding") or "").lower()
+    body     = raw
+    try:
+        if encoding == "gzip":
+            body = zlib.decompress(raw, 16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            try:
+                body = zlib.decompress(raw)
+            except zlib.error:
+                body = zlib.decompress(raw, -zlib.MAX_WBITS)
+    except zlib.error:
+        body = raw
+
+    m = re.search(r'charset=([\w\-]+)', headers.get("Content-Type", ""), re.I)
+    return {
+        "url":            url,
+        "status":         resp.status,
+        "headers":        headers,
+        "body":           body,
+        "charset":        m.group(1) if m else None,
+        "size_bytes":     len(body),
+        "transfer_bytes": len(raw),
+        "redirects":      redirects,
+        "timings": {
+            "dns_ms":      (t_dns - t0) * 1000,
+            "connect_ms":  (t_conn - t_dns) * 1000,
+            "tls_ms":      (t_tls - t_conn) * 1000,
+            "ttfb_ms":     (t_first - t0) * 1000,
+            "download_ms": (t_end - t_first) * 1000,
+            "total_ms":    (t_end - t_start) * 1000,
+        },
+    }
+
+
+def _requests_fetch(url: str, timeout: int = 10) -> dict:
+    """_instrumented_fetch() result shape via requests — no per-phase timings."""
+    import requests
+    t0 = time.perf_counter()
+    r  = requests.get(url, headers={"User-Agent": random.choice(_UA),
+                                    "Accept-Language": "en-IN,en;q=0.9"},
+                      timeout=timeout)
+    total = (time.perf_counter() - t0) * 1000
+    return {
+        "url":            r.url,
+        "status":         r.status_code,
+        "headers":        r.headers,
+        "body":           r.content,
+        "charset":        r.encoding,
+        "size_bytes":     len(r.content),
+        "transfer_bytes": int(r.headers["Content-Length"])
+                          if r.headers.get("Content-Length", "").isdigit() else None,
+        "redirects":      len(r.history),
+        "timings": {
+            "dns_ms": None, "connect_ms": None, "tls_ms": None,
+            "ttfb_ms":     r.elapsed.total_seconds() * 1000,
+            "download_ms": None,
+            "total_ms":    total,
+        },
+    }
+
+
+def _timed_fetch(url: str, timeout: int = 10) -> dict:
+    """
+    _instrumented_fetch(), or _requests_fetch() when a proxy is configured
+    for the scheme or the raw client fails on a connection or protocol
+    error (the rest of the app goes through requests, which honours
+    proxies). Timeouts are re-raised: the target already had the full
+    budget, and a second download would double both time and requests.
+    """
+    import socket
+    import http.client
+    import urllib.request
+    from urllib.parse import urlsplit
+    if urlsplit(url).scheme not in urllib.request.getproxies():
+        try:
+            return _instrumented_fetch(url, timeout=timeout)
+        except (TimeoutError, socket.timeout):
+            raise
+        except (OSError, http.client.HTTPException):
+            pass
+    return _requests_fetch(url, timeout=timeout)
+
+
 def _bing_search(query: str, n: int = 5) -> list:
     """Search Bing and return list of (title, url, snippet) tuples."""
+    _ensure_path()
+    from tools import parse_pool, stream_fetch
+    from tools.extractors import extract_bing_results
     try:
         q   = query.replace(' ', '+')
         url = f"https://www.bing.com/search?q={q}&mkt=en-IN"
         s   = _session("https://www.bing.com/")
-        r   = s.get(url, timeout=8)
+        r   = stream_fetch.get(url, "search_results", session=s,
+                               stop="bing_results", timeout=8)
         if r.status_code != 200:
             return []
-        soup    = BeautifulSoup(r.text, 'html.parser')
-        results = []
-        for item in soup.select('li.b_algo')[:n]:
-            title_el   = item.select_one('h2 a')
-            snippet_el = item.select_one('p, .b_caption p')
-            if title_el:
-                results.append({
-                    "title":   title_el.get_text(strip=True)[:100],
-                    "url":     title_el.get('href', ''),
-                    "snippet": snippet_el.get_text(strip=True)[:200] if snippet_el else '',
-                })
-        return results
+        return parse_pool.run(extract_bing_results, r.content, n, parse_pool.charset(r))
     except Exception:
         return []
 
@@ -1163,38 +1302,45 @@ Provide a complete checklist.""")
     run_seo         = any(s in ' '.join(plan).lower() for s in
                           ['research','compare','alternatives'])
 
-    # Always run core checks
-    page = _fetch_page(url, timeout=REQUEST_TIMEOUT)
-    results = {}
+    # One instrumented fetch, one parse — shared by every check below
+    try:
+        fetch = _timed_fetch(url, timeout=REQUEST_TIMEOUT)
+    except Exception as e:
+        out += f"❌ Could not access URL: {str(e)[:80]}\n"
+        return out
 
-    if not page or "error" in page:
-        out += f"❌ Could not access URL: {page.get('error','unknown') if page else 'failed'}\n"
+    status       = fetch["status"]
+    resp_headers = fetch["headers"]
+    timing       = fetch["timings"]
+    if status != 200:
+        out += f"❌ Could not access URL: HTTP {status}\n"
         return out
 
-    soup = BeautifulSoup(requests.get(
-        url, headers={"User-Agent": random.choice(_UA)}, timeout=REQUEST_TIMEOUT
-    ).text, 'html.parser')
+    from tools.http_cache import store_response
+    from tools.html_parse import parse_html
+    # body is already decoded — drop the wire-format headers, key by the final URL
+    store_response(fetch["url"], status,
+                   {k: v for k, v in resp_headers.items()
+                    if k.lower() not in ("content-encoding", "content-length",
+                                         "transfer-encoding")},
+                   fetch["body"])
+
+    soup    = parse_html(fetch["body"], from_encoding=fetch["charset"])
+    results = {}
 
     # --- Core: always run ---
     # HTTP
-    load_ms = page.get("load_ms", 0)
-    import time as _t
-    t0 = _t.time()
-    try:
-        _r = requests.get(url, headers={"User-Agent": random.choice(_UA)},
-                          timeout=REQUEST_TIMEOUT)
-        load_ms = (_t.time() - t0) * 1000
-        status  = _r.status_code
-        resp_headers = dict(_r.headers)
-    except Exception:
-        status = 0
-        resp_headers = {}
-
+    load_ms = timing["total_ms"]
     results["HTTP Status"] = {
         "passed":  status == 200,
         "details": [
             f"Status: {status} {'✅ OK' if status==200 else '❌'}",
             f"Load time: {load_ms:.0f}ms {'✅ Fast' if load_ms<2000 else '⚠️  Slow (>2s)'}",
+            (f"Timing: DNS {timing['dns_ms']:.0f}ms | Connect {timing['connect_ms']:.0f}ms | "
+             f"TLS {timing['tls_ms']:.0f}ms | TTFB {timing['ttfb_ms']:.0f}ms"
+             if timing["dns_ms"] is not None else
+             f"Timing: TTFB {timing['ttfb_ms']:.0f}ms (no per-phase breakdown via proxy)"),
+            f"Redirects: {fetch['redirects']}",
             f"Content-Type: {resp_headers.get('Content-Type','?')[:50]}",
         ]
     }
@@ -1272,13 +1418,19 @@ Provide a complete checklist.""")
 
     # --- MCTS-activated: Performance (if plan includes analyze steps) ---
     if run_performance or deep_test:
-        page_kb = page.get("size_kb", 0)
+        page_kb = fetch["size_bytes"] / 1024
+        wire_kb = (fetch["transfer_bytes"] or fetch["size_bytes"]) / 1024
         scripts = len(soup.find_all('script'))
         css     = len(soup.find_all('link', {'rel':'stylesheet'}))
         results["Performance"] = {
             "passed":  page_kb < 500,
             "details": [
                 f"Page size: {page_kb:.1f} KB {'✅' if page_kb<500 else '⚠️  Large — consider optimization'}",
+                f"Transfer:  {wire_kb:.1f} KB "
+                f"({resp_headers.get('Content-Encoding') or 'uncompressed'})",
+                (f"Download:  {timing['download_ms']:.0f}ms after first byte"
+                 if timing["download_ms"] is not None else
+                 f"Total:     {timing['total_ms']:.0f}ms"),
                 f"Scripts:   {scripts} {'✅' if scripts<10 else '⚠️  Many (check for unused)'}",
                 f"CSS files: {css}",
                 f"Forms:     {len(soup.find_all('form'))}",
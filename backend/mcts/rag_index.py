@@ -0,0 +1,68 @@
+# backend/mcts/rag_index.py
+"""
+Vectorized chunk ranking for MCTS-RAG.
+
+MCTS-RAG ranks its seeded chunks against the task on every evaluate().
+ChunkIndex tokenizes the chunks once (lower-cased whitespace tokens, as
+before) into a binary chunk × term matrix in CSR form:
+
+  indptr   int64 [n_chunks + 1]  row boundaries into indices
+  indices  int32 [nnz]           term ids of each chunk's distinct tokens
+  rows     int32 [nnz]           chunk id of each entry (for bincount)
+
+A query becomes a 0/1 vector over the vocabulary, and the overlap of
+every chunk is one gather + bincount (the sparse dot product). top(q, k)
+selects the best k with argpartition instead of sorting all chunks.
+Ties keep chunk order, so results equal the previous sorted() ranking.
+Rankings are memoized per query — the RAG task text is the same for
+every evaluate() of a search.
+"""
+
+import numpy as np
+
+
+class ChunkIndex:
+
+    def __init__(self, chunks: list):
+        self.chunks = list(chunks)
+        self.vocab  = {}
+        indices, indptr = [], [0]
+        for chunk in self.chunks:
+            ids = {self.vocab.setdefault(w, len(self.vocab)) for w in chunk.lower().split()}
+            indices.extend(sorted(ids))
+            indptr.append(len(indices))
+        self.indptr  = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.rows    = np.repeat(np.arange(len(self.chunks), dtype=np.int32),
+                                 np.diff(self.indptr))
+        self._memo   = {}
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def scores(self, query: str) -> np.ndarray:
+        """Distinct query tokens found in each chunk (float array, one per chunk)."""
+        q = np.zeros(len(self.vocab) + 1, dtype=np.float32)    # last slot: unknown words
+        for w in set(query.lower().split()):
+            q[self.vocab.get(w, len(self.vocab))] = 1.0
+        q[-1] = 0.0
+        return np.bincount(self.rows, weights=q[self.indices], minlength=len(self.chunks))
+
+    def top(self, query: str, k: int = 3) -> list:
+        """The k chunks sharing the most tokens with query, best first."""
+        key = (query, k)
+        if key in self._memo:
+            return self._memo[key]
+        n = len(self.chunks)
+        if not n or k <= 0:
+            return []
+        s = self.scores(query)
+        if k < n:
+            kth  = s[np.argpartition(-s, k - 1)[:k]].min()        # k-th largest score
+            cand = np.flatnonzero(s >= kth)                       # ...and every tie with it
+        else:
+            cand = np.arange(n)
+        order = cand[np.lexsort((cand, -s[cand]))][:k]            # score desc, then chunk order
+        out   = [self.chunks[i] for i in order]
+        self._memo[key] = out
+        return out
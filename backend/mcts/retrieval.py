@@ -0,0 +1,229 @@
+# backend/mcts/retrieval.py
+"""
+Retrieval for the retrieval-backed MCTS variants — pluggable backends
+behind a shared cache.
+
+R-MCTS (one search per (query, action) term) and MCTS-RAG (one seed
+search per query) both call search(term, limit). The backends named in
+RETRIEVAL_BACKENDS are tried in order until one returns snippets:
+
+  bm25       local BM25 index (mcts/bm25.py) — in-process, works
+             offline; skipped while no index has been built
+  wikipedia  Wikipedia search API
+
+register(name, fn) adds a backend; fn(term, limit, timeout, agent)
+returns a list of snippets, or None when it cannot answer.
+
+Results of remote backends are kept across requests, so the
+near-identical prompts the planner functions send for every user
+(plan_research, plan_job_search ...) are answered without a round trip.
+
+  key        backend + normalized term (lower-case, punctuation dropped,
+             whitespace collapsed) + result limit
+  freshness  RETRIEVAL_CACHE_TTL seconds; failed searches are not cached,
+             empty results (outage, rate limit) only for
+             RETRIEVAL_CACHE_EMPTY_TTL and never written to disk
+  bound      LRU, RETRIEVAL_CACHE_MAX_ENTRIES terms in memory
+  disk       with RETRIEVAL_CACHE_PATH set, entries persist as JSON every
+             RETRIEVAL_CACHE_SAVE_EVERY new terms and on shutdown, so a
+             restart begins warm
+  threads    concurrent searches for the same key share one fetch
+
+search() returns (snippets, hit) so each variant can report its cache
+hits next to its retrieved-snippet counters.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from config import (
+    RETRIEVAL_BACKENDS, RETRIEVAL_CACHE_ENABLED, RETRIEVAL_CACHE_TTL,
+    RETRIEVAL_CACHE_EMPTY_TTL,
+    RETRIEVAL_CACHE_MAX_ENTRIES, RETRIEVAL_CACHE_PATH, RETRIEVAL_CACHE_SAVE_EVERY,
+)
+
+WIKI = "https://en.wikipedia.org/w/api.php"
+
+_lock     = threading.Lock()
+_entries  = None          # key → [stored_at, snippets] (OrderedDict, LRU order)
+_inflight = {}            # key → Event set when the fetch finished
+_pending  = 0             # new entries since the last save
+_stats    = {"hit": 0, "miss": 0}
+
+
+def normalize(term: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", (term or "").lower()).split())
+
+
+# ──────────────────────────────────────────────────────────────────
+# Storage
+# ──────────────────────────────────────────────────────────────────
+def _load():
+    global _entries
+    if _entries is None:
+        _entries = OrderedDict()
+        if RETRIEVAL_CACHE_PATH:
+            try:
+                with open(RETRIEVAL_CACHE_PATH, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for key, entry in sorted(data.items(), key=lambda kv: kv[1][0]):
+                    _entries[key] = entry
+            except (OSError, ValueError):
+                pass
+    return _entries
+
+
+def _save_locked():
+    global _pending
+    if not RETRIEVAL_CACHE_PATH:
+        return
+    try:
+        os.makedirs(os.path.dirname(RETRIEVAL_CACHE_PATH), exist_ok=True)
+        tmp = f"{RETRIEVAL_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({k: e for k, e in _entries.items() if e[1]}, f)
+        os.replace(tmp, RETRIEVAL_CACHE_PATH)
+        _pending = 0
+    except OSError:
+        pass
+
+
+def _get_locked(key):
+    entry = _load().get(key)
+    if entry is None:
+        return None
+    ttl = RETRIEVAL_CACHE_TTL if entry[1] else RETRIEVAL_CACHE_EMPTY_TTL
+    if time.time() - entry[0] >= ttl:
+        del _entries[key]
+        return None
+    _entries.move_to_end(key)
+    return entry[1]
+
+
+def _put_locked(key, snippets: list):
+    global _pending
+    _load()[key] = [time.time(), snippets]
+    _entries.move_to_end(key)
+    while len(_entries) > RETRIEVAL_CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+    if not snippets:                           # kept in memory only
+        return
+    _pending += 1
+    if _pending >= RETRIEVAL_CACHE_SAVE_EVERY:
+        _save_locked()
+
+
+# ──────────────────────────────────────────────────────────────────
+# Backends
+# ──────────────────────────────────────────────────────────────────
+def _wiki_search(term: str, limit: int, timeout: float, agent: str):
+    """Plain-text snippets for term, or None when the search failed."""
+    from tools.http_cache import cached_get
+    try:
+        resp = cached_get(WIKI, params={
+            "action": "query", "list": "search", "srsearch": term,
+            "format": "json", "srlimit": limit},
+            timeout=timeout, headers={"User-Agent": agent})
+        if resp.status_code != 200:
+            return None
+        snips = []
+        for item in resp.json().get("query", {}).get("search", []):
+            s = re.sub(r'<[^>]+>', '', item.get("snippet", "")).strip()
+            if s:
+                snips.append(s[:400])
+        return snips
+    except Exception:
+        return None
+
+
+def _bm25_search(term: str, limit: int, timeout: float, agent: str):
+    from mcts import bm25
+    try:
+        return bm25.search(term, limit)
+    except Exception:
+        return None
+
+
+# name → (search function, cache results across requests)
+BACKENDS = {
+    "bm25":      (_bm25_search, False),      # local lookups are cheaper than the cache
+    "wikipedia": (_wiki_search, True),
+}
+
+
+def register(name: str, fn, cached: bool = False):
+    """Add (or replace) a retrieval backend; enable it via RETRIEVAL_BACKENDS."""
+    BACKENDS[name] = (fn, cached)
+
+
+# ──────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────
+def _cached_search(name: str, fetch, term: str, limit: int, timeout: float, agent: str):
+    if not RETRIEVAL_CACHE_ENABLED:
+        return fetch(term, limit, timeout, agent), False
+
+    key = f"{name}|{normalize(term)}|{limit}"
+    with _lock:
+        snips = _get_locked(key)
+        if snips is not None:
+            _stats["hit"] += 1
+            return list(snips), True
+        waiting = _inflight.get(key)
+        if waiting is None:
+            _inflight[key] = threading.Event()
+
+    if waiting is not None:                    # someone else is fetching this key
+        waiting.wait(timeout + 1)
+        with _lock:
+            snips = _get_locked(key)
+            if snips is not None:
+                _stats["hit"] += 1
+                return list(snips), True
+        return fetch(term, limit, timeout, agent), False
+
+    try:
+        snips = fetch(term, limit, timeout, agent)
+        with _lock:
+            _stats["miss"] += 1
+            if snips is not None:
+                _put_locked(key, snips)
+    finally:
+        with _lock:
+            _inflight.pop(key).set()
+    return (list(snips) if snips is not None else None), False
+
+
+def search(term: str, limit: int = 2, timeout: float = 4, agent: str = "MCTS/1.0"):
+    """
+    Snippets for term → (snippets, hit), from the first backend in
+    RETRIEVAL_BACKENDS that has any. hit is True when the result came
+    from the cache (or from a concurrent caller's fetch of the same key).
+    """
+    for name in RETRIEVAL_BACKENDS:
+        if name not in BACKENDS:
+            continue
+        fetch, cached = BACKENDS[name]
+        if cached:
+            snips, hit = _cached_search(name, fetch, term, limit, timeout, agent)
+        else:
+            snips, hit = fetch(term, limit, timeout, agent), False
+        if snips:
+            return snips, hit
+    return [], False
+
+
+def save():
+    """Flush new entries to disk (FastAPI shutdown hook)."""
+    with _lock:
+        if _entries is not None and _pending:
+            _save_locked()
+
+
+def stats() -> dict:
+    with _lock:
+        return {**_stats, "entries": len(_load())}
@@ -0,0 +1,277 @@
+# backend/mcts/semantic_index.py
+"""
+CPU-only semantic retriever for MCTS-RAG — hashed n-gram embeddings with
+a random-projection LSH index. No model download.
+
+embed(texts) maps each text to a RAG_EMBED_DIM float32 vector by feature
+hashing (crc32, signed) of the words left after dropping stop words:
+
+  words           "laptop", "prices"
+  word bigrams    "gaming laptop"
+  char trigrams   "<pr", "pri", "ric", "ice", "ces", "es>"  (half weight)
+
+Without the stop-word filter, function words ("a", "is", "of", "the")
+dominated the short vectors. On a 12-abstract / 14-query check, "plan a
+trip to Goa" ranked a laptop abstract above the Goa one, and a nonsense
+query reached 0.13 against random text. With the filter, the right
+abstract ranks first for 13 of 14 queries. At RAG_SEMANTIC_MIN_SIM =
+0.16 that check kept 64% of the relevant pairs at 100% precision; the
+old 0.1 threshold was at 30% precision.
+
+Shared trigrams let "price" meet "prices" / "pricing" and bigrams keep
+some phrase order; rows are L2-normalized, so a dot product is cosine
+similarity. Vectors live in one contiguous matrix.
+
+SemanticIndex keeps RAG_LSH_TABLES hash tables of RAG_LSH_BITS random
+hyperplanes each. A query is compared only with the chunks sharing a
+bucket in some table (probing one-bit neighbours when that yields too
+few); indexes smaller than RAG_LSH_MIN_SIZE are scanned exactly, which
+is cheaper there.
+
+The module also keeps the shared chunk store: chunks seeded by any
+MCTS-RAG search are remember()ed (deduplicated, newest
+RAG_CHUNK_STORE_MAX kept) and persisted to RAG_CHUNK_STORE_DIR, so
+context builds up across requests. top(query, k, first) ranks the
+current search's own chunks (first) ahead of the store, and store
+chunks only fill the remaining slots above RAG_SEMANTIC_MIN_SIM.
+
+The store is shared by every user of the server: text retrieved for one
+user's query can show up in the context of another user's LLM prompt.
+That is why this retriever is opt-in (RAG_MCTS_RETRIEVER = "semantic").
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from config import (
+    RAG_EMBED_DIM, RAG_LSH_TABLES, RAG_LSH_BITS, RAG_LSH_MIN_SIZE,
+    RAG_CHUNK_STORE_DIR, RAG_CHUNK_STORE_MAX, RAG_CHUNK_STORE_SAVE_EVERY,
+    RAG_SEMANTIC_MIN_SIM,
+)
+
+_TOKEN = re.compile(r"\w+")
+_STOP  = frozenset("""
+    a an the of to in on for and or is are was were be been being it its this that
+    these those with as by at from into over under about than then so such can could
+    will would should may might do does did how what which who whom whose why when
+    where there their they them he she his her we our you your i my me not no also
+    only other some any each all more most many much very often sometimes typically
+""".split())
+EMBED_VERSION = 2        # bump when _features changes — stored vectors are re-embedded
+
+
+def _features(text: str):
+    """(feature, weight) pairs of one text."""
+    words = [w for w in _TOKEN.findall((text or "").lower()) if w not in _STOP]
+    for w in words:
+        yield w, 1.0
+        padded = f"<{w}>"
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3], 0.5
+    for a, b in zip(words, words[1:]):
+        yield f"{a} {b}", 1.0
+
+
+def embed(texts: list, dim: int = RAG_EMBED_DIM) -> np.ndarray:
+    """L2-normalized hashed embeddings, one float32 row per text."""
+    X = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        row = X[i]
+        for feat, weight in _features(text):
+            h = zlib.crc32(feat.encode("utf-8"))
+            row[h % dim] += weight if h & 0x80000000 else -weight
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    np.divide(X, norms, out=X, where=norms > 0)
+    return X
+
+
+class SemanticIndex:
+
+    def __init__(self, dim: int = RAG_EMBED_DIM, tables: int = RAG_LSH_TABLES,
+                 bits: int = RAG_LSH_BITS, seed: int = 13):
+        rng          = np.random.default_rng(seed)
+        self.dim     = dim
+        self.planes  = rng.standard_normal((tables, dim, bits)).astype(np.float32)
+        self.weights = (1 << np.arange(bits, dtype=np.int64))
+        self.chunks  = []
+        self._matrix = np.zeros((0, dim), dtype=np.float32)   # grows by doubling
+        self.buckets = [{} for _ in range(tables)]     # table → {code: [ids]}
+        self._ids    = {}                              # chunk text → id
+
+    def __len__(self):
+        return len(self.chunks)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._matrix[:len(self.chunks)]
+
+    def _append(self, chunks: list, X: np.ndarray):
+        start, end = len(self.chunks), len(self.chunks) + len(chunks)
+        if end > len(self._matrix):
+            grown = np.zeros((max(end, 2 * len(self._matrix), 64), self.dim), dtype=np.float32)
+            grown[:start] = self._matrix[:start]
+            self._matrix = grown
+        self._matrix[start:end] = X
+        for i, c in enumerate(chunks):
+            self._ids[c] = start + i
+        self.chunks.extend(chunks)
+        for t, codes in enumerate(self._codes(X)):
+            table = self.buckets[t]
+            for i, code in enumerate(codes.tolist()):
+                table.setdefault(code, []).append(start + i)
+
+    def _codes(self, X: np.ndarray) -> np.ndarray:
+        """[tables, n] integer bucket codes."""
+        bits = np.einsum("nd,tdb->tnb", X, self.planes) > 0
+        return bits.astype(np.int64) @ self.weights
+
+    def add(self, chunks: list) -> int:
+        """Index new chunks (duplicates skipped); returns how many were added."""
+        new = [c for c in dict.fromkeys(chunks) if c and c not in self._ids]
+        if not new:
+            return 0
+        self._append(new, embed(new, self.dim))
+        return len(new)
+
+    def newest(self, n: int):
+        """A new index with only the n most recently added chunks (no re-embedding)."""
+        out = type(self)(self.dim, len(self.planes), self.planes.shape[2])
+        out.planes = self.planes
+        if n > 0:
+            out._append(self.chunks[-n:], self.vectors[-n:])
+        return out
+
+    def _candidates(self, qv: np.ndarray, k: int) -> np.ndarray:
+        codes = self._codes(qv[None, :])[:, 0].tolist()
+        parts = [table[code] for table, code in zip(self.buckets, codes) if code in table]
+        if sum(map(len, parts)) < k:                        # multi-probe: one-bit neighbours
+            parts += [table[code ^ w] for table, code in zip(self.buckets, codes)
+                      for w in self.weights.tolist() if code ^ w in table]
+        return np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    def search(self, query: str, k: int = 3, min_sim: float = RAG_SEMANTIC_MIN_SIM) -> list:
+        """Top-k [(similarity, chunk)] for query, best first."""
+        if not self.chunks or k <= 0:
+            return []
+        qv = embed([query], self.dim)[0]
+        if len(self.chunks) < RAG_LSH_MIN_SIZE:
+            cand = np.arange(len(self.chunks))
+        else:
+            cand = self._candidates(qv, k)
+            if len(cand) < k:
+                cand = np.arange(len(self.chunks))
+        sims = self.vectors[cand] @ qv
+        k    = min(k, len(cand))
+        top  = np.argpartition(-sims, k - 1)[:k]
+        top  = top[np.argsort(-sims[top], kind="stable")]
+        return [(float(sims[i]), self.chunks[cand[i]]) for i in top if sims[i] >= min_sim]
+
+    def top(self, query: str, k: int = 3) -> list:
+        return [chunk for _, chunk in self.search(query, k)]
+
+    # ── persistence ────────────────────────────────────────────────
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        tmp = os.path.join(path, f"chunks.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.chunks, f)
+        os.replace(tmp, os.path.join(path, "chunks.json"))
+        tmp = os.path.join(path, f"vectors.{os.getpid()}.tmp.npy")
+        np.save(tmp, self.vectors)
+        os.replace(tmp, os.path.join(path, "vectors.npy"))
+        with open(os.path.join(path, "version"), "w", encoding="utf-8") as f:
+            f.write(str(EMBED_VERSION))
+
+    @classmethod
+    def load(cls, path: str, **kw):
+        index = cls(**kw)
+        with open(os.path.join(path, "chunks.json"), encoding="utf-8") as f:
+            chunks = json.load(f)
+        vectors = np.load(os.path.join(path, "vectors.npy"))
+        try:
+            with open(os.path.join(path, "version"), encoding="utf-8") as f:
+                version = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            version = 1
+        if version != EMBED_VERSION or vectors.shape != (len(chunks), index.dim):
+            index.add(chunks)                                  # features/dim changed — re-embed
+            index.add(chunks)
+        elif chunks:
+            index._append(chunks, vectors.astype(np.float32))
+        return index
+
+
+# ──────────────────────────────────────────────────────────────────
+# Shared chunk store
+# ──────────────────────────────────────────────────────────────────
+_lock    = threading.Lock()
+_store   = None
+_pending = 0
+
+
+def _store_locked() -> SemanticIndex:
+    global _store
+    if _store is None:
+        try:
+            _store = SemanticIndex.load(RAG_CHUNK_STORE_DIR)
+        except (OSError, ValueError):
+            _store = SemanticIndex()
+    return _store
+
+
+def _save_locked():
+    global _pending
+    try:
+        _store.save(RAG_CHUNK_STORE_DIR)
+        _pending = 0
+    except OSError:
+        pass
+
+
+def remember(chunks: list) -> int:
+    """Add chunks to the shared store; returns how many were new."""
+    global _store, _pending
+    with _lock:
+        index = _store_locked()
+        added = index.add(chunks)
+        if len(index) > RAG_CHUNK_STORE_MAX:               # keep the newest 90%
+            _store = index.newest(RAG_CHUNK_STORE_MAX * 9 // 10)
+        _pending += added
+        if _pending >= RAG_CHUNK_STORE_SAVE_EVERY:
+            _save_locked()
+    return added
+
+
+def top(query: str, k: int = 3, first=()) -> list:
+    """
+    k chunks for query. The chunks in first (the current search's own
+    retrieval results) come first, ordered by similarity. Store chunks
+    fill the remaining slots only when they reach RAG_SEMANTIC_MIN_SIM.
+    """
+    own = list(dict.fromkeys(c for c in first if c))
+    if own:
+        sims = embed(own) @ embed([query])[0]
+        own  = [own[i] for i in np.argsort(-sims, kind="stable")][:k]
+    if len(own) >= k:
+        return own
+    with _lock:
+        found = _store_locked().search(query, k + len(own))
+    taken = set(own)
+    return own + [c for _, c in found if c not in taken][:k - len(own)]
+
+
+def size() -> int:
+    with _lock:
+        return len(_store_locked())
+
+
+def save():
+    """Persist the chunk store (FastAPI shutdown hook)."""
+    with _lock:
+        if _store is not None and _pending:
+            _save_locked()
@@ -0,0 +1,216 @@
+# backend/mcts/value_model.py
+"""
+Distilled plan-value model — a NumPy stand-in for LLM plan ratings.
+
+WM-MCTS and MCTS-RAG ask the LLM for a 1–10 rating of (task, steps).
+Those ratings depend mostly on the task category and a short sequence
+from a fixed vocabulary of ~20 actions, so a linear model over a few
+sparse features reproduces them in microseconds:
+
+  bias, scoring mode, category, mode × category, plan length, duplicate
+  steps, category × step, category × last step, category × step pair
+
+Training data is the production log of LLM ratings kept by
+mcts/eval_cache.py (its SQLite table). "rag" ratings were made against
+retrieved context that the log does not keep, so for that mode the model
+learns the average rating of a plan over the contexts it was seen with.
+Train offline, from backend/:
+
+  python -m mcts.value_model train          # fit + holdout report, saves the model
+  python -m mcts.value_model report         # holdout report only
+
+The fit is Bayesian ridge regression (closed form): besides the score,
+predict() returns a standard deviation, σ²·(1 + xᵀA⁻¹x), which is large
+for plans unlike the training data. Plans with a step the model has
+never seen are reported as unknown (std = inf).
+
+VALUE_MODEL_MODE selects how eval_cache.get_or_score() uses it:
+  "off"      LLM only
+  "front"    model when std ≤ VALUE_MODEL_MAX_STD, LLM otherwise
+  "replace"  model whenever it knows the steps, LLM otherwise
+"""
+
+import argparse
+import os
+import random
+import threading
+
+import numpy as np
+
+from config import (
+    VALUE_MODEL_MODE, VALUE_MODEL_PATH, VALUE_MODEL_MAX_STD, VALUE_MODEL_RIDGE,
+    VALUE_MODEL_MIN_SAMPLES,
+)
+from mcts.categories import category
+
+
+def features(mode: str, query: str, steps) -> list:
+    """Active feature names of one plan."""
+    cat   = category(query)
+    steps = tuple(steps)
+    names = ["bias", f"mode={mode}", f"cat={cat}", f"{mode}|cat={cat}",
+             f"len={min(len(steps), 6)}"]
+    if len(steps) != len(set(steps)):
+        names.append("dup")
+    names += [f"{cat}|step={s}" for s in dict.fromkeys(steps)]
+    if steps:
+        names.append(f"{cat}|last={steps[-1]}")
+    names += [f"{cat}|pair={a}>{b}" for a, b in zip(steps, steps[1:])]
+    return names
+
+
+def _required(name: str) -> bool:
+    return "|step=" in name or "|last=" in name
+
+
+# ──────────────────────────────────────────────────────────────────
+# Model
+# ──────────────────────────────────────────────────────────────────
+class ValueModel:
+
+    def __init__(self, names, weights, a_inv, sigma2: float, samples: int):
+        self.names   = list(names)
+        self.index   = {n: i for i, n in enumerate(self.names)}
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.a_inv   = np.asarray(a_inv, dtype=np.float64)
+        self.sigma2  = float(sigma2)
+        self.samples = int(samples)
+
+    @classmethod
+    def fit(cls, rows: list, ridge: float = VALUE_MODEL_RIDGE):
+        """rows: [(mode, query, steps, score)]."""
+        feats = [features(m, q, s) for m, q, s, _ in rows]
+        names = sorted({n for f in feats for n in f})
+        index = {n: i for i, n in enumerate(names)}
+        X = np.zeros((len(rows), len(names)))
+        for i, f in enumerate(feats):
+            X[i, [index[n] for n in f]] = 1.0
+        y     = np.array([r[3] for r in rows], dtype=np.float64)
+        a_inv = np.linalg.inv(X.T @ X + ridge * np.eye(len(names)))
+        w     = a_inv @ (X.T @ y)
+        resid = y - X @ w
+        dof   = max(len(rows) - np.trace(a_inv @ (X.T @ X)), 1.0)
+        return cls(names, w, a_inv, float(resid @ resid) / dof, len(rows))
+
+    def predict(self, mode: str, query: str, steps) -> tuple:
+        """(score, std) — std is inf when a step was never seen in training."""
+        idx = []
+        for n in features(mode, query, steps):
+            i = self.index.get(n)
+            if i is not None:
+                idx.append(i)
+            elif _required(n):
+                return None, float("inf")
+        score = float(self.weights[idx].sum())
+        var   = self.sigma2 * (1.0 + float(self.a_inv[np.ix_(idx, idx)].sum()))
+        return min(max(score, 1.0), 10.0), var ** 0.5
+
+    def save(self, path: str = VALUE_MODEL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, names=np.array(self.names), weights=self.weights,
+                 a_inv=self.a_inv, sigma2=self.sigma2, samples=self.samples)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = VALUE_MODEL_PATH):
+        with np.load(path) as z:
+            return cls(z["names"].tolist(), z["weights"], z["a_inv"],
+                       float(z["sigma2"]), int(z["samples"]))
+
+
+_lock  = threading.Lock()
+_model = None
+_mtime = None
+
+
+def _current():
+    """The saved model, reloaded when the file changes; None without one."""
+    global _model, _mtime
+    try:
+        mtime = os.path.getmtime(VALUE_MODEL_PATH)
+    except OSError:
+        return None
+    with _lock:
+        if mtime != _mtime:
+            try:
+                _model = ValueModel.load(VALUE_MODEL_PATH)
+            except (OSError, ValueError, KeyError):
+                _model = None
+            _mtime = mtime
+        return _model
+
+
+def score(mode: str, query: str, steps):
+    """Model score for the plan when VALUE_MODEL_MODE trusts it, else None."""
+    if VALUE_MODEL_MODE == "off":
+        return None
+    model = _current()
+    if model is None:
+        return None
+    value, std = model.predict(mode, query, steps)
+    if value is None:
+        return None
+    if VALUE_MODEL_MODE == "front" and std > VALUE_MODEL_MAX_STD:
+        return None
+    return value
+
+
+# ──────────────────────────────────────────────────────────────────
+# Offline training
+# ──────────────────────────────────────────────────────────────────
+def report(rows: list, holdout: float = 0.2, seed: int = 7) -> dict:
+    """Fit on part of rows and measure the rest against a per-mode mean baseline."""
+    rows = list(rows)
+    random.Random(seed).shuffle(rows)
+    cut  = max(int(len(rows) * (1 - holdout)), 1)
+    train, test = rows[:cut], rows[cut:]
+    model = ValueModel.fit(train)
+    means = {}
+    for m, _, _, y in train:
+        means.setdefault(m, []).append(y)
+    means = {m: sum(v) / len(v) for m, v in means.items()}
+
+    err, base, conf = [], [], []
+    for m, q, s, y in test:
+        pred, std = model.predict(m, q, s)
+        base.append((means.get(m, 5.0) - y) ** 2)
+        if pred is None:
+            continue
+        err.append((pred - y) ** 2)
+        if std <= VALUE_MODEL_MAX_STD:
+            conf.append((pred - y) ** 2)
+
+    def _rmse(v):
+        return round((sum(v) / len(v)) ** 0.5, 3) if v else None
+
+    return {"train": len(train), "test": len(test), "features": len(model.names),
+            "rmse": _rmse(err), "baseline_rmse": _rmse(base),
+            "known": len(err), "confident": len(conf), "confident_rmse": _rmse(conf)}
+
+
+def main(argv=None):
+    from mcts import eval_cache
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("cmd", choices=["train", "report"])
+    ap.add_argument("--min-samples", type=int, default=VALUE_MODEL_MIN_SAMPLES)
+    args = ap.parse_args(argv)
+
+    rows = list(eval_cache.rows())
+    if len(rows) < args.min_samples:
+        print(f"⚠️  {len(rows)} logged LLM ratings — need at least {args.min_samples}")
+        return
+    r = report(rows)
+    print(f"📊 holdout: {r['test']} plans, RMSE {r['rmse']} (per-mode mean: "
+          f"{r['baseline_rmse']}), confident {r['confident']}/{r['test']} "
+          f"at RMSE {r['confident_rmse']}")
+    if args.cmd == "train":
+        model = ValueModel.fit(rows)
+        model.save()
+        print(f"✅ {len(rows)} ratings, {len(model.names)} features, "
+              f"σ={model.sigma2 ** 0.5:.2f} → {VALUE_MODEL_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -93,7 +93,7 @@ def run_basic_mcts(query: str, simulations: int = 5) -> dict:
 
 
 def run_r_mcts(query: str, simulations: int = 5) -> dict:
-    mod = _load_variant("r_mcts.py")
+    mod = _load_variant("r_mstc.py")
     return mod.run_r_mcts(query, simulations)
 
 
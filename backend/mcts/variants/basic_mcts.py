@@ -2,6 +2,10 @@
 """
 Basic MCTS — standard textbook UCB1 + random rollout. Baseline variant.
 No retrieval, no LLM, no external calls.
+
+With a seeded RNG the search is a function of the query category alone,
+so with PLAN_MEMO_ENABLED run_basic_mcts() is served from
+mcts/plan_memo.py; search() runs it.
 """
 
 import sys
@@ -12,7 +16,7 @@ import random
 
 # ──────────────────────────────────────────────────────────────────
 # NOTHING runs at module level except stdlib imports above.
-# All project imports happen inside run_basic_mcts() at call time.
+# All project imports happen inside search() at call time.
 # ──────────────────────────────────────────────────────────────────
 
 def _setup():
@@ -32,9 +36,31 @@ def _setup():
 # Runner — all logic lives here, built fresh on each call
 # ──────────────────────────────────────────────────────────────────
 
+POOLS = {
+    "shopping": ["Search Primary Platform", "Search Secondary Platform",
+                 "Extract Product Details", "Compare Prices",
+                 "Analyze Customer Reviews", "Finalize Recommendation"],
+    "travel":   ["Research Destinations", "Check Availability",
+                 "Compare Options", "Create Itinerary", "Finalize Plan"],
+    "research": ["Gather Information", "Analyze Data", "Compare Alternatives",
+                 "Draw Conclusions", "Provide Recommendations"],
+    "generic":  ["Research Topic", "Gather Information", "Analyze Options",
+                 "Organize Results", "Provide Recommendations"],
+}
+
+
 def run_basic_mcts(query: str, simulations: int = 5) -> dict:
+    _setup()
+    from mcts import plan_memo
+    return plan_memo.get("basic-mcts", query, simulations)
+
+
+def search(query: str, simulations: int = 5, seed: int = None) -> dict:
+    """One Basic-MCTS search; seed=None draws from the global RNG."""
 
     MAX_MCTS_DEPTH, MonteCarloTreeSearchNode, MonteCarloTreeSearch = _setup()
+    from mcts.categories import category
+    rng = random.Random(seed) if seed is not None else random
 
     # ── State ─────────────────────────────────────────────────────
     class BasicMCTSState:
@@ -46,21 +72,7 @@ def run_basic_mcts(query: str, simulations: int = 5) -> dict:
             self.max_depth = max_depth
 
         def get_possible_actions(self):
-            q = self.query.lower()
-            if any(w in q for w in ["buy", "purchase", "compare", "price", "shop"]):
-                pool = ["Search Primary Platform", "Search Secondary Platform",
-                        "Extract Product Details", "Compare Prices",
-                        "Analyze Customer Reviews", "Finalize Recommendation"]
-            elif any(w in q for w in ["plan", "book", "trip", "schedule", "itinerary"]):
-                pool = ["Research Destinations", "Check Availability",
-                        "Compare Options", "Create Itinerary", "Finalize Plan"]
-            elif any(w in q for w in ["analyze", "data", "research", "study", "compare"]):
-                pool = ["Gather Information", "Analyze Data", "Compare Alternatives",
-                        "Draw Conclusions", "Provide Recommendations"]
-            else:
-                pool = ["Research Topic", "Gather Information", "Analyze Options",
-                        "Organize Results", "Provide Recommendations"]
-            return [a for a in pool if a not in self.steps]
+            return [a for a in POOLS[category(self.query)] if a not in self.steps]
 
         def move(self, action):
             return BasicMCTSState(self.query, self.steps + [action],
@@ -106,7 +118,7 @@ def run_basic_mcts(query: str, simulations: int = 5) -> dict:
             if not untried:
                 return self
             child = BasicMCTSNode(
-                self.state.move(random.choice(untried)), parent=self
+                self.state.move(rng.choice(untried)), parent=self
             )
             self.children.append(child)
             return child
@@ -120,7 +132,7 @@ def run_basic_mcts(query: str, simulations: int = 5) -> dict:
                 actions = state.get_possible_actions()
                 if not actions:
                     break
-                state = state.move(random.choice(actions))
+                state = state.move(rng.choice(actions))
             return state.evaluate()
 
     # ── Run MCTS ──────────────────────────────────────────────────
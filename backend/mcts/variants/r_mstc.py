@@ -396,8 +396,7 @@
 import sys
 import os
 import time
-import re
-import requests as _requests
+from concurrent.futures import ThreadPoolExecutor
 
 
 def _setup():
@@ -406,52 +405,82 @@ def _setup():
     )
     if backend_dir not in sys.path:
         sys.path.insert(0, backend_dir)
-    from config import R_MCTS_RETRIEVAL_TIMEOUT, R_MCTS_RETRIEVAL_TOP_K, R_MCTS_MAX_DEPTH
+    from config import R_MCTS_RETRIEVAL_TIMEOUT, R_MCTS_RETRIEVAL_TOP_K, R_MCTS_MAX_DEPTH, \
+                       R_MCTS_PREFETCH_WORKERS
     from mcts.nodes import MonteCarloTreeSearchNode
     from mcts.search import MonteCarloTreeSearch
     return R_MCTS_RETRIEVAL_TIMEOUT, R_MCTS_RETRIEVAL_TOP_K, R_MCTS_MAX_DEPTH, \
-           MonteCarloTreeSearchNode, MonteCarloTreeSearch
+           R_MCTS_PREFETCH_WORKERS, MonteCarloTreeSearchNode, MonteCarloTreeSearch
 
 
 def run_r_mcts(query: str, simulations: int = 5) -> dict:
 
-    TIMEOUT, TOP_K, MAX_DEPTH, MonteCarloTreeSearchNode, MonteCarloTreeSearch = _setup()
-    WIKI = "https://en.wikipedia.org/w/api.php"
+    TIMEOUT, TOP_K, MAX_DEPTH, WORKERS, MonteCarloTreeSearchNode, MonteCarloTreeSearch = _setup()
+    from mcts import retrieval
 
-    # ── Per-node retriever cache ───────────────────────────────────
-    cache = {}
+    # ── Prefetching retriever ─────────────────────────────────────
+    # Every (query, action) search term is submitted as soon as its
+    # action becomes a candidate; identical terms share one future, so
+    # expand/rollout wait for at most one round trip instead of one per
+    # action.
+    pool    = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="r-mcts")
+    futures = {}                 # search term → Future[list of snippets]
+    hits    = []                 # terms answered by the shared retrieval cache
 
-    def retrieve(q, action):
-        key = f"{q[:50]}|{action}"
-        if key in cache: return cache[key]
+    def term_for(q, action):
         kws = [w for w in action.lower().split()
                if w not in {"primary","secondary","final","finalize","create",
                              "provide","gather","check","extract","draw"} and len(w) > 2]
-        term = f"{q} {' '.join(kws[:3])}".strip()[:100]
+        return f"{q} {' '.join(kws[:3])}".strip()[:100]
+
+    def search(term):
+        snips, hit = retrieval.search(term, TOP_K, TIMEOUT, "R-MCTS/1.0")
+        if hit: hits.append(term)
+        return snips
+
+    def prefetch(q, actions):
+        for a in actions:
+            term = term_for(q, a)
+            if term not in futures:
+                futures[term] = pool.submit(search, term)
+
+    def retrieve(q, action):
+        term = term_for(q, action)
+        prefetch(q, [action])
         try:
-            resp = _requests.get(WIKI, params={
-                "action":"query","list":"search","srsearch":term,
-                "format":"json","srlimit":TOP_K},
-                timeout=TIMEOUT, headers={"User-Agent":"R-MCTS/1.0"})
-            snips = []
-            if resp.status_code == 200:
-                for item in resp.json().get("query",{}).get("search",[]):
-                    s = re.sub(r'<[^>]+>','',item.get("snippet","")).strip()
-                    if s: snips.append(s[:400])
-            cache[key] = snips
+            return futures[term].result(timeout=TIMEOUT + 1)
         except Exception:
-            cache[key] = []
-        return cache[key]
+            return []
+
+    # ── Snippet terms (tokenized once per snippet) ────────────────
+    query_words = frozenset(query.lower().split())
+    snip_terms  = {}             # snippet → (interned term set, overlap with query)
+
+    def terms_of(s):
+        entry = snip_terms.get(s)
+        if entry is None:
+            terms = frozenset(sys.intern(w) for w in s.lower().split())
+            entry = snip_terms[s] = (terms, len(query_words & terms))
+        return entry
 
     def overlap(q, snips):
-        qw = set(q.lower().split())
-        return sum(len(qw & set(s.lower().split())) for s in snips)
+        if q != query:
+            qw = set(q.lower().split())
+            return sum(len(qw & terms_of(s)[0]) for s in snips)
+        return sum(terms_of(s)[1] for s in snips)
 
     # ── State ─────────────────────────────────────────────────────
+    # words  query words plus the words of every step taken
+    # df     step-vocabulary word → number of ctx snippets containing it
+    # ov     Σ over ctx of |words ∩ snippet terms|, kept up to date by
+    #        move(), so evaluate() does not rescan the context
     class RMCTSState:
-        def __init__(self, q, steps=None, ctx=None, depth=0, max_depth=MAX_DEPTH):
+        def __init__(self, q, steps=None, ctx=None, depth=0, max_depth=MAX_DEPTH,
+                     words=None, df=None, ov=0):
             self.query = q; self.steps = steps or []
             self.ctx = ctx or []; self.depth = depth; self.max_depth = max_depth
+            self.words = words if words is not None else frozenset(q.lower().split())
+            self.df = df or {}; self.ov = ov
 
         def get_possible_actions(self):
             q = self.query.lower()
@@ -473,8 +502,21 @@ def run_r_mcts(query: str, simulations: int = 5) -> dict:
             return [a for a in pool if a not in self.steps]
 
         def move(self, action, snips=None):
+            words, df, ov = self.words, self.df, self.ov
+            new = set(action.lower().split()) - words
+            if new:                                  # new step words meet the old context
+                ov   += sum(df.get(w, 0) for w in new)
+                words = words | new
+            if snips:                                # new context meets all words
+                df = dict(df)
+                for s in snips:
+                    terms, _ = terms_of(s)
+                    ov += len(words & terms)
+                    for w in terms & step_vocab:
+                        df[w] = df.get(w, 0) + 1
             return RMCTSState(self.query, self.steps+[action],
-                              self.ctx+(snips or []), self.depth+1, self.max_depth)
+                              self.ctx+(snips or []), self.depth+1, self.max_depth,
+                              words, df, ov)
 
         def is_terminal(self): return self.depth >= self.max_depth
 
@@ -500,11 +542,12 @@ def run_r_mcts(query: str, simulations: int = 5) -> dict:
             rs = [s for s in self.steps if "Retrieve" in s or "Search" in s]
             if rs: score += min(len(rs)*0.5, 1.5)
             if self.ctx:
-                qw = set(self.query.lower().split()) | set(" ".join(self.steps).lower().split())
-                ov = sum(len(qw & set(s.lower().split())) for s in self.ctx)
-                score += min(ov/10.0, 2.0)
+                score += min(self.ov/10.0, 2.0)
             return min(max(score, 1.0), 10.0)
 
+    step_vocab = frozenset(w for a in RMCTSState(query).get_possible_actions()
+                           for w in a.lower().split())
+
     # ── Node ──────────────────────────────────────────────────────
     class RMCTSNode(MonteCarloTreeSearchNode):
         def untried_actions(self):
@@ -514,12 +557,13 @@ def run_r_mcts(query: str, simulations: int = 5) -> dict:
         def expand(self):
             untried = self.untried_actions()
             if not untried: return self
+            prefetch(self.state.query, untried)
             best_a, best_s, best_ov = untried[0], [], -1
             for a in untried:
                 snips = retrieve(self.state.query, a)
                 ov    = overlap(self.state.query, snips)
                 if ov > best_ov: best_ov, best_a, best_s = ov, a, snips
-            child = RMCTSNode(self.state.move(best_a, best_s), parent=self)
+            child = priors.seed(RMCTSNode(self.state.move(best_a, best_s), parent=self))
             self.children.append(child)
             return child
 
@@ -530,6 +574,7 @@ def run_r_mcts(query: str, simulations: int = 5) -> dict:
             while not state.is_terminal():
                 acts = state.get_possible_actions()
                 if not acts: break
+                prefetch(state.query, acts)
                 best_a, best_s, best_ov = acts[0], [], -1
                 for a in acts:
                     snips = retrieve(state.query, a)
@@ -539,17 +584,27 @@ def run_r_mcts(query: str, simulations: int = 5) -> dict:
             return state.evaluate()
 
     # ── Run ───────────────────────────────────────────────────────
+    from mcts import action_stats
+    priors    = action_stats.priors("r-mcts", query)
     root      = RMCTSNode(RMCTSState(query))
     t0        = time.perf_counter()
-    best_node = MonteCarloTreeSearch(root).best_action(simulations)
+    prefetch(query, root.state.get_possible_actions())   # whole action pool in flight
+    try:
+        best_node = MonteCarloTreeSearch(root).best_action(simulations)
+    finally:
+        pool.shutdown(wait=False)
+    action_stats.record("r-mcts", query, root)
     elapsed   = (time.perf_counter() - t0) * 1000
     plan      = best_node.state.steps or ["Direct Response"]
     score     = best_node.state.evaluate()
-    total     = sum(len(v) for v in cache.values())
+    total     = sum(len(f.result()) for f in futures.values()
+                    if f.done() and not f.cancelled())
 
     return {
         "variant": "R-MCTS", "plan": plan,
         "score": round(score, 2), "simulations": simulations,
         "time_ms": round(elapsed, 2), "retrieved_snippets": total,
+        "retrieval_cache_hits": len(hits),
+        "warm_start": bool(priors),
         "description": "Retrieval MCTS — live web retrieval per node during expansion.",
     }
\ No newline at end of file
@@ -321,42 +321,35 @@ def _setup():
     )
     if backend_dir not in sys.path:
         sys.path.insert(0, backend_dir)
-    from config import RAG_MCTS_MAX_DEPTH, RAG_MCTS_SEED_LIMIT
+    from config import RAG_MCTS_MAX_DEPTH, RAG_MCTS_SEED_LIMIT, RAG_MCTS_RETRIEVER
     from mcts.nodes import MonteCarloTreeSearchNode
     from mcts.search import MonteCarloTreeSearch
-    return RAG_MCTS_MAX_DEPTH, RAG_MCTS_SEED_LIMIT, MonteCarloTreeSearchNode, MonteCarloTreeSearch
+    return RAG_MCTS_MAX_DEPTH, RAG_MCTS_SEED_LIMIT, RAG_MCTS_RETRIEVER, \
+           MonteCarloTreeSearchNode, MonteCarloTreeSearch
 
 
 def run_rag_mcts(query: str, simulations: int = 5) -> dict:
 
-    RAG_MCTS_MAX_DEPTH, RAG_MCTS_SEED_LIMIT, MonteCarloTreeSearchNode, MonteCarloTreeSearch = _setup()
+    RAG_MCTS_MAX_DEPTH, RAG_MCTS_SEED_LIMIT, RETRIEVER, \
+        MonteCarloTreeSearchNode, MonteCarloTreeSearch = _setup()
 
     # ── Retriever ─────────────────────────────────────────────────
     chunks = []
+    hits   = []
 
     def seed_retriever():
-        try:
-            import requests
-            resp = requests.get(
-                "https://en.wikipedia.org/w/api.php",
-                params={"action":"query","list":"search","srsearch":query,
-                        "format":"json","srlimit":RAG_MCTS_SEED_LIMIT},
-                timeout=4, headers={"User-Agent":"MCTS-RAG/1.0"})
-            if resp.status_code == 200:
-                for item in resp.json().get("query",{}).get("search",[]):
-                    s = re.sub(r'<[^>]+>','',item.get("snippet","")).strip()
-                    if s: chunks.append(s[:400])
-        except Exception:
-            pass
+        from mcts import retrieval
+        snips, hit = retrieval.search(query, RAG_MCTS_SEED_LIMIT, 4, "MCTS-RAG/1.0")
+        chunks.extend(snips)
+        if hit: hits.append(query)
+
+    rank = None                  # (q, top_k) → chunks, set up once after seeding
 
     def retrieve(q, top_k=3):
-        if not chunks: return []
-        qw = set(q.lower().split())
-        return sorted(chunks, key=lambda c: len(qw & set(c.lower().split())),
-                      reverse=True)[:top_k]
+        if rank is None: return []
+        return rank(q, top_k)
 
-    def score_state(q, steps):
-        ctx = "\n".join(retrieve(q)) or "No context."
+    def llm_score(q, steps, ctx):
         try:
             from llm import get_llm
             prompt = (f"Rate plan 1-10 using context.\nTask: {q}\n"
@@ -364,6 +357,7 @@ def run_rag_mcts(query: str, simulations: int = 5) -> dict:
             resp = str(get_llm().invoke(prompt)).strip()
             m    = re.search(r'\b([0-9]|10)\b', resp)
             s    = float(m.group(1)) if m else 5.0
+            from_llm = True
         except Exception:
             s = 5.0 + min(len(retrieve(q)) * 0.5, 1.5)
             for step in steps:
@@ -371,9 +365,41 @@ def run_rag_mcts(query: str, simulations: int = 5) -> dict:
                 elif 'Analyze' in step or 'Compare' in step: s += 1.5
                 elif 'Recommend' in step or 'Finalize' in step: s += 2.0
             if len(steps) != len(set(steps)): s -= 3.0
-        return min(max(s, 1.0), 10.0)
+            from_llm = False
+        return min(max(s, 1.0), 10.0), from_llm
+
+    # per-run memo (also holds heuristic fallbacks) in front of the
+    # shared evaluation cache (LLM ratings, across variants and requests)
+    # and the distilled value model
+    scored  = {}
+    sources = {}                 # "cache" | "model" | "llm" | "fallback" → count
+
+    def score_state(q, steps):
+        key = (q, tuple(steps))
+        if key not in scored:
+            from mcts import eval_cache
+            ctx = "\n".join(retrieve(q)) or "No context."
+            s, src = eval_cache.get_or_score(q, steps, "rag",
+                                             lambda: llm_score(q, steps, ctx), ctx)
+            sources[src] = sources.get(src, 0) + 1
+            scored[key] = s
+        return scored[key]
 
     seed_retriever()
+    if RETRIEVER == "semantic":
+        # seeded chunks join the shared store; this search's own chunks rank
+        # first, store chunks only fill the remaining slots above the threshold
+        from mcts import semantic_index
+        semantic_index.remember(chunks)
+        ranked = {}
+
+        def rank(q, top_k):
+            if (q, top_k) not in ranked:
+                ranked[(q, top_k)] = semantic_index.top(q, top_k, first=chunks)
+            return ranked[(q, top_k)]
+    elif chunks:
+        from mcts.rag_index import ChunkIndex
+        rank = ChunkIndex(chunks).top
 
     # ── State ─────────────────────────────────────────────────────
     class RAGMCTSState:
@@ -420,8 +446,11 @@ def run_rag_mcts(query: str, simulations: int = 5) -> dict:
             untried = self.untried_actions()
             if not untried: return self
             ra = [a for a in untried if 'Retrieve' in a]
-            action = ra[0] if (ra and self.state.depth == 0) else random.choice(untried)
-            child  = RAGMCTSNode(self.state.move(action), parent=self)
+            if ra and self.state.depth == 0:
+                action = priors.best(self.state.steps, ra) or ra[0]
+            else:
+                action = priors.best(self.state.steps, untried) or random.choice(untried)
+            child  = priors.seed(RAGMCTSNode(self.state.move(action), parent=self))
             self.children.append(child)
             return child
 
@@ -438,9 +467,12 @@ def run_rag_mcts(query: str, simulations: int = 5) -> dict:
             return state.evaluate()
 
     # ── Run ───────────────────────────────────────────────────────
+    from mcts import action_stats
+    priors    = action_stats.priors("rag-mcts", query)
     root      = RAGMCTSNode(RAGMCTSState(query))
     t0        = time.perf_counter()
     best_node = MonteCarloTreeSearch(root).best_action(simulations)
+    action_stats.record("rag-mcts", query, root)
     elapsed   = (time.perf_counter() - t0) * 1000
     plan      = best_node.state.steps or ["Direct Response"]
     score     = best_node.state.evaluate()
@@ -450,5 +482,10 @@ def run_rag_mcts(query: str, simulations: int = 5) -> dict:
         "score": round(score, 2), "simulations": simulations,
         "time_ms": round(elapsed, 2),
         "retrieved_chunks": len(chunks),
+        "retrieval_cache_hits": len(hits),
+        "retriever": RETRIEVER,
+        "eval_cache_hits": sources.get("cache", 0),
+        "model_scored": sources.get("model", 0),
+        "warm_start": bool(priors),
         "description": "MCTS-RAG — seeds context from Wikipedia before search.",
     }   
\ No newline at end of file
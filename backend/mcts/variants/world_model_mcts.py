@@ -281,12 +281,14 @@ def run_wm_mcts(query: str, simulations: int = 5) -> dict:
     WM_MCTS_MAX_DEPTH, MonteCarloTreeSearchNode, MonteCarloTreeSearch = _setup()
 
     # ── World Model ───────────────────────────────────────────────
-    cache = {}
-
-    def predict_score(q, steps):
-        key = f"{q[:40]}|{'->'.join(steps)}"
-        if key in cache:
-            return cache[key]
+    # Per-run memo (also holds heuristic fallbacks) in front of the
+    # shared evaluation cache (LLM ratings, across variants and requests)
+    # and the distilled value model.
+    from mcts import eval_cache
+    cache   = {}
+    sources = {}                 # "cache" | "model" | "llm" | "fallback" → count
+
+    def llm_score(q, steps):
         try:
             from llm import get_llm
             llm    = get_llm()
@@ -294,10 +296,16 @@ def run_wm_mcts(query: str, simulations: int = 5) -> dict:
                       f"Steps: {' -> '.join(steps)}\nReply ONLY with the integer.")
             resp   = str(llm.invoke(prompt)).strip()
             m      = re.search(r'\b([0-9]|10)\b', resp)
-            score  = float(m.group(1)) if m else 5.0
+            return min(max(float(m.group(1)) if m else 5.0, 1.0), 10.0), True
         except Exception:
-            score = _heuristic(q, steps)
-        score = min(max(score, 1.0), 10.0)
+            return min(max(_heuristic(q, steps), 1.0), 10.0), False
+
+    def predict_score(q, steps):
+        key = (q, tuple(steps))
+        if key in cache:
+            return cache[key]
+        score, src = eval_cache.get_or_score(q, steps, "wm", lambda: llm_score(q, steps))
+        sources[src] = sources.get(src, 0) + 1
         cache[key] = score
         return score
 
@@ -358,7 +366,7 @@ def run_wm_mcts(query: str, simulations: int = 5) -> dict:
             for a in untried:
                 s = predict_score(self.state.query, self.state.steps+[a])
                 if s > best_s: best_s, best_a = s, a
-            child = WMCTSNode(self.state.move(best_a), parent=self)
+            child = priors.seed(WMCTSNode(self.state.move(best_a), parent=self))
             self.children.append(child)
             return child
 
@@ -378,9 +386,12 @@ def run_wm_mcts(query: str, simulations: int = 5) -> dict:
             return state.evaluate()
 
     # ── Run ───────────────────────────────────────────────────────
+    from mcts import action_stats
+    priors    = action_stats.priors("wm-mcts", query)
     root      = WMCTSNode(WMCTSState(query))
     t0        = time.perf_counter()
     best_node = MonteCarloTreeSearch(root).best_action(simulations)
+    action_stats.record("wm-mcts", query, root)
     elapsed   = (time.perf_counter() - t0) * 1000
     plan      = best_node.state.steps or ["Direct Response"]
     score     = best_node.state.evaluate()
@@ -389,5 +400,8 @@ def run_wm_mcts(query: str, simulations: int = 5) -> dict:
         "variant": "WM-MCTS", "plan": plan,
         "score": round(score, 2), "simulations": simulations,
         "time_ms": round(elapsed, 2),
+        "eval_cache_hits": sources.get("cache", 0),
+        "model_scored": sources.get("model", 0),
+        "warm_start": bool(priors),
         "description": "World-Model MCTS — LLM predicts action quality before expansion.",
     }
\ No newline at end of file
@@ -186,8 +186,9 @@ def run_mcts_scraping(platforms: list, product_name: str, simulations: int = 5):
             return [p for p in self.platforms if p['name'] not in self.visited]
 
         def execute_action(self, platform):
-            from tools.ecommerce import scrape_platform_real_time
-            time.sleep(WEB_REQUEST_DELAY)
+            from tools.ecommerce import scrape_platform_real_time, price_is_cached
+            if not price_is_cached(platform, self.product):
+                time.sleep(WEB_REQUEST_DELAY)
             new_scraped = self.scraped.copy()
             try:
                 data = scrape_platform_real_time(platform, self.product)
@@ -241,14 +242,15 @@ def run_mcts_scraping(platforms: list, product_name: str, simulations: int = 5):
     MonteCarloTreeSearch(root).best_action(simulations)
 
     # ── Execute actual scraping in priority order ─────────────────
-    from tools.ecommerce import scrape_platform_real_time
+    from tools.ecommerce import scrape_platform_real_time, price_is_cached
 
     final_results = {}
     visited_order = []
 
     for platform in sorted(platforms, key=lambda p: p.get('priority', 999)):
         visited_order.append(platform['name'])
-        time.sleep(WEB_REQUEST_DELAY)
+        if not price_is_cached(platform, product_name):
+            time.sleep(WEB_REQUEST_DELAY)
         try:
             data = scrape_platform_real_time(platform, product_name)
             if data and data.get('price'):
@@ -0,0 +1,18 @@
+# backend/tests/test_product_index.py
+"""Unit tests for tools/product_index.py — run from backend/: python -m pytest tests"""
+
+from tools.product_index import canonical, canonical_key
+
+
+def test_word_order_and_plurals_share_a_key():
+    assert canonical_key('HP laptops') == canonical_key('laptop hp') == 'hp|laptop'
+
+
+def test_sub_brands_keep_their_own_key():
+    assert canonical_key('redmi 12') != canonical_key('xiaomi 12')
+    assert canonical_key('redmi 12') != canonical_key('mi 12')
+    assert canonical('redmi 12')['brand'] == 'mi'
+
+
+def test_brand_name_itself_is_dropped():
+    assert canonical_key('apple iphone 15') == canonical_key('iphone 15')
@@ -0,0 +1,36 @@
+# backend/tests/test_selector_stats.py
+"""Unit tests for tools/selector_stats.py — run from backend/: python -m pytest tests"""
+
+from tools import selector_stats
+from tools.extractors import extract_amazon
+
+# One organic card: deal price in span.a-price, MRP in span.a-color-price first
+CARD = '''<html><body>
+<div data-component-type="s-search-result">
+  <span class="a-color-price">₹59,990</span>
+  <span class="a-price"><span class="a-offscreen">₹49,990</span></span>
+  <h2><a href="/dp/B0TEST0001"><span>Test Laptop</span></a></h2>
+</div></body></html>'''.encode('utf-8')
+
+
+def _fresh(monkeypatch):
+    monkeypatch.setattr(selector_stats, '_scores', {})
+    monkeypatch.setattr(selector_stats, '_save_locked', lambda: None)
+
+
+def test_scores_reorder_precise_selectors(monkeypatch):
+    _fresh(monkeypatch)
+    for _ in range(5):
+        selector_stats.record('amazon', {'price': 'span.a-price-whole'})
+    assert selector_stats.plan('amazon')['price'][0] == 'span.a-price-whole'
+
+
+def test_broad_selector_cannot_overtake_precise(monkeypatch):
+    _fresh(monkeypatch)
+    before = extract_amazon(CARD, 0, 'https://www.amazon.in/s', 'laptop')
+    for _ in range(20):
+        selector_stats.record('amazon', {'price': 'span.a-color-price'})
+    plan  = selector_stats.plan('amazon')
+    after = extract_amazon(CARD, 0, 'https://www.amazon.in/s', 'laptop', selectors=plan)
+    assert plan['price'][-1] == 'span.a-color-price'
+    assert before['price'] == after['price'] == 49990.0
@@ -0,0 +1,41 @@
+# backend/tests/test_text_scan.py
+"""Unit tests for tools/text_scan.py — run from backend/: python -m pytest tests"""
+
+from tools import text_scan
+from tools.extractors import all_prices
+
+
+def test_separator_needs_a_three_digit_group():
+    assert all_prices('₹ 1,299\xa02 items', 0) == [1299.0]
+    assert all_prices('₹ 1,299\xa022 items', 0) == [1299.0]
+
+
+def test_grouped_amounts():
+    assert all_prices('₹1,29,999', 0) == [129999.0]
+    assert all_prices('₹ 1\xa0299', 0) == [1299.0]
+    assert all_prices('Rs. 12,999.50', 0) == [12999.5]
+    assert all_prices('₹12999', 0) == [12999.0]
+
+
+def test_currency_word_must_start_a_word():
+    assert all_prices('USERS 5000', 0) == []
+    assert all_prices('dinner 2 offers 500', 0) == []
+    assert text_scan.first_price('USERS 5000, now Rs 700') == 700.0
+    assert text_scan.first_price('Price₹1,299') == 1299.0
+
+
+def test_floor_filters_junk_offers():
+    assert all_prices('₹99 off · ₹5 cashback · ₹ 24,990', 15000) == [24990.0]
+
+
+def test_rating_denominator_is_not_a_rating():
+    assert text_scan.collect('4.5 out of 5 stars')['ratings'] == [4.5]
+    assert text_scan.collect('Rated 4.2/5')['ratings'] == [4.2]
+    assert text_scan.collect('5 stars')['ratings'] == [5.0]
+
+
+def test_collect_contacts():
+    out = text_scan.collect('Mail Sales@Example.com or call +91 9876543210, ₹1,299')
+    assert out['emails'] == ['sales@example.com']
+    assert out['phones'] == ['9876543210']
+    assert out['prices'] == ['₹1,299']
@@ -0,0 +1,349 @@
+# backend/tools/catalog_mirror.py
+"""
+Local mirror of official brand-site catalogs (Shopify /products.json).
+
+Most Indian D2C brand stores (boAt, Noise, Fastrack, Titan ...) run on
+Shopify, whose public /products.json lists the whole catalog with
+variant prices. A background thread pages through it for every site in
+ecommerce.BRAND_SITES and keeps it in SQLite at CATALOG_DB_PATH:
+
+  sites     host, root, shopify flag, product count, last sync
+  products  one row per product — title, handle, type, tags, min/max
+            variant price, updated_at
+  variants  one row per variant — price, compare_at_price, available
+
+Sync is incremental: rows are rewritten only when Shopify's updated_at
+changed, and products that vanished are deleted once a full pass
+completes. Sites that answer with anything but products JSON are marked
+non-Shopify and re-probed after CATALOG_RETRY_NON_SHOPIFY.
+
+lookup() answers from an in-memory token index built from the tables
+(product_index.canonical() tokens of each title), so an official-site
+price is a dictionary intersection instead of 1–3 HTTP round trips.
+Only watched sites are mirrored and looked up; an official URL from a
+query never starts a crawl. Index builds and matching run outside the
+SQLite lock, which only covers database access.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from config import (
+    CATALOG_MIRROR_ENABLED, CATALOG_DB_PATH, CATALOG_REFRESH,
+    CATALOG_RETRY_NON_SHOPIFY, CATALOG_PAGE_LIMIT, CATALOG_MAX_PAGES,
+    CATALOG_PAGE_DELAY, CATALOG_MIN_MATCH,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+    host      TEXT PRIMARY KEY,
+    root      TEXT NOT NULL,
+    shopify   INTEGER,
+    products  INTEGER DEFAULT 0,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS products (
+    host       TEXT NOT NULL,
+    pid        INTEGER NOT NULL,
+    handle     TEXT,
+    title      TEXT,
+    ptype      TEXT,
+    tags       TEXT,
+    min_price  REAL,
+    max_price  REAL,
+    updated_at TEXT,
+    PRIMARY KEY (host, pid)
+);
+CREATE TABLE IF NOT EXISTS variants (
+    host       TEXT NOT NULL,
+    pid        INTEGER NOT NULL,
+    vid        INTEGER NOT NULL,
+    title      TEXT,
+    price      REAL,
+    compare_at REAL,
+    available  INTEGER,
+    PRIMARY KEY (host, vid)
+);
+CREATE INDEX IF NOT EXISTS variants_pid ON variants (host, pid);
+"""
+
+_CHECK_EVERY = 60        # seconds between refresher passes
+
+_lock    = threading.Lock()        # SQLite connection and _wanted
+_db      = None
+_index_lock = threading.Lock()     # _tokens / _rows (replaced whole, never mutated)
+_tokens  = {}            # host → {token: set(pid)}
+_rows    = {}            # host → {pid: (title, handle, min_price, prices)}
+_wanted  = {}            # host → root URL (sites to mirror)
+_wake    = threading.Event()
+_stop    = threading.Event()
+_thread  = None
+
+
+# ──────────────────────────────────────────────────────────────────
+# Storage
+# ──────────────────────────────────────────────────────────────────
+def _conn():
+    global _db
+    if _db is None:
+        os.makedirs(os.path.dirname(CATALOG_DB_PATH), exist_ok=True)
+        _db = sqlite3.connect(CATALOG_DB_PATH, check_same_thread=False)
+        _db.executescript(_SCHEMA)
+    return _db
+
+
+def _site_root(url: str):
+    parts = urlsplit(url or '')
+    if not parts.hostname:
+        return None, None
+    return parts.hostname, f"{parts.scheme or 'https'}://{parts.hostname}"
+
+
+def _price(raw):
+    try:
+        return float(str(raw).replace(',', '')) if raw not in (None, '') else None
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _title_tokens(title: str) -> frozenset:
+    from tools.product_index import canonical
+    info = canonical(title)
+    return frozenset(info["tokens"]) | frozenset(info["models"])
+
+
+def _build_index(host: str):
+    """(Re)build the in-memory token index of one site from SQLite."""
+    with _lock:
+        db       = _conn()
+        products = db.execute("SELECT pid, title, handle, min_price FROM products "
+                              "WHERE host = ?", (host,)).fetchall()
+        variants = db.execute("SELECT pid, price FROM variants "
+                              "WHERE host = ? AND price IS NOT NULL", (host,)).fetchall()
+    rows = {pid: [title, handle, min_price, []]
+            for pid, title, handle, min_price in products}
+    for pid, price in variants:
+        if pid in rows:
+            rows[pid][3].append(price)
+    index = {}
+    for pid, (title, *_rest) in rows.items():
+        for tok in _title_tokens(title or ''):
+            index.setdefault(tok, set()).add(pid)
+    with _index_lock:
+        _rows[host], _tokens[host] = rows, index
+
+
+# ──────────────────────────────────────────────────────────────────
+# Sync
+# ──────────────────────────────────────────────────────────────────
+def _upsert_locked(host: str, p: dict) -> bool:
+    """Store one products.json entry; False when it was unchanged."""
+    db  = _conn()
+    pid = p.get('id')
+    if pid is None:
+        return False
+    cur = db.execute("SELECT updated_at FROM products WHERE host = ? AND pid = ?",
+                     (host, pid)).fetchone()
+    if cur and cur[0] == p.get('updated_at'):
+        return False
+    prices = [x for x in (_price(v.get('price')) for v in p.get('variants', [])) if x]
+    tags   = p.get('tags')
+    db.execute("INSERT OR REPLACE INTO products VALUES (?,?,?,?,?,?,?,?,?)", (
+        host, pid, p.get('handle'), p.get('title'), p.get('product_type'),
+        ','.join(tags) if isinstance(tags, list) else tags,
+        min(prices) if prices else None, max(prices) if prices else None,
+        p.get('updated_at'),
+    ))
+    db.execute("DELETE FROM variants WHERE host = ? AND pid = ?", (host, pid))
+    db.executemany("INSERT OR REPLACE INTO variants VALUES (?,?,?,?,?,?,?)", [
+        (host, pid, v.get('id'), v.get('title'), _price(v.get('price')),
+         _price(v.get('compare_at_price')), int(bool(v.get('available', True))))
+        for v in p.get('variants', []) if v.get('id') is not None
+    ])
+    return True
+
+
+def sync_site(root: str) -> dict:
+    """Page through root/products.json once; returns {shopify, seen, changed, removed}."""
+    from tools import stream_fetch
+    from tools.ecommerce import _session
+
+    host, root = _site_root(root)
+    s          = _session(root + '/')
+    seen, changed, shopify, complete = set(), 0, None, False
+    for page in range(1, CATALOG_MAX_PAGES + 1):
+        try:
+            r = stream_fetch.get(f"{root}/products.json?limit={CATALOG_PAGE_LIMIT}&page={page}",
+                                 "api", session=s)
+            items = r.json().get('products') if r.status_code == 200 else None
+        except Exception:
+            items = None
+        if items is None:
+            if page == 1:
+                shopify = False
+            break
+        shopify = True
+        if not items:
+            complete = True
+            break
+        with _lock:
+            for p in items:
+                seen.add(p.get('id'))
+                changed += _upsert_locked(host, p)
+            _conn().commit()
+        if len(items) < CATALOG_PAGE_LIMIT:
+            complete = True
+            break
+        time.sleep(CATALOG_PAGE_DELAY)
+
+    removed = 0
+    with _lock:
+        db = _conn()
+        if complete:
+            gone = [pid for (pid,) in db.execute(
+                "SELECT pid FROM products WHERE host = ?", (host,)) if pid not in seen]
+            for pid in gone:
+                db.execute("DELETE FROM products WHERE host = ? AND pid = ?", (host, pid))
+                db.execute("DELETE FROM variants WHERE host = ? AND pid = ?", (host, pid))
+            removed = len(gone)
+        if shopify is not None:
+            count = db.execute("SELECT COUNT(*) FROM products WHERE host = ?",
+                               (host,)).fetchone()[0]
+            db.execute("INSERT OR REPLACE INTO sites VALUES (?,?,?,?,?)",
+                       (host, root, int(shopify), count, time.time()))
+        db.commit()
+    if changed or removed or host not in _tokens:
+        _build_index(host)
+    s.close()
+    return {"shopify": shopify, "seen": len(seen), "changed": changed, "removed": removed}
+
+
+def _due_locked(host: str) -> bool:
+    row = _conn().execute("SELECT shopify, synced_at FROM sites WHERE host = ?",
+                          (host,)).fetchone()
+    if row is None:
+        return True
+    shopify, synced_at = row
+    wait = CATALOG_REFRESH if shopify else CATALOG_RETRY_NON_SHOPIFY
+    return time.time() - (synced_at or 0) > wait
+
+
+def _run():
+    while not _stop.is_set():
+        with _lock:
+            due = [root for host, root in _wanted.items() if _due_locked(host)]
+        for root in due:
+            if _stop.is_set():
+                break
+            try:
+                sync_site(root)
+            except Exception:
+                pass
+        _wake.wait(_CHECK_EVERY)
+        _wake.clear()
+
+
+# ──────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────
+def watch(url: str):
+    """Add a site to the mirror (background sync picks it up) — start() watches BRAND_SITES."""
+    host, root = _site_root(url)
+    if not host:
+        return
+    with _lock:
+        if host in _wanted:
+            return
+        _wanted[host] = root
+    _wake.set()
+
+
+def start():
+    """Mirror every BRAND_SITES store in the background (FastAPI startup hook)."""
+    global _thread
+    if not CATALOG_MIRROR_ENABLED or (_thread and _thread.is_alive()):
+        return
+    from tools.ecommerce import BRAND_SITES
+    for url in BRAND_SITES.values():
+        watch(url)
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="catalog-mirror", daemon=True)
+    _thread.start()
+
+
+def stop():
+    _stop.set()
+    _wake.set()
+
+
+def covers(url: str) -> bool:
+    """True when the site is mirrored (Shopify, synced within CATALOG_REFRESH)."""
+    if not CATALOG_MIRROR_ENABLED:
+        return False
+    host, _ = _site_root(url)
+    with _lock:
+        row = _conn().execute("SELECT shopify, synced_at FROM sites WHERE host = ?",
+                              (host,)).fetchone()
+    return bool(row and row[0] and time.time() - row[1] <= CATALOG_REFRESH)
+
+
+def lookup(url: str, product: str, floor: int = 0):
+    """
+    Best catalog match for product on the site of url, or None.
+    Returns {price, title, url, handle, match} — price is the cheapest
+    variant at or above floor; match is the share of query tokens found
+    in the title (at least CATALOG_MIN_MATCH). Sites that are not
+    watched (BRAND_SITES) return None.
+    """
+    host, root = _site_root(url)
+    if not host or not CATALOG_MIRROR_ENABLED:
+        return None
+    with _lock:
+        if host not in _wanted:
+            return None
+    query = _title_tokens(product)
+    if not query:
+        return None
+    with _index_lock:
+        index, rows = _tokens.get(host), _rows.get(host)
+    if index is None:
+        _build_index(host)
+        with _index_lock:
+            index, rows = _tokens[host], _rows[host]
+    hits = {}
+    for tok in query:
+        for pid in index.get(tok, ()):
+            hits[pid] = hits.get(pid, 0) + 1
+    best = None
+    for pid, n in hits.items():
+        match = n / len(query)
+        if match < CATALOG_MIN_MATCH:
+            continue
+        title, handle, _, prices = rows[pid]
+        valid = [p for p in prices if p >= floor]
+        if not valid:
+            continue
+        cand = (match, -min(valid), title, handle)
+        if best is None or cand > best:
+            best = cand
+    if best is None:
+        return None
+    match, neg_price, title, handle = best
+    return {"price": -neg_price, "title": title, "handle": handle,
+            "url": f"{root}/products/{handle}" if handle else root,
+            "match": round(match, 2)}
+
+
+def stats() -> dict:
+    with _lock:
+        rows = _conn().execute(
+            "SELECT host, shopify, products, synced_at FROM sites ORDER BY host").fetchall()
+    now = time.time()
+    return {host: {"shopify": bool(shopify), "products": n,
+                   "age_s": round(now - synced_at) if synced_at else None}
+            for host, shopify, n, synced_at in rows}
@@ -0,0 +1,100 @@
+# backend/tools/deadline.py
+"""
+Overall request deadline, propagated to every fetch.
+
+A deadline is an absolute time.monotonic() value held in a contextvar,
+so it follows the request through nested calls without extra arguments:
+
+    with deadline.budget(4.0):
+        compare_prices(...)          # every fetch inside sees the budget
+
+timeout(default)   per-fetch timeout = min(default, remaining budget);
+                   raises DeadlineExceeded when nothing usable is left
+can_afford(secs)   False when a step (e.g. a fallback engine) cannot
+                   finish before the deadline
+submit(pool, ...)  ThreadPoolExecutor.submit() that carries the deadline
+                   into the worker thread (threads do not inherit
+                   contextvars on their own)
+
+With no deadline set every helper is a no-op and the configured
+timeouts apply unchanged.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+_MIN_FETCH = 0.25        # seconds — below this a fetch cannot complete
+
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The request's overall budget ran out before this step could start."""
+
+
+def at(seconds: float):
+    """Absolute deadline `seconds` from now, capped by any enclosing one."""
+    if seconds is None:
+        return _deadline.get()
+    end = time.monotonic() + max(seconds, 0)
+    cur = _deadline.get()
+    return min(end, cur) if cur is not None else end
+
+
+@contextmanager
+def budget(seconds: float):
+    """Run the block under an overall budget (None = unbounded)."""
+    if seconds is None:
+        yield
+        return
+    token = _deadline.set(at(seconds))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(end: float = None):
+    """Seconds left (None when no deadline is set)."""
+    end = end if end is not None else _deadline.get()
+    return None if end is None else end - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def expired_at(end: float) -> bool:
+    """expired() for an explicit deadline (None = never)."""
+    return end is not None and time.monotonic() >= end
+
+
+def can_afford(seconds: float) -> bool:
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def limits(default: float) -> bool:
+    """True when the budget, not `default`, bounds the next fetch."""
+    left = remaining()
+    return left is not None and left < default
+
+
+def timeout(default: float) -> float:
+    """Per-fetch timeout under the current budget."""
+    left = remaining()
+    if left is None:
+        return default
+    if left < _MIN_FETCH:
+        raise DeadlineExceeded(f"{left:.2f}s left")
+    return min(default, left)
+
+
+def submit(pool, fn, *args, end: float = None, **kwargs):
+    """pool.submit() carrying the current deadline (or `end`) into the worker."""
+    ctx = contextvars.copy_context()
+    if end is not None:
+        ctx.run(_deadline.set, end)
+    return pool.submit(ctx.run, fn, *args, **kwargs)
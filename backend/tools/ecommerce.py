@@ -1414,6 +1414,15 @@ Sources tried for EVERY query:
   4. Official Site   — auto-detected from brand name OR user-supplied URL
 
 Bing search snippet fallback per platform when direct scraping blocked.
+HTML parsing runs in parse-worker processes (tools/parse_pool.py).
+Pages are streamed with per-use-case byte caps (tools/stream_fetch.py).
+Blocked / timing-out platforms trip a circuit breaker (tools/platform_health.py)
+and go straight to the cheapest working fallback until a probe succeeds.
+Scraped prices are cached per (product, platform) (tools/price_cache.py).
+compare_prices() returns typed per-platform records, compare_prices_stream()
+yields them as each platform finishes; handle_ecommerce() renders text.
+Resolved product pages are indexed by canonical product key
+(tools/product_index.py); repeat comparisons fetch them directly.
 ZERO LLM-generated prices.
 """
 
@@ -1421,8 +1430,23 @@ import requests
 import re
 import time
 import random
-from bs4 import BeautifulSoup
-from config import REQUEST_TIMEOUT, MCTS_SIMULATIONS
+import threading
+import contextvars
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from config import (
+    REQUEST_TIMEOUT, MCTS_SIMULATIONS, TIER1_TIMEOUT, TIER2_TIMEOUT, TIER3_TIMEOUT,
+    PRICE_COMPARE_DEADLINE, DEADLINE_FALLBACK_MIN,
+)
+from tools import (parse_pool, stream_fetch, selector_stats, platform_health,
+                   price_cache, product_index, deadline, session_pool,
+                   catalog_mirror, scheduler)
+from tools.extractors import (
+    valid_price as _valid,
+    extract_amazon, extract_flipkart, extract_official_search,
+    extract_official_page, extract_scan_price, extract_search_price,
+    extract_product_page,
+)
 from mcts.web_scraping_mcts import run_mcts_scraping
 
 
@@ -1530,7 +1554,6 @@ CATEGORY_FLOORS = {
     "cooler": 2000, "heater": 1000, "purifier": 3000,
     "default": 200,
 }
-PRICE_MAX = 500000
 
 MYNTRA_SELLS = {
     "watch","watches","shoe","shoes","sneaker","sandal","bag","bags",
@@ -1550,10 +1573,6 @@ def _floor(product: str) -> int:
     return CATEGORY_FLOORS["default"]
 
 
-def _valid(price, floor: int) -> bool:
-    return price is not None and floor <= float(price) <= PRICE_MAX
-
-
 def _myntra_ok(product: str) -> bool:
     p = product.lower()
     return any(cat in p for cat in MYNTRA_SELLS)
@@ -1572,7 +1591,39 @@ _UA = [
 ]
 
 
+# Shared sessions — inside shared_sessions() every _session() call for the
+# same referer host returns one Session, so cookies and keep-alive
+# connections are reused across products (bulk scheduler). Amazon,
+# Flipkart and Myntra borrow warm sessions from tools/session_pool.py.
+_shared = contextvars.ContextVar("shared_sessions", default=None)
+
+
+@contextmanager
+def shared_sessions():
+    """Scope in which _session() hands out one Session per host."""
+    token = _shared.set(({}, threading.Lock()))
+    try:
+        yield
+    finally:
+        pool, _ = _shared.get()
+        _shared.reset(token)
+        for s in pool.values():
+            s.close()
+
+
 def _session(ref="https://www.google.co.in/"):
+    scope = _shared.get()
+    if scope is not None:
+        pool, lock = scope
+        host = urlsplit(ref).hostname or ''
+        with lock:
+            if host not in pool:
+                pool[host] = _new_session(ref)
+            return pool[host]
+    return _new_session(ref)
+
+
+def _new_session(ref):
     s = requests.Session()
     s.headers.update({
         "User-Agent":                random.choice(_UA),
@@ -1590,142 +1641,340 @@ def _session(ref="https://www.google.co.in/"):
 
 
 # ──────────────────────────────────────────────────────────────────
-# Parsers
+# Health-tracked fetch
 # ──────────────────────────────────────────────────────────────────
-def _parse_inr(text: str):
-    if not text:
-        return None
-    text = re.sub(r'[,\xa0\u200b]', '', str(text)).strip()
-    for pat in [r'₹\s*([0-9]+(?:\.[0-9]{1,2})?)',
-                r'Rs\.?\s*([0-9]+(?:\.[0-9]{1,2})?)',
-                r'INR\s*([0-9]+(?:\.[0-9]{1,2})?)']:
-        m = re.search(pat, text, re.IGNORECASE)
-        if m:
-            try:
-                return float(m.group(1))
-            except Exception:
-                continue
-    return None
+_BLOCK_STATUS  = {403, 429, 503, 529}
 
 
-def _parse_rating(text: str):
-    if not text:
-        return None
-    m = re.search(r'([0-9]+(?:\.[0-9]+)?)\s*(?:out\s*of\s*5|/5|stars?)?',
-                  str(text), re.IGNORECASE)
-    if m:
-        try:
-            v = float(m.group(1))
-            if 0.0 < v <= 5.0:
-                return round(v, 1)
-        except Exception:
-            pass
-    return None
+def _blocked(r, key: str = None) -> bool:
+    """Bot-wall response — block status, or a wall page (stream_fetch.bot_wall)."""
+    return r.status_code in _BLOCK_STATUS or stream_fetch.bot_wall(r.content, key)
 
 
-def _all_prices(text: str, floor: int) -> list:
-    text  = re.sub(r'[,]', '', str(text))
-    found = []
-    for pat in [r'₹\s*([0-9]+(?:\.[0-9]{1,2})?)',
-                r'Rs\.?\s*([0-9]+(?:\.[0-9]{1,2})?)',
-                r'INR\s*([0-9]+(?:\.[0-9]{1,2})?)']:
-        for m in re.findall(pat, text, re.IGNORECASE):
-            try:
-                v = float(m)
-                if _valid(v, floor):
-                    found.append(v)
-            except Exception:
-                continue
-    return sorted(set(found))
+def _health_key(platform: dict) -> str:
+    ptype = platform.get('type', 'generic')
+    if ptype == 'official':
+        return f"official:{_get_domain(platform['name'], platform.get('base_url', ''))}"
+    if ptype == 'generic':
+        return platform['name'].lower()
+    return ptype
+
+
+# Outcomes _fetch() reported inside a _watch() scope — lets a scrape tell
+# "page served, no product" (cacheable miss) from "never got a page".
+_outcomes = contextvars.ContextVar("fetch_outcomes", default=None)
+
+
+@contextmanager
+def _watch():
+    """Scope collecting the (key, outcome) pairs of every _fetch() in it."""
+    seen  = []
+    token = _outcomes.set(seen)
+    try:
+        yield seen
+    finally:
+        _outcomes.reset(token)
+
+
+def _report(key: str, outcome: str, ms: float):
+    platform_health.record(key, outcome, ms)
+    seen = _outcomes.get()
+    if seen is not None:
+        seen.append((key, outcome))
 
 
-def _median(prices: list):
-    if not prices:
+def _fetch(key: str, url: str, use_case: str, session=None, stop: str = None,
+           timeout: float = REQUEST_TIMEOUT, **kwargs):
+    """
+    stream_fetch.get() that reports the outcome to platform_health.
+    Returns None for a blocked response; timeouts are recorded and re-raised.
+    Inside a bulk run the fetch holds a per-host slot (scheduler.host_slot).
+    A timeout forced by the overall deadline (shorter than the platform's
+    own timeout) is not held against the platform's breaker.
+    """
+    with scheduler.host_slot(url):                 # bulk runs: per-host cap
+        limited = deadline.limits(timeout)
+        timeout = deadline.timeout(timeout)        # DeadlineExceeded when spent
+        t0 = time.perf_counter()
+        try:
+            r = stream_fetch.get(url, use_case, session=session, stop=stop,
+                                 timeout=timeout, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            if not limited:
+                _report(key, 'timeout', (time.perf_counter() - t0) * 1000)
+            raise
+    ms = (time.perf_counter() - t0) * 1000
+    if _blocked(r, key):
+        _report(key, 'block', ms)
         return None
-    prices  = sorted(prices)
-    trimmed = prices[:max(1, int(len(prices) * 0.8))]
-    return trimmed[len(trimmed) // 2]
+    _report(key, 'ok', ms)
+    return r
 
 
 # ──────────────────────────────────────────────────────────────────
 # Main handler
 # ──────────────────────────────────────────────────────────────────
 def handle_ecommerce(query: str) -> str:
+    """Chat entry point — text rendering of compare_prices()."""
     try:
-        product      = extract_product_name(query)
-        official_url = extract_official_url(query)
-        floor        = _floor(product)
-        use_myntra   = _myntra_ok(product)
-
-        # Auto-detect brand official site if no URL given
-        auto_brand, auto_site = _get_brand_site(product)
-        if not official_url and auto_site:
-            official_url = auto_site
-
-        out  = f"🔍 Real-Time Price Comparison — India\n{'='*70}\n"
-        out += f"🛍️  Product      : {product.title()}\n"
-        out += f"💰 Price floor   : ₹{floor:,} (junk values rejected below this)\n"
-
-        srcs = "Amazon.in | Flipkart"
-        if use_myntra:
-            srcs += " | Myntra"
-        if official_url:
-            brand_label = auto_brand or "Official Site"
-            srcs += f" | {brand_label} Official"
-        out += f"📡 Sources       : {srcs}\n\n"
-
-        # ── Build platform list ───────────────────────────────────
-        platforms = [
-            {'name': 'Amazon India', 'base_url': 'https://www.amazon.in',
-             'search_path': '/s?k=', 'priority': 1, 'type': 'amazon'},
-            {'name': 'Flipkart',     'base_url': 'https://www.flipkart.com',
-             'search_path': '/search?q=', 'priority': 2, 'type': 'flipkart'},
-        ]
-        if use_myntra:
-            platforms.append(
-                {'name': 'Myntra', 'base_url': 'https://www.myntra.com',
-                 'search_path': '/', 'priority': 3, 'type': 'myntra'})
-        if official_url:
-            brand_label = auto_brand or "Official Site"
-            platforms.insert(0, {
-                'name':       f'{brand_label} Official',
-                'base_url':   official_url,
-                'search_path': '',
-                'priority':   0,
-                'type':       'official',
-                'direct_url': official_url,
-            })
-
-        # ── MCTS-guided scraping ──────────────────────────────────
-        out += f"🌳 MCTS ({MCTS_SIMULATIONS} simulations) deciding visit order...\n"
-        results, visited = run_mcts_scraping(platforms, product, MCTS_SIMULATIONS)
-        results = {k: v for k, v in results.items() if _valid(v.get('price'), floor)}
-        out += f"📊 Visited   : {' → '.join(visited)}\n"
-        out += f"✅ Direct hit: {len(results)}/{len(platforms)}\n"
-
-        # ── Per-platform Bing fallback ────────────────────────────
-        failed = [p for p in platforms if p['name'] not in results]
-        if failed:
-            out += f"⚠️  {len(failed)} platform(s) blocked → Bing fallback...\n"
-            for p in failed:
-                bd = _bing_platform(product, p['name'], floor,
-                                    p.get('base_url', ''))
-                if bd:
-                    results[p['name']] = bd
-                    out += f"   ✅ {p['name']}: ₹{bd['price']:,.0f} via Bing\n"
-                else:
-                    out += f"   ❌ {p['name']}: no price found\n"
-
-        if results:
-            out += f"\n{'='*70}\n\n"
-            return _fmt_results(out, results, product)
-
-        return out + _fmt_none('', product)
-
+        return render_text(compare_prices(query, PRICE_COMPARE_DEADLINE))
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
 
+def _plan_comparison(query: str) -> dict:
+    """Product, floor and platform list for a comparison query."""
+    product      = extract_product_name(query)
+    official_url = extract_official_url(query)
+    use_myntra   = _myntra_ok(product)
+
+    # Auto-detect brand official site if no URL given
+    auto_brand, auto_site = _get_brand_site(product)
+    if not official_url and auto_site:
+        official_url = auto_site
+
+    platforms = [
+        {'name': 'Amazon India', 'base_url': 'https://www.amazon.in',
+         'search_path': '/s?k=', 'priority': 1, 'type': 'amazon'},
+        {'name': 'Flipkart',     'base_url': 'https://www.flipkart.com',
+         'search_path': '/search?q=', 'priority': 2, 'type': 'flipkart'},
+    ]
+    if use_myntra:
+        platforms.append(
+            {'name': 'Myntra', 'base_url': 'https://www.myntra.com',
+             'search_path': '/', 'priority': 3, 'type': 'myntra'})
+    if official_url:
+        brand_label = auto_brand or "Official Site"
+        platforms.insert(0, {
+            'name':       f'{brand_label} Official',
+            'base_url':   official_url,
+            'search_path': '',
+            'priority':   0,
+            'type':       'official',
+            'direct_url': official_url,
+        })
+    return {
+        "product":   product,
+        "floor":     _floor(product),
+        "platforms": platforms,
+        "known_pages": [p['name'] for p in platforms
+                        if product_index.lookup(product, _health_key(p))],
+    }
+
+
+def _price_record(platform: dict, data: dict, via: str, status: str = None) -> dict:
+    """Typed per-platform record for the structured API."""
+    return {
+        "platform":   platform['name'],
+        "type":       platform.get('type', 'generic'),
+        "status":     status or ("ok" if data else "no_price"),   # | "timed_out"
+        "via":        via if data else None,           # "direct" | "fallback"
+        "price":      data.get('price') if data else None,
+        "currency":   data.get('currency', 'INR') if data else None,
+        "rating":     data.get('rating') if data else None,
+        "reviews":    data.get('reviews') if data else None,
+        "title":      data.get('title') if data else None,
+        "url":        data.get('url') if data else None,
+        "source":     data.get('source') if data else None,
+        "latency_ms": data.get('latency_ms') if data else None,
+        "cached":     bool(data.get('cached')) if data else False,
+        "age_s":      data.get('age_s', 0) if data else None,
+    }
+
+
+def _summary(records: list, t0: float, deadline_s: float = None) -> dict:
+    found = sorted((r for r in records if r['status'] == 'ok'), key=lambda r: r['price'])
+    return {
+        "best":       found[0] if found else None,
+        "results":    found + [r for r in records if r['status'] != 'ok'],
+        "timed_out":  [r['platform'] for r in records if r['status'] == 'timed_out'],
+        "deadline_s": deadline_s,
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000),
+    }
+
+
+def compare_prices(query: str, deadline_s: float = None) -> dict:
+    """
+    Structured price comparison — MCTS-ordered direct scrapes, then the
+    search fallback for every platform without a price.
+
+    With deadline_s the comparison is bounded: MCTS is skipped, every
+    platform is scraped concurrently under the shared budget, and
+    platforms still running when it expires come back "timed_out" —
+    whatever finished in time is returned.
+
+    Returns {query, product, floor, platforms, known_pages, visited,
+    circuit_open, results: [record], best, timed_out, deadline_s,
+    elapsed_ms}; records come from _price_record(), found prices first
+    (cheapest first).
+    """
+    t0   = time.perf_counter()
+    plan = _plan_comparison(query)
+    product, floor, platforms = plan['product'], plan['floor'], plan['platforms']
+    base = {
+        "query":       query,
+        "product":     product,
+        "floor":       floor,
+        "platforms":   [p['name'] for p in platforms],
+        "known_pages": plan['known_pages'],
+    }
+
+    if deadline_s is not None:
+        records = list(_bounded_prices(platforms, product, floor, deadline_s))
+        return {
+            **base,
+            "visited":      [r['platform'] for r in records if r['status'] != 'timed_out'],
+            "circuit_open": [p['name'] for p in platforms
+                             if platform_health.is_open(_health_key(p))],
+            "simulations":  0,
+            **_summary(records, t0, deadline_s),
+        }
+
+    # ── MCTS-guided scraping ──────────────────────────────────────
+    results, visited = run_mcts_scraping(platforms, product, MCTS_SIMULATIONS)
+    results = {k: v for k, v in results.items() if _valid(v.get('price'), floor)}
+
+    records = []
+    tripped = []
+    for p in platforms:
+        if p['name'] in results:
+            records.append(_price_record(p, results[p['name']], "direct"))
+            continue
+        if platform_health.is_open(_health_key(p)):
+            tripped.append(p['name'])
+        # ── Per-platform search fallback ──────────────────────────
+        bd = _bing_platform(product, p['name'], floor, p.get('base_url', ''))
+        records.append(_price_record(p, bd, "fallback"))
+
+    return {
+        **base,
+        "visited":      visited,
+        "circuit_open": tripped,
+        "simulations":  MCTS_SIMULATIONS,
+        **_summary(records, t0),
+    }
+
+
+def _platform_price(platform: dict, product: str, floor: int) -> dict:
+    """Direct scrape, then search fallback — one platform, one record."""
+    data = scrape_platform_real_time(platform, product)
+    if data and _valid(data.get('price'), floor):
+        return _price_record(platform, data, "direct")
+    if deadline.expired() or not deadline.can_afford(DEADLINE_FALLBACK_MIN):
+        return _price_record(platform, None, None, "timed_out")
+    bd = _bing_platform(product, platform['name'], floor, platform.get('base_url', ''))
+    if not bd and deadline.expired():
+        return _price_record(platform, None, None, "timed_out")
+    return _price_record(platform, bd, "fallback")
+
+
+def _bounded_prices(platforms: list, product: str, floor: int, deadline_s: float = None):
+    """
+    Yield one record per platform as each finishes — all platforms run
+    concurrently under one shared deadline (tools/deadline.py). When the
+    deadline passes, the platforms still running are yielded "timed_out"
+    and their workers are abandoned (they stop at their next fetch).
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
+
+    end  = deadline.at(deadline_s)
+    pool = ThreadPoolExecutor(max_workers=max(len(platforms), 1))
+    try:
+        futures = {deadline.submit(pool, _platform_price, p, product, floor, end=end): p
+                   for p in platforms}
+        pending = set(futures)
+        try:
+            for fut in as_completed(futures, timeout=deadline.remaining(end)):
+                pending.discard(fut)
+                try:
+                    rec = fut.result()
+                except Exception:
+                    rec = _price_record(futures[fut], None, None)
+                yield rec
+        except TimeoutError:
+            pass
+        for fut in pending:
+            yield _price_record(futures[fut], None, None, "timed_out")
+    finally:
+        pool.shutdown(wait=False)
+
+
+def compare_prices_stream(query: str, deadline_s: float = None):
+    """
+    Streaming comparison — every platform is scraped concurrently and its
+    record is yielded as soon as it finishes. Events (dicts):
+      {"event": "start",  product, floor, platforms, known_pages, deadline_s}
+      {"event": "result", **record}           one per platform
+      {"event": "done",   best, results, timed_out, elapsed_ms}
+    With deadline_s, platforms unfinished at the deadline are reported
+    "timed_out" and "done" is sent on time.
+    """
+    t0   = time.perf_counter()
+    plan = _plan_comparison(query)
+    product, floor, platforms = plan['product'], plan['floor'], plan['platforms']
+    yield {"event": "start", "query": query, "product": product, "floor": floor,
+           "platforms": [p['name'] for p in platforms],
+           "known_pages": plan['known_pages'], "deadline_s": deadline_s}
+
+    records = []
+    for rec in _bounded_prices(platforms, product, floor, deadline_s):
+        records.append(rec)
+        yield {"event": "result", **rec}
+
+    yield {"event": "done", **_summary(records, t0, deadline_s)}
+
+
+# ──────────────────────────────────────────────────────────────────
+# Text renderer (chat output)
+# ──────────────────────────────────────────────────────────────────
+def render_text(cmp: dict) -> str:
+    """Render a compare_prices() result as the chat text report."""
+    product   = cmp['product']
+    platforms = cmp['platforms']
+
+    out  = f"🔍 Real-Time Price Comparison — India\n{'='*70}\n"
+    out += f"🛍️  Product      : {product.title()}\n"
+    out += f"💰 Price floor   : ₹{cmp['floor']:,} (junk values rejected below this)\n"
+
+    srcs = ["Amazon.in", "Flipkart"] + \
+           [n for n in platforms if n == 'Myntra'] + \
+           [n for n in platforms if n.endswith(' Official')]
+    out += f"📡 Sources       : {' | '.join(srcs)}\n\n"
+
+    if cmp.get('known_pages'):
+        out += f"📇 Known pages   : {', '.join(cmp['known_pages'])} (search skipped)\n"
+
+    direct   = [r for r in cmp['results'] if r['via'] == 'direct']
+    fallback = [r for r in cmp['results'] if r['via'] != 'direct']
+    timed    = [r for r in cmp['results'] if r['status'] == 'timed_out']
+    fallback = [r for r in fallback if r['status'] != 'timed_out']
+    if cmp.get('deadline_s') is not None:
+        out += f"⏱️  Deadline  : {cmp['deadline_s']:g}s — all platforms scraped concurrently\n"
+    else:
+        out += f"🌳 MCTS ({cmp.get('simulations', MCTS_SIMULATIONS)} simulations) deciding visit order...\n"
+    out += f"📊 Visited   : {' → '.join(cmp.get('visited', []))}\n"
+    out += f"✅ Direct hit: {len(direct)}/{len(platforms)}\n"
+    for r in timed:
+        out += f"   ⏱️  {r['platform']}: timed out — no answer within the deadline\n"
+
+    if cmp.get('circuit_open'):
+        out += f"⛔ Circuit open : {', '.join(cmp['circuit_open'])} — direct scrape skipped\n"
+    if fallback:
+        out += f"⚠️  {len(fallback)} platform(s) blocked → Bing fallback...\n"
+        for r in sorted(fallback, key=lambda r: platforms.index(r['platform'])):
+            if r['status'] == 'ok':
+                out += f"   ✅ {r['platform']}: ₹{r['price']:,.0f} via Bing\n"
+            else:
+                out += f"   ❌ {r['platform']}: no price found\n"
+
+    found = {r['platform']: r for r in cmp['results'] if r['status'] == 'ok'}
+    if found:
+        out += f"\n{'='*70}\n\n"
+        return _fmt_results(out, found, product)
+
+    return out + _fmt_none('', product)
+
+
 # ──────────────────────────────────────────────────────────────────
 # Amazon.in
 # ──────────────────────────────────────────────────────────────────
@@ -1733,52 +1982,25 @@ def _scrape_amazon(product: str, floor: int):
     q   = product.replace(' ', '+')
     url = f"https://www.amazon.in/s?k={q}"
     try:
-        s = _session("https://www.amazon.in/")
-        try:
-            s.get("https://www.amazon.in/", timeout=5)
-            time.sleep(0.5)
-        except Exception:
-            pass
-        r = s.get(url, timeout=REQUEST_TIMEOUT)
-        if r.status_code != 200:
+        with session_pool.borrow('amazon') as s:
+            if not s.cookies:              # pool not warmed yet — warm inline once
+                try:
+                    stream_fetch.get("https://www.amazon.in/", "cookies", session=s, timeout=5)
+                    if deadline.can_afford(TIER2_TIMEOUT):
+                        time.sleep(0.5)
+                except Exception:
+                    pass
+            r = _fetch('amazon', url, "search_results", session=s,
+                       stop="amazon_results", timeout=TIER2_TIMEOUT)
+            if r is None:
+                session_pool.report_block(s, 'amazon')
+        if r is None or r.status_code != 200:
             return None
-        soup  = BeautifulSoup(r.text, 'html.parser')
-        cards = soup.select('div[data-component-type="s-search-result"]')
-        for card in cards[:15]:
-            if card.get('data-adfeedbackdetails') or \
-               card.select_one('[aria-label*="Sponsored"]'):
-                continue
-            price = None
-            for sel in ['span.a-price span.a-offscreen',
-                        'span.a-price-whole',
-                        '.a-price .a-offscreen',
-                        'span.a-color-price']:
-                el = card.select_one(sel)
-                if el:
-                    p = _parse_inr(el.get_text())
-                    if p and _valid(p, floor):
-                        price = p
-                        break
-            if not price:
-                continue
-            title_el = card.select_one('h2 a span')
-            title    = title_el.get_text(strip=True)[:80] if title_el else product
-            rat_el   = card.select_one('span.a-icon-alt')
-            rating   = _parse_rating(rat_el.get_text()) if rat_el else None
-            rev_el   = card.select_one('span.a-size-base.s-underline-text')
-            reviews  = rev_el.get_text(strip=True) if rev_el else None
-            link_el  = card.select_one('h2 a')
-            purl     = ("https://www.amazon.in" + link_el['href']) if link_el else url
-            return {'price': price, 'rating': rating, 'reviews': reviews,
-                    'title': title, 'url': purl,
-                    'currency': 'INR', 'source': 'amazon.in'}
-        # text scan fallback
-        prices = _all_prices(soup.get_text(), floor)
-        best   = _median(prices)
-        if best:
-            return {'price': best, 'rating': None, 'reviews': None,
-                    'title': product, 'url': url,
-                    'currency': 'INR', 'source': 'amazon.in (scan)'}
+        data = parse_pool.run(extract_amazon, r.content, floor, url, product,
+                              parse_pool.charset(r), selector_stats.plan('amazon'))
+        if data:
+            selector_stats.record('amazon', data.pop('matched', None))
+        return data
     except Exception:
         pass
     return None
@@ -1795,6 +2017,15 @@ def _scrape_flipkart(product: str, floor: int):
     Strategy 2: ₹ string scan within every card (CSS-class-independent)
     Strategy 3: Full page text scan with median price selection
     Strategy 4: Flipkart mobile/lite URL (different HTML, often simpler)
+    Strategies 1-3 run in a parse worker (tools/extractors.extract_flipkart).
+    Selectors are tried in learned hit-rate order (tools/selector_stats.py).
+    A blocked or timed-out variant ends the loop — the others share the
+    same bot wall, so walking them only burns time. All variants use one
+    warm session from tools/session_pool.py.
+    The download stops after the first product cards ("flipkart_results").
+    When the card strategy finds no price in that prefix, the page is
+    fetched again in full so the page scan and the ₹ bot-block check see
+    the whole document.
     """
     q    = product.replace(' ', '+')
     # Multiple URL patterns — different params sometimes bypass bot detection
@@ -1804,133 +2035,38 @@ def _scrape_flipkart(product: str, floor: int):
         f"https://www.flipkart.com/search?q={q}&otracker=search",
     ]
 
-    for url in urls:
-        try:
-            s = _session("https://www.flipkart.com/")
-            s.cookies.set('T', '0', domain='.flipkart.com')
-            s.headers.update({
-                "sec-ch-ua": '"Chromium";v="124", "Google Chrome";v="124"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"Windows"',
-                "Sec-Fetch-Dest": "document",
-                "Sec-Fetch-Mode": "navigate",
-                "Sec-Fetch-Site": "same-origin",
-                "Sec-Fetch-User": "?1",
-            })
-            r = s.get(url, timeout=REQUEST_TIMEOUT)
-            if r.status_code != 200:
-                continue
-
-            soup      = BeautifulSoup(r.text, 'html.parser')
-            page_text = soup.get_text()
-
-            # Quick check — if page has no ₹ at all, it's a bot-block page
-            if '₹' not in page_text and 'Rs.' not in page_text:
-                continue
-
-            # ── Strategy 1 & 2: card-by-card ──────────────────────
-            cards = []
-            for csel in [
-                # 2024-2025 Flipkart layouts
-                'div.cPHDOP', 'div._75nlfW', 'div.slAVV4',
-                # Classic layouts (still used for some categories)
-                'div._1AtVbE', 'div._13oc-S', 'div._2kHMtA',
-                'div._4ddWXP', 'div._1YokD2', 'li.col',
-                'div[data-id]',
-            ]:
-                found = soup.select(csel)
-                if len(found) > 1:
-                    cards = found
+    with session_pool.borrow('flipkart') as s:
+        for url in urls:
+            try:
+                r = _fetch('flipkart', url, "search_results", session=s,
+                           stop="flipkart_results", timeout=TIER2_TIMEOUT)
+                if r is None:
+                    session_pool.report_block(s, 'flipkart')
                     break
-
-            for card in cards[:20]:
-                price = None
-
-                # Strategy 1: known CSS price classes
-                for psel in [
-                    # 2024-2025
-                    'div.Nx9bqj', 'div.Nx9bqj.CxhGGd', 'div._44qnta',
-                    'div.hl05eU div.Nx9bqj', 'span.Nx9bqj',
-                    # 2022-2023
-                    'div._30jeq3', 'div._30jeq3._1_WHN1',
-                    'div._25b18c div._30jeq3',
-                    # older
-                    'div._1vC4OE', 'div._3qQ9m1', 'div.UOCQB1',
-                ]:
-                    el = card.select_one(psel)
-                    if el:
-                        p = _parse_inr(el.get_text())
-                        if p and _valid(p, floor):
-                            price = p
-                            break
-
-                # Strategy 2: any text node containing ₹ inside the card
-                if not price:
-                    for node in card.find_all(string=re.compile(r'₹\s*[0-9]')):
-                        p = _parse_inr(str(node))
-                        if p and _valid(p, floor):
-                            price = p
-                            break
-
-                if not price:
+                if r.status_code != 200:
                     continue
-
-                # Title
-                title = product
-                for tsel in [
-                    'div.KzDlHZ', 'a.wjcEIp', 'div._4rR01T',
-                    'a.s1Q9rs', 'div._2WkVRV', 'a.IRpwTa',
-                    'p.txtnm', '[class*="name"]', 'h2', 'h3',
-                ]:
-                    el = card.select_one(tsel)
-                    if el and el.get_text(strip=True):
-                        title = el.get_text(strip=True)[:80]
+                data = parse_pool.run(extract_flipkart, r.content, floor, url,
+                                      product, parse_pool.charset(r),
+                                      selector_stats.plan('flipkart'))
+                if r.stopped_early and (not data or data['source'] != 'flipkart.com'):
+                    r = _fetch('flipkart', url, "search_results", session=s,
+                               timeout=TIER2_TIMEOUT)
+                    if r is None:
+                        session_pool.report_block(s, 'flipkart')
                         break
-
-                # Rating
-                rating = None
-                for rsel in [
-                    'div.XQDdHH', 'div._3LWZlK', 'span._2_R_DZ',
-                    '[class*="rating"]', 'span.Y1HWO0',
-                ]:
-                    el = card.select_one(rsel)
-                    if el:
-                        rating = _parse_rating(el.get_text())
-                        if rating:
-                            break
-
-                # Link — prefer actual product pages /p/ path
-                link_el = (
-                    card.select_one('a[href*="/p/"]')   or
-                    card.select_one('a[href*="dl="]')   or
-                    card.select_one('a[href]')
-                )
-                if link_el and link_el.get('href'):
-                    href = link_el['href']
-                    purl = href if href.startswith('http') \
-                           else "https://www.flipkart.com" + href
-                else:
-                    purl = url
-
-                return {'price': price, 'rating': rating, 'reviews': None,
-                        'title': title, 'url': purl,
-                        'currency': 'INR', 'source': 'flipkart.com'}
-
-            # ── Strategy 3: full-page text scan ───────────────────
-            # Floor ensures junk (₹5, ₹99 offers) are filtered
-            prices = _all_prices(page_text, floor)
-            best   = _median(prices)
-            if best:
-                # Try to get a product link from the page
-                link_el = soup.select_one('a[href*="/p/"]')
-                purl    = ("https://www.flipkart.com" + link_el['href']
-                           if link_el and link_el.get('href') else url)
-                return {'price': best, 'rating': None, 'reviews': None,
-                        'title': product, 'url': purl,
-                        'currency': 'INR', 'source': 'flipkart.com (scan)'}
-
-        except Exception:
-            continue
+                    if r.status_code != 200:
+                        continue
+                    data = parse_pool.run(extract_flipkart, r.content, floor, url,
+                                          product, parse_pool.charset(r),
+                                          selector_stats.plan('flipkart'))
+                if data:
+                    selector_stats.record('flipkart', data.pop('matched', None))
+                    return data
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                    deadline.DeadlineExceeded):
+                break
+            except Exception:
+                continue
 
     return None
 
@@ -1942,10 +2078,11 @@ def _scrape_myntra(product: str, floor: int):
     q   = product.replace(' ', '%20')
     url = f"https://www.myntra.com/gateway/v2/search/{q}?rawQuery={q}&p=1&rows=8"
     try:
-        s = _session("https://www.myntra.com/")
-        s.headers.update({"X-Myntra-Abtest": "false"})
-        r = s.get(url, timeout=REQUEST_TIMEOUT)
-        if r.status_code == 200:
+        with session_pool.borrow('myntra') as s:
+            r = _fetch('myntra', url, "api", session=s, timeout=TIER2_TIMEOUT)
+            if r is None:
+                session_pool.report_block(s, 'myntra')
+        if r is not None and r.status_code == 200:
             data  = r.json()
             prods = (data.get('searchData', {})
                          .get('results', {})
@@ -1990,6 +2127,8 @@ def _scrape_myntra(product: str, floor: int):
 #
 # Most Indian brand sites (boAt, Noise, Fastrack, Titan) run on Shopify
 # and expose the /products.json API which returns price data as JSON.
+# tools/catalog_mirror.py keeps a local copy of those catalogs, so for
+# mirrored sites the price comes from a local index lookup.
 # ──────────────────────────────────────────────────────────────────
 def _scrape_official(platform: dict, product: str, floor: int):
     base = (platform.get('direct_url') or platform.get('base_url') or '').rstrip('/')
@@ -1999,115 +2138,89 @@ def _scrape_official(platform: dict, product: str, floor: int):
     # Extract product search term (strip brand name if it matches the domain)
     search_q = product.replace(' ', '+')
 
+    # ── Strategy 0: local catalog mirror (tools/catalog_mirror.py) ─
+    hit = catalog_mirror.lookup(base, product, floor)
+    if hit and _valid(hit['price'], floor):
+        return {
+            'price':    hit['price'],
+            'rating':   None,
+            'reviews':  None,
+            'title':    (hit['title'] or product)[:80],
+            'url':      hit['url'],
+            'currency': 'INR',
+            'source':   f"{platform['name']} (catalog)",
+        }
+
     # ── Strategy 1: Shopify /products.json API ────────────────────
     # Works for: boAt, Noise, Fastrack, Titan, Skullcandy, Zebronics etc.
-    try:
-        api_url = f"{base}/products.json?q={search_q}&limit=10"
-        s       = _session(base + '/')
-        r       = s.get(api_url, timeout=8)
-        if r.status_code == 200:
-            try:
-                data     = r.json()
-                products = data.get('products', [])
-                for p in products[:10]:
-                    title    = p.get('title', product)
-                    variants = p.get('variants', [])
-                    # Collect all variant prices
-                    v_prices = []
-                    for v in variants:
-                        raw = v.get('price') or v.get('compare_at_price')
-                        if raw:
-                            try:
-                                v_prices.append(float(str(raw).replace(',', '')))
-                            except Exception:
-                                pass
-                    # Pick lowest valid price (cheapest variant)
-                    valid_prices = [p for p in v_prices if _valid(p, floor)]
-                    if not valid_prices:
-                        continue
-                    price = min(valid_prices)
-                    # Product URL
-                    handle = p.get('handle', '')
-                    purl   = f"{base}/products/{handle}" if handle else base
-                    return {
-                        'price':    price,
-                        'rating':   None,
-                        'reviews':  None,
-                        'title':    title[:80],
-                        'url':      purl,
-                        'currency': 'INR',
-                        'source':   platform['name'],
-                    }
-            except Exception:
-                pass
-    except Exception:
-        pass
+    # Skipped when the mirror holds this site — it has the same data.
+    if not catalog_mirror.covers(base):
+        try:
+            api_url = f"{base}/products.json?q={search_q}&limit=10"
+            s       = _session(base + '/')
+            r       = _fetch(_health_key(platform), api_url, "api", session=s,
+                             timeout=TIER1_TIMEOUT)
+            if r is not None and r.status_code == 200:
+                try:
+                    data     = r.json()
+                    products = data.get('products', [])
+                    for p in products[:10]:
+                        title    = p.get('title', product)
+                        variants = p.get('variants', [])
+                        # Collect all variant prices
+                        v_prices = []
+                        for v in variants:
+                            raw = v.get('price') or v.get('compare_at_price')
+                            if raw:
+                                try:
+                                    v_prices.append(float(str(raw).replace(',', '')))
+                                except Exception:
+                                    pass
+                        # Pick lowest valid price (cheapest variant)
+                        valid_prices = [p for p in v_prices if _valid(p, floor)]
+                        if not valid_prices:
+                            continue
+                        price = min(valid_prices)
+                        # Product URL
+                        handle = p.get('handle', '')
+                        purl   = f"{base}/products/{handle}" if handle else base
+                        return {
+                            'price':    price,
+                            'rating':   None,
+                            'reviews':  None,
+                            'title':    title[:80],
+                            'url':      purl,
+                            'currency': 'INR',
+                            'source':   platform['name'],
+                        }
+                except Exception:
+                    pass
+        except Exception:
+            pass
 
     # ── Strategy 2: Shopify /search?q= page ──────────────────────
     try:
         search_url = f"{base}/search?q={search_q}&type=product"
         s          = _session(base + '/')
-        r          = s.get(search_url, timeout=REQUEST_TIMEOUT)
-        if r.status_code == 200:
-            soup  = BeautifulSoup(r.text, 'html.parser')
-            # Shopify price selectors
-            for psel in [
-                'span.price', 'span[class*="price"]',
-                'div[class*="price"]', 'p[class*="price"]',
-                'span.product-price', 'span.money',
-            ]:
-                for el in soup.select(psel)[:5]:
-                    p = _parse_inr(el.get_text())
-                    if p and _valid(p, floor):
-                        # Get title
-                        title_el = soup.select_one(
-                            'h2[class*="product"], h3[class*="product"], '
-                            'a[class*="product-title"], a[class*="product-name"]'
-                        )
-                        title = title_el.get_text(strip=True)[:80]                                 if title_el else product
-                        link_el = soup.select_one('a[href*="/products/"]')
-                        purl    = (base + link_el['href'])                                   if link_el and link_el.get('href') else search_url
-                        return {
-                            'price': p, 'rating': None, 'reviews': None,
-                            'title': title, 'url': purl,
-                            'currency': 'INR', 'source': platform['name'],
-                        }
+        r          = _fetch(_health_key(platform), search_url, "search_results",
+                            session=s, timeout=TIER1_TIMEOUT)
+        if r is not None and r.status_code == 200:
+            data = parse_pool.run(extract_official_search, r.content, floor, base,
+                                  search_url, product, platform['name'],
+                                  parse_pool.charset(r))
+            if data:
+                return data
     except Exception:
         pass
 
     # ── Strategy 3 & 4: schema.org / Open Graph ───────────────────
     try:
         s = _session()
-        r = s.get(base, timeout=REQUEST_TIMEOUT)
-        if r.status_code == 200:
-            soup  = BeautifulSoup(r.text, 'html.parser')
-            price = None
-            el    = soup.find('span', {'itemprop': 'price'})
-            if el:
-                price = _parse_inr(el.get('content', '') or el.get_text())
-            if not price or not _valid(price, floor):
-                og = soup.find('meta', {'property': 'product:price:amount'})
-                if og:
-                    try:
-                        price = float(og.get('content', '0').replace(',', ''))
-                    except Exception:
-                        pass
-            # Strategy 5: full page text scan
-            if not price or not _valid(price, floor):
-                price = _median(_all_prices(soup.get_text(), floor))
-            if price and _valid(price, floor):
-                og_t  = soup.find('meta', {'property': 'og:title'})
-                title = og_t.get('content', '') if og_t else ''
-                if not title:
-                    h1    = soup.find('h1')
-                    title = h1.get_text(strip=True) if h1 else product
-                rat_el = soup.find('span', {'itemprop': 'ratingValue'})
-                rating = _parse_rating(rat_el.get_text()) if rat_el else None
-                return {
-                    'price': price, 'rating': rating, 'reviews': None,
-                    'title': title[:80], 'url': base,
-                    'currency': 'INR', 'source': platform['name'],
-                }
+        r = _fetch(_health_key(platform), base, "product_page", session=s,
+                   timeout=TIER1_TIMEOUT)
+        if r is not None and r.status_code == 200:
+            return parse_pool.run(extract_official_page, r.content, floor, base,
+                                  product, platform['name'], parse_pool.charset(r))
     except Exception:
         pass
 
@@ -2118,12 +2231,13 @@ def _scrape_generic(platform: dict, product: str, floor: int):
     q   = product.replace(' ', '+')
     url = platform['base_url'] + platform['search_path'] + q
     try:
-        r = requests.get(url, headers={"User-Agent": random.choice(_UA)},
-                         timeout=REQUEST_TIMEOUT)
-        if r.status_code != 200:
+        r = _fetch(_health_key(platform), url, "product_page",
+                   headers={"User-Agent": random.choice(_UA)},
+                   timeout=TIER1_TIMEOUT)
+        if r is None or r.status_code != 200:
             return None
-        price = _median(_all_prices(
-            BeautifulSoup(r.text, 'html.parser').get_text(), floor))
+        price = parse_pool.run(extract_scan_price, r.content, floor,
+                               parse_pool.charset(r))
         if price:
             return {'price': price, 'rating': None, 'reviews': None,
                     'title': product, 'url': url,
@@ -2136,15 +2250,88 @@ def _scrape_generic(platform: dict, product: str, floor: int):
 # ──────────────────────────────────────────────────────────────────
 # Platform dispatcher (called by web_scraping_mcts.py)
 # ──────────────────────────────────────────────────────────────────
-def scrape_platform_real_time(platform: dict, product_name: str):
+def scrape_platform_real_time(platform: dict, product_name: str, swr: bool = None):
+    """Cached price for one platform — record carries "cached" and "age_s"."""
+    return price_cache.get_or_fetch(
+        product_name, _health_key(platform),
+        lambda: _timed(lambda: _scrape_platform(platform, product_name)), swr)
+
+
+def _timed(fetch):
+    """Run a scrape and stamp its record with latency_ms."""
+    t0   = time.perf_counter()
+    data = fetch()
+    if data:
+        data['latency_ms'] = round((time.perf_counter() - t0) * 1000)
+    return data
+
+
+def price_is_cached(platform: dict, product_name: str) -> bool:
+    """True when scrape_platform_real_time() will not touch the network."""
+    return price_cache.is_fresh(product_name, _health_key(platform))
+
+
+def _scrape_platform(platform: dict, product_name: str):
     ptype = platform.get('type', 'generic')
     floor = _floor(product_name)
+    key   = _health_key(platform)
+    if not platform_health.allow(key):
+        raise price_cache.Unanswered(key)      # circuit open — caller falls back
+    with _watch() as seen:
+        try:
+            # Known product page → skip search-result scraping
+            known = product_index.lookup(product_name, key)
+            if known:
+                data = _scrape_known_page(platform, known, product_name, floor)
+                if data:
+                    return data
+                product_index.forget(product_name, key)
+
+            if   ptype == 'amazon':   data = _scrape_amazon(product_name, floor)
+            elif ptype == 'flipkart': data = _scrape_flipkart(product_name, floor)
+            elif ptype == 'myntra':   data = _scrape_myntra(product_name, floor)
+            elif ptype == 'official': data = _scrape_official(platform, product_name, floor)
+            else:                     data = _scrape_generic(platform, product_name, floor)
+        except Exception as e:
+            raise price_cache.Unanswered(key) from e
+        finally:
+            if not any(k == key for k, _ in seen):
+                platform_health.release(key)   # half-open probe made no fetch
+    if data:
+        product_index.remember(product_name, key, ptype, data)
+        return data
+    if (key, 'ok') not in seen:                # blocked / timed out — not a real miss
+        raise price_cache.Unanswered(key)
+    return None
+
+
+_PAGE_SOURCES = {'amazon': 'amazon.in', 'flipkart': 'flipkart.com', 'myntra': 'myntra.com'}
+
+
+def _tier_timeout(ptype: str) -> float:
+    """Direct marketplaces → TIER2, official / generic sites → TIER1."""
+    return TIER2_TIMEOUT if ptype in _PAGE_SOURCES else TIER1_TIMEOUT
+
+
+def _scrape_known_page(platform: dict, url: str, product: str, floor: int):
+    """Price straight from an indexed product page (tools/product_index.py)."""
+    ptype  = platform.get('type', 'generic')
+    source = _PAGE_SOURCES.get(ptype, platform['name'])
     try:
-        if   ptype == 'amazon':   return _scrape_amazon(product_name, floor)
-        elif ptype == 'flipkart': return _scrape_flipkart(product_name, floor)
-        elif ptype == 'myntra':   return _scrape_myntra(product_name, floor)
-        elif ptype == 'official': return _scrape_official(platform, product_name, floor)
-        else:                     return _scrape_generic(platform, product_name, floor)
+        if ptype in session_pool.RECIPES:
+            with session_pool.borrow(ptype) as s:
+                r = _fetch(_health_key(platform), url, "product_page", session=s,
+                           timeout=_tier_timeout(ptype))
+                if r is None:
+                    session_pool.report_block(s, ptype)
+        else:
+            s = _session(platform.get('base_url', '').rstrip('/') + '/')
+            r = _fetch(_health_key(platform), url, "product_page", session=s,
+                       timeout=_tier_timeout(ptype))
+        if r is None or r.status_code != 200:
+            return None
+        return parse_pool.run(extract_product_page, r.content, ptype, floor, url,
+                              product, f"{source} (indexed)", parse_pool.charset(r))
     except Exception:
         return None
 
@@ -2165,48 +2352,74 @@ def _get_domain(platform_name: str, base_url: str = '') -> str:
 
 
 def _bing_platform(product: str, platform_name: str, floor: int,
-                   base_url: str = ''):
-    """
-    Multi-engine search fallback per platform.
-    Tries Bing → DuckDuckGo → Google (cached).
-    Handles both ₹ and Rs. price formats in snippets.
-    """
+                   base_url: str = '', swr: bool = None):
+    """Cached search fallback — see _fallback_search()."""
     domain = _get_domain(platform_name, base_url)
     if not domain:
         return None
+    return price_cache.get_or_fetch(
+        product, f"fallback:{domain}",
+        lambda: _timed(lambda: _fallback_search(product, domain, floor)), swr)
 
+
+def _fallback_search(product: str, domain: str, floor: int):
+    """
+    Multi-engine search fallback per platform.
+    Default order Bing → DuckDuckGo → direct site search; platform_health
+    re-ranks it so engines with an open breaker go last and the cheapest
+    (lowest mean latency) working engine goes first. Under a deadline,
+    engines whose mean latency no longer fits the remaining budget are
+    skipped. Raises price_cache.Unanswered when no engine served a page,
+    so the miss is not cached.
+    Handles both ₹ and Rs. price formats in snippets.
+    """
     query   = f"{product} price site:{domain}"
     q_enc   = query.replace(' ', '+')
 
-    # Engine 1: Bing
-    result = _search_engine_price(
-        f"https://www.bing.com/search?q={q_enc}&mkt=en-IN&setlang=en-IN",
-        selectors=['li.b_algo', 'div.b_algo'],
-        product=product, domain=domain, floor=floor,
-        referer="https://www.bing.com/"
-    )
-    if result:
-        return result
-
-    # Engine 2: DuckDuckGo HTML (lite, no JS, scraping-friendly)
-    result = _search_engine_price(
-        f"https://html.duckduckgo.com/html/?q={q_enc}",
-        selectors=['div.result__body', 'div.result'],
-        product=product, domain=domain, floor=floor,
-        referer="https://duckduckgo.com/"
-    )
-    if result:
-        return result
-
-    # Engine 3: Direct search URL for the platform (last resort)
+    engines = {
+        # Bing
+        'bing': lambda: _search_engine_price(
+            f"https://www.bing.com/search?q={q_enc}&mkt=en-IN&setlang=en-IN",
+            selectors=['li.b_algo', 'div.b_algo'],
+            product=product, domain=domain, floor=floor,
+            referer="https://www.bing.com/"),
+        # DuckDuckGo HTML (lite, no JS, scraping-friendly)
+        'ddg': lambda: _search_engine_price(
+            f"https://html.duckduckgo.com/html/?q={q_enc}",
+            selectors=['div.result__body', 'div.result'],
+            product=product, domain=domain, floor=floor,
+            referer="https://duckduckgo.com/"),
+        # Direct search URL for the platform
+        f'direct:{domain}': lambda: _direct_search_scan(product, domain, floor),
+    }
+    with _watch() as seen:
+        for key in platform_health.rank(list(engines)):
+            if not deadline.can_afford(platform_health.expected_latency(key, DEADLINE_FALLBACK_MIN)):
+                continue
+            if not platform_health.allow(key):
+                continue
+            try:
+                result = engines[key]()
+            finally:
+                if not any(k == key for k, _ in seen):
+                    platform_health.release(key)
+            if result:
+                return result
+    if not any(outcome == 'ok' for _, outcome in seen):
+        raise price_cache.Unanswered(domain)   # no engine served a page
+    return None
+
+
+def _direct_search_scan(product: str, domain: str, floor: int):
+    """Platform's own /search?q= page → median ₹ price of the page text."""
     direct_url = f"https://www.{domain}/search?q={product.replace(' ', '+')}"
     try:
         s = _session(f"https://www.{domain}/")
-        r = s.get(direct_url, timeout=8)
-        if r.status_code == 200:
-            text   = BeautifulSoup(r.text, 'html.parser').get_text()
-            prices = _all_prices(text, floor)
-            best   = _median(prices)
+        r = _fetch(f'direct:{domain}', direct_url, "product_page", session=s,
+                   timeout=TIER3_TIMEOUT)
+        if r is not None and r.status_code == 200:
+            best = parse_pool.run(extract_scan_price, r.content, floor,
+                                  parse_pool.charset(r))
             if best:
                 return {'price': best, 'rating': None, 'reviews': None,
                         'title': product, 'url': direct_url,
@@ -2222,46 +2435,13 @@ def _search_engine_price(url: str, selectors: list, product: str,
     """Hit a search engine URL and extract price from result snippets."""
     try:
         s = _session(referer)
-        r = s.get(url, timeout=8)
-        if r.status_code != 200:
+        engine = 'bing' if 'bing.com' in url else 'ddg'
+        r = _fetch(engine, url, "search_results", session=s,
+                   stop=f"{engine}_results", timeout=TIER3_TIMEOUT)
+        if r is None or r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, 'html.parser')
-
-        results = []
-        for sel in selectors:
-            results = soup.select(sel)
-            if results:
-                break
-
-        for res in results[:10]:
-            text   = res.get_text()
-            # Only use results that mention the domain or brand name
-            text_lower = text.lower()
-            domain_parts = re.split(r'[-.]', domain.lower())
-            if not (domain.lower() in text_lower or
-                    any(len(p) > 2 and p in text_lower for p in domain_parts)):
-                continue
-            prices = _all_prices(text, floor)
-            best   = _median(prices)
-            if best:
-                link_el = res.select_one('a[href]')
-                href    = ''
-                if link_el:
-                    href = link_el.get('href', '')
-                    # DuckDuckGo wraps URLs
-                    if 'duckduckgo.com' in href or href.startswith('//'):
-                        m = re.search(r'uddg=([^&]+)', href)
-                        if m:
-                            from urllib.parse import unquote
-                            href = unquote(m.group(1))
-                title = link_el.get_text(strip=True)[:80] if link_el else product
-                if not href:
-                    href = f"https://www.{domain}"
-                engine = 'bing' if 'bing.com' in url else 'ddg'
-                return {'price': best, 'rating': None, 'reviews': None,
-                        'title': title, 'url': href,
-                        'currency': 'INR', 'source': f'{engine}→{domain}'}
-        return None
+        return parse_pool.run(extract_search_price, r.content, engine, selectors,
+                              domain, floor, product, parse_pool.charset(r))
     except Exception:
         return None
 
@@ -2312,14 +2492,15 @@ def extract_official_url(query: str):
 def _fmt_results(output: str, results: dict, product: str) -> str:
     sorted_r = sorted(results.items(), key=lambda x: x[1]['price'])
 
-    output += f"{'PLATFORM':<22} {'PRICE (INR)':>12}  {'RATING':>8}  SOURCE\n"
-    output += f"{'-'*22} {'-'*12}  {'-'*8}  {'-'*24}\n"
+    output += f"{'PLATFORM':<22} {'PRICE (INR)':>12}  {'RATING':>8}  {'AGE':>5}  SOURCE\n"
+    output += f"{'-'*22} {'-'*12}  {'-'*8}  {'-'*5}  {'-'*24}\n"
 
     for name, data in sorted_r:
         price  = f"₹{data['price']:,.0f}"
         rating = f"{data['rating']}/5 ⭐" if data.get('rating') else "N/A"
+        age    = _fmt_age(data)
         source = data.get('source', 'scraped')[:24]
-        output += f"{name:<22} {price:>12}  {rating:>8}  {source}\n"
+        output += f"{name:<22} {price:>12}  {rating:>8}  {age:>5}  {source}\n"
 
     best = sorted_r[0]
     bd   = best[1]
@@ -2340,11 +2521,23 @@ def _fmt_results(output: str, results: dict, product: str) -> str:
                 output += f"  • {name:<20}: {data['url']}{note}\n"
         output += "\n"
 
+    if any(d.get('cached') and d.get('age_s', 0) >= 60 for d in results.values()):
+        output += "🗄️  AGE = time since that price was scraped (cached result).\n"
     output += "📡 All prices scraped live — zero AI-generated values.\n"
     output += "⚠️  Prices change frequently — verify on platform before purchase.\n"
     return output
 
 
+def _fmt_age(data: dict) -> str:
+    """'live' (scraped this minute) or the cached price's age — 12m, 2h."""
+    age = data.get('age_s', 0)
+    if not data.get('cached') or age < 60:
+        return "live"
+    if age < 3600:
+        return f"{age // 60}m"
+    return f"{age // 3600}h"
+
+
 def _fmt_none(output: str, product: str) -> str:
     q = product.replace(' ', '+')
     output += "\n❌ Could not fetch live prices from any source.\n\n"
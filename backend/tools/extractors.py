@@ -0,0 +1,573 @@
+# backend/tools/extractors.py
+"""
+Pure HTML → record extractors.
+
+Every function here takes raw page bytes (plus small scalar arguments)
+and returns a compact, picklable record — prices, titles, links,
+headings — never a soup object. That makes them safe to run inside the
+parse-worker processes of tools/parse_pool.py, so CPU-heavy parsing and
+CSS selection no longer serialize request threads behind the GIL.
+
+Nothing here touches the network.
+"""
+
+import json
+import re
+from urllib.parse import unquote
+from tools.html_parse import parse_html, STRAINERS
+from tools import text_scan
+from tools.text_scan import PRICE_MAX
+
+
+# ──────────────────────────────────────────────────────────────────
+# Price / rating parsers
+# ──────────────────────────────────────────────────────────────────
+def valid_price(price, floor: int) -> bool:
+    return price is not None and floor <= float(price) <= PRICE_MAX
+
+
+def parse_inr(text: str):
+    return text_scan.first_price(text)
+
+
+def parse_rating(text: str):
+    if not text:
+        return None
+    m = re.search(r'([0-9]+(?:\.[0-9]+)?)\s*(?:out\s*of\s*5|/5|stars?)?',
+                  str(text), re.IGNORECASE)
+    if m:
+        try:
+            v = float(m.group(1))
+            if 0.0 < v <= 5.0:
+                return round(v, 1)
+        except Exception:
+            pass
+    return None
+
+
+def all_prices(text: str, floor: int) -> list:
+    return text_scan.prices(text, floor)
+
+
+def median_price(prices: list):
+    if not prices:
+        return None
+    prices  = sorted(prices)
+    trimmed = prices[:max(1, int(len(prices) * 0.8))]
+    return trimmed[len(trimmed) // 2]
+
+
+# ──────────────────────────────────────────────────────────────────
+# Selector lists (default order — tools/selector_stats.py reorders the
+# precise ones by recent hit rate before each scrape; BROAD_SELECTORS
+# always stay last)
+# ──────────────────────────────────────────────────────────────────
+AMAZON_PRICE_SELECTORS = [
+    'span.a-price span.a-offscreen',
+    'span.a-price-whole',
+    '.a-price .a-offscreen',
+    'span.a-color-price',
+]
+
+AMAZON_TITLE_SELECTORS = [
+    'h2 a span', 'h2 span', 'h2',
+]
+
+AMAZON_RATING_SELECTORS = [
+    'span.a-icon-alt', 'i[class*="a-star"] span',
+]
+
+FLIPKART_CARD_SELECTORS = [
+    # 2024-2025 Flipkart layouts
+    'div.cPHDOP', 'div._75nlfW', 'div.slAVV4',
+    # Classic layouts (still used for some categories)
+    'div._1AtVbE', 'div._13oc-S', 'div._2kHMtA',
+    'div._4ddWXP', 'div._1YokD2', 'li.col',
+    'div[data-id]',
+]
+
+FLIPKART_PRICE_SELECTORS = [
+    # 2024-2025
+    'div.Nx9bqj', 'div.Nx9bqj.CxhGGd', 'div._44qnta',
+    'div.hl05eU div.Nx9bqj', 'span.Nx9bqj',
+    # 2022-2023
+    'div._30jeq3', 'div._30jeq3._1_WHN1',
+    'div._25b18c div._30jeq3',
+    # older
+    'div._1vC4OE', 'div._3qQ9m1', 'div.UOCQB1',
+]
+
+FLIPKART_TITLE_SELECTORS = [
+    'div.KzDlHZ', 'a.wjcEIp', 'div._4rR01T',
+    'a.s1Q9rs', 'div._2WkVRV', 'a.IRpwTa',
+    'p.txtnm', '[class*="name"]', 'h2', 'h3',
+]
+
+FLIPKART_RATING_SELECTORS = [
+    'div.XQDdHH', 'div._3LWZlK', 'span._2_R_DZ',
+    '[class*="rating"]', 'span.Y1HWO0',
+]
+
+OFFICIAL_PRICE_SELECTORS = [
+    'span.price', 'span[class*="price"]',
+    'div[class*="price"]', 'p[class*="price"]',
+    'span.product-price', 'span.money',
+]
+
+# Known product pages (tools/product_index.py) — price / title / rating
+PRODUCT_PAGE_SELECTORS = {
+    "amazon": {
+        "price":  ['#corePrice_feature_div span.a-offscreen',
+                   '#corePriceDisplay_desktop_feature_div span.a-offscreen',
+                   '#priceblock_dealprice', '#priceblock_ourprice',
+                   'span.a-price span.a-offscreen'],
+        "title":  ['#productTitle', 'h1'],
+        "rating": ['#acrPopover span.a-icon-alt', 'span.a-icon-alt'],
+    },
+    "flipkart": {
+        "price":  ['div.Nx9bqj.CxhGGd', 'div._30jeq3._16Jk6d'] + FLIPKART_PRICE_SELECTORS,
+        "title":  ['span.VU-ZEz', 'span.B_NuCI', 'h1'],
+        "rating": ['div.XQDdHH', 'div._3LWZlK'],
+    },
+}
+
+# Broad fallbacks — they match far more than the target element (MRP and
+# strike-through prices, any "*rating*" badge, every list item), so the
+# first match depends on order. selector_stats keeps them after the
+# precise selectors whatever their hit rate.
+BROAD_SELECTORS = {
+    'span.a-color-price', 'h2',
+    'li.col', 'div[data-id]',
+    '[class*="name"]', 'h3', '[class*="rating"]',
+}
+
+# platform → kind → selector list (kinds tracked by selector_stats)
+SELECTOR_SETS = {
+    "amazon": {
+        "price":  AMAZON_PRICE_SELECTORS,
+        "title":  AMAZON_TITLE_SELECTORS,
+        "rating": AMAZON_RATING_SELECTORS,
+    },
+    "flipkart": {
+        "card":   FLIPKART_CARD_SELECTORS,
+        "price":  FLIPKART_PRICE_SELECTORS,
+        "title":  FLIPKART_TITLE_SELECTORS,
+        "rating": FLIPKART_RATING_SELECTORS,
+    },
+}
+
+
+def _first(card, selectors: list, parse):
+    """First selector whose element parses to a value → (value, selector)."""
+    for sel in selectors:
+        el = card.select_one(sel)
+        if el:
+            val = parse(el)
+            if val:
+                return val, sel
+    return None, None
+
+
+def _inr_parser(floor: int):
+    """Element → valid ₹ price (for _first)."""
+    def parse(el):
+        p = parse_inr(el.get_text())
+        return p if p and valid_price(p, floor) else None
+    return parse
+
+
+# ──────────────────────────────────────────────────────────────────
+# E-commerce extractors
+# ──────────────────────────────────────────────────────────────────
+def extract_amazon(html: bytes, floor: int, url: str, product: str,
+                   encoding: str = None, selectors: dict = None):
+    """
+    First organic Amazon result card with a valid price, else text-scan median.
+    selectors — {kind: ordered list} overriding SELECTOR_SETS["amazon"];
+    the record's "matched" field names the selector that won per kind.
+    """
+    sels  = {**SELECTOR_SETS["amazon"], **(selectors or {})}
+    soup  = parse_html(html, only=STRAINERS['amazon_results'], from_encoding=encoding)
+    cards = soup.select('div[data-component-type="s-search-result"]')
+    for card in cards[:15]:
+        if card.get('data-adfeedbackdetails') or \
+           card.select_one('[aria-label*="Sponsored"]'):
+            continue
+        price, price_sel = _first(card, sels["price"], _inr_parser(floor))
+        if not price:
+            continue
+        title, title_sel = _first(card, sels["title"],
+                                  lambda el: el.get_text(strip=True)[:80])
+        rating, rat_sel  = _first(card, sels["rating"],
+                                  lambda el: parse_rating(el.get_text()))
+        rev_el   = card.select_one('span.a-size-base.s-underline-text')
+        reviews  = rev_el.get_text(strip=True) if rev_el else None
+        link_el  = card.select_one('h2 a')
+        purl     = ("https://www.amazon.in" + link_el['href']) if link_el else url
+        return {'price': price, 'rating': rating, 'reviews': reviews,
+                'title': title or product, 'url': purl,
+                'currency': 'INR', 'source': 'amazon.in',
+                'matched': {'price': price_sel, 'title': title_sel,
+                            'rating': rat_sel}}
+    # text scan fallback — needs the full page
+    best = median_price(all_prices(
+        parse_html(html, from_encoding=encoding).get_text(), floor))
+    if best:
+        return {'price': best, 'rating': None, 'reviews': None,
+                'title': product, 'url': url,
+                'currency': 'INR', 'source': 'amazon.in (scan)'}
+    return None
+
+
+def extract_flipkart(html: bytes, floor: int, url: str, product: str,
+                     encoding: str = None, selectors: dict = None):
+    """
+    Strategy 1: CSS class-based card parsing
+    Strategy 2: ₹ string scan within every card
+    Strategy 3: full page text scan with median price selection
+    Returns None for bot-block pages (no ₹ anywhere) and empty pages.
+    selectors / "matched" work as in extract_amazon(); a selector is only
+    credited when the price came through it, so a strategy 3 price records
+    the card and price selectors as misses.
+    """
+    sels      = {**SELECTOR_SETS["flipkart"], **(selectors or {})}
+    soup      = parse_html(html, from_encoding=encoding)
+    page_text = soup.get_text()
+
+    # Quick check — if page has no ₹ at all, it's a bot-block page
+    if '₹' not in page_text and 'Rs.' not in page_text:
+        return None
+
+    # ── Strategy 1 & 2: card-by-card ──────────────────────────────
+    cards, card_sel = [], None
+    for csel in sels["card"]:
+        found = soup.select(csel)
+        if len(found) > 1:
+            cards, card_sel = found, csel
+            break
+
+    for card in cards[:20]:
+        # Strategy 1: known CSS price classes
+        price, price_sel = _first(card, sels["price"], _inr_parser(floor))
+
+        # Strategy 2: first valid ₹ price anywhere in the card's text
+        # (the card selector still delimited it; no price selector is credited)
+        if not price:
+            price = text_scan.first_price(card.get_text(' '), floor)
+
+        if not price:
+            continue
+
+        title, title_sel = _first(card, sels["title"],
+                                  lambda el: el.get_text(strip=True)[:80])
+        rating, rat_sel  = _first(card, sels["rating"],
+                                  lambda el: parse_rating(el.get_text()))
+
+        # Link — prefer actual product pages /p/ path
+        link_el = (
+            card.select_one('a[href*="/p/"]')   or
+            card.select_one('a[href*="dl="]')   or
+            card.select_one('a[href]')
+        )
+        if link_el and link_el.get('href'):
+            href = link_el['href']
+            purl = href if href.startswith('http') \
+                   else "https://www.flipkart.com" + href
+        else:
+            purl = url
+
+        return {'price': price, 'rating': rating, 'reviews': None,
+                'title': title or product, 'url': purl,
+                'currency': 'INR', 'source': 'flipkart.com',
+                'matched': {'card': card_sel, 'price': price_sel,
+                            'title': title_sel, 'rating': rat_sel}}
+
+    # ── Strategy 3: full-page text scan ───────────────────────────
+    # Floor ensures junk (₹5, ₹99 offers) are filtered
+    best = median_price(all_prices(page_text, floor))
+    if best:
+        link_el = soup.select_one('a[href*="/p/"]')
+        purl    = ("https://www.flipkart.com" + link_el['href']
+                   if link_el and link_el.get('href') else url)
+        return {'price': best, 'rating': None, 'reviews': None,
+                'title': product, 'url': purl,
+                'currency': 'INR', 'source': 'flipkart.com (scan)',
+                # the price came from neither a card nor a price selector
+                'matched': {'card': None, 'price': None}}
+    return None
+
+
+def extract_official_search(html: bytes, floor: int, base: str, search_url: str,
+                            product: str, source: str, encoding: str = None):
+    """Shopify-style /search?q= results page."""
+    soup = parse_html(html, from_encoding=encoding)
+    for psel in OFFICIAL_PRICE_SELECTORS:
+        for el in soup.select(psel)[:5]:
+            p = parse_inr(el.get_text())
+            if p and valid_price(p, floor):
+                title_el = soup.select_one(
+                    'h2[class*="product"], h3[class*="product"], '
+                    'a[class*="product-title"], a[class*="product-name"]'
+                )
+                title   = title_el.get_text(strip=True)[:80] if title_el else product
+                link_el = soup.select_one('a[href*="/products/"]')
+                purl    = (base + link_el['href']) \
+                          if link_el and link_el.get('href') else search_url
+                return {
+                    'price': p, 'rating': None, 'reviews': None,
+                    'title': title, 'url': purl,
+                    'currency': 'INR', 'source': source,
+                }
+    return None
+
+
+def extract_official_page(html: bytes, floor: int, url: str, product: str,
+                          source: str, encoding: str = None):
+    """schema.org itemprop → Open Graph price meta → full page text scan."""
+    return _structured_page(parse_html(html, from_encoding=encoding),
+                            floor, url, product, source, scan=True)
+
+
+def _structured_page(soup, floor: int, url: str, product: str, source: str,
+                     scan: bool):
+    """Record from itemprop / Open Graph price data (+ optional text scan)."""
+    price = None
+    el    = soup.find('span', {'itemprop': 'price'})
+    if el:
+        price = parse_inr(el.get('content', '') or el.get_text())
+    if not price or not valid_price(price, floor):
+        og = soup.find('meta', {'property': 'product:price:amount'})
+        if og:
+            try:
+                price = float(og.get('content', '0').replace(',', ''))
+            except Exception:
+                pass
+    if scan and (not price or not valid_price(price, floor)):
+        price = median_price(all_prices(soup.get_text(), floor))
+    if not price or not valid_price(price, floor):
+        return None
+    og_t  = soup.find('meta', {'property': 'og:title'})
+    title = og_t.get('content', '') if og_t else ''
+    if not title:
+        h1    = soup.find('h1')
+        title = h1.get_text(strip=True) if h1 else product
+    rat_el = soup.find('span', {'itemprop': 'ratingValue'})
+    rating = parse_rating(rat_el.get_text()) if rat_el else None
+    return {
+        'price': price, 'rating': rating, 'reviews': None,
+        'title': title[:80], 'url': url,
+        'currency': 'INR', 'source': source,
+    }
+
+
+def _jsonld_offer(soup) -> dict:
+    """First schema.org Product offer in JSON-LD → {price, name, rating}."""
+    for tag in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(tag.string or '')
+        except ValueError:
+            continue
+        nodes = data if isinstance(data, list) else [data]
+        for node in list(nodes):
+            if isinstance(node, dict) and isinstance(node.get('@graph'), list):
+                nodes.extend(node['@graph'])
+        for node in nodes:
+            if not isinstance(node, dict) or 'offers' not in node:
+                continue
+            offer = node['offers']
+            if isinstance(offer, list):
+                offer = offer[0] if offer else {}
+            if not isinstance(offer, dict):
+                continue
+            raw = offer.get('price') or offer.get('lowPrice')
+            try:
+                price = float(str(raw).replace(',', ''))
+            except (TypeError, ValueError):
+                continue
+            agg = node.get('aggregateRating') or {}
+            return {'price': price, 'name': node.get('name'),
+                    'rating': parse_rating(str(agg.get('ratingValue', '')))
+                              if isinstance(agg, dict) else None}
+    return None
+
+
+def extract_product_page(html: bytes, platform: str, floor: int, url: str,
+                         product: str, source: str, encoding: str = None):
+    """
+    Price from a known product page (tools/product_index.py):
+    platform selectors → JSON-LD offer → itemprop / Open Graph.
+    No text scan — a product page lists accessories and EMIs too.
+    """
+    soup = parse_html(html, from_encoding=encoding)
+    sels = PRODUCT_PAGE_SELECTORS.get(platform)
+    if sels:
+        price, _ = _first(soup, sels["price"], _inr_parser(floor))
+        if price:
+            title, _  = _first(soup, sels["title"], lambda el: el.get_text(strip=True)[:80])
+            rating, _ = _first(soup, sels["rating"], lambda el: parse_rating(el.get_text()))
+            return {'price': price, 'rating': rating, 'reviews': None,
+                    'title': title or product, 'url': url,
+                    'currency': 'INR', 'source': source}
+    offer = _jsonld_offer(soup)
+    if offer and valid_price(offer['price'], floor):
+        return {'price': offer['price'], 'rating': offer['rating'], 'reviews': None,
+                'title': str(offer['name'] or product)[:80], 'url': url,
+                'currency': 'INR', 'source': source}
+    return _structured_page(soup, floor, url, product, source, scan=False)
+
+
+def extract_scan_price(html: bytes, floor: int, encoding: str = None):
+    """Median valid ₹ price over the whole page text."""
+    return median_price(all_prices(parse_html(html, from_encoding=encoding).get_text(), floor))
+
+
+def extract_search_price(html: bytes, engine: str, selectors: list, domain: str,
+                         floor: int, product: str, encoding: str = None):
+    """First search-engine result snippet that mentions the domain and has a price."""
+    only = STRAINERS['bing_results'] if engine == 'bing' else STRAINERS['ddg_results']
+    soup = parse_html(html, only=only, from_encoding=encoding)
+
+    results = []
+    for sel in selectors:
+        results = soup.select(sel)
+        if results:
+            break
+
+    domain_parts = re.split(r'[-.]', domain.lower())
+    for res in results[:10]:
+        text = res.get_text()
+        # Only use results that mention the domain or brand name
+        text_lower = text.lower()
+        if not (domain.lower() in text_lower or
+                any(len(p) > 2 and p in text_lower for p in domain_parts)):
+            continue
+        best = median_price(all_prices(text, floor))
+        if best:
+            link_el = res.select_one('a[href]')
+            href    = ''
+            if link_el:
+                href = link_el.get('href', '')
+                # DuckDuckGo wraps URLs
+                if 'duckduckgo.com' in href or href.startswith('//'):
+                    m = re.search(r'uddg=([^&]+)', href)
+                    if m:
+                        href = unquote(m.group(1))
+            title = link_el.get_text(strip=True)[:80] if link_el else product
+            if not href:
+                href = f"https://www.{domain}"
+            return {'price': best, 'rating': None, 'reviews': None,
+                    'title': title, 'url': href,
+                    'currency': 'INR', 'source': f'{engine}→{domain}'}
+    return None
+
+
+# ──────────────────────────────────────────────────────────────────
+# Generic page extractors (planner + URL scraper)
+# ──────────────────────────────────────────────────────────────────
+def extract_page(html: bytes, url: str, encoding: str = None) -> dict:
+    """Title, headings, paragraphs, contacts and prices of a content page."""
+    soup = parse_html(html, from_encoding=encoding)
+    for tag in soup(['script', 'style', 'nav', 'footer']):
+        tag.decompose()
+    text     = soup.get_text(separator=' ', strip=True)
+    title    = (soup.find('h1') or soup.find('title'))
+    headings = [h.get_text(strip=True) for h in soup.find_all(['h2', 'h3'])[:6]]
+    paras    = [p.get_text(strip=True) for p in soup.find_all('p')
+                if len(p.get_text()) > 60][:5]
+    found    = text_scan.collect(text, {"emails": 5, "phones": 3, "prices": 5})
+    return {
+        "title":    title.get_text(strip=True)[:100] if title else url,
+        "headings": headings,
+        "paras":    paras,
+        "emails":   found["emails"],
+        "phones":   found["phones"],
+        "prices":   found["prices"],
+        "text":     text[:3000],
+    }
+
+
+def extract_bing_results(html: bytes, n: int = 5, encoding: str = None) -> list:
+    """Bing SERP → [{title, url, snippet}]."""
+    soup    = parse_html(html, only=STRAINERS['bing_results'], from_encoding=encoding)
+    results = []
+    for item in soup.select('li.b_algo')[:n]:
+        title_el   = item.select_one('h2 a')
+        snippet_el = item.select_one('p, .b_caption p')
+        if title_el:
+            results.append({
+                "title":   title_el.get_text(strip=True)[:100],
+                "url":     title_el.get('href', ''),
+                "snippet": snippet_el.get_text(strip=True)[:200] if snippet_el else '',
+            })
+    return results
+
+
+def extract_outline(html: bytes, encoding: str = None) -> dict:
+    """
+    Structured outline for the URL scraper:
+      title, tables (rows of cell text), lists (item text),
+      sections [{level, heading, blocks}], paragraphs, links [(text, href)].
+    """
+    soup = parse_html(html, from_encoding=encoding)
+
+    # Remove unwanted elements
+    for element in soup(["script", "style", "nav", "footer", "header", "aside", "iframe"]):
+        element.decompose()
+
+    title = soup.find("title")
+
+    tables = []
+    for table in soup.find_all("table")[:5]:
+        rows = [[c.get_text().strip() for c in tr.find_all(["th", "td"])]
+                for tr in table.find_all("tr")[:21]]
+        tables.append(rows)
+    n_tables = len(soup.find_all("table"))
+
+    lists = [[li.get_text().strip() for li in lst.find_all("li")[:15]]
+             for lst in soup.find_all(["ul", "ol"])[:3]]
+
+    sections = []
+    for heading in soup.find_all(["h1", "h2", "h3"])[:10]:
+        heading_text = heading.get_text().strip()
+        if not heading_text or len(heading_text) < 3:
+            continue
+        blocks    = []
+        next_elem = heading.find_next_sibling()
+        para_count = 0
+        while next_elem and para_count < 2:
+            if next_elem.name == "p":
+                para_text = next_elem.get_text().strip()
+                if para_text and len(para_text) > 20:
+                    blocks.append(("p", para_text))
+                    para_count += 1
+            elif next_elem.name in ["h1", "h2", "h3"]:
+                break
+            elif next_elem.name in ["ul", "ol"]:
+                items = [i.get_text().strip() for i in next_elem.find_all("li")[:5]]
+                blocks.append(("ul", [t for t in items if t]))
+                para_count += 1
+            next_elem = next_elem.find_next_sibling()
+        sections.append({"level": heading.name, "heading": heading_text,
+                         "blocks": blocks})
+
+    paragraphs = []
+    if not sections:
+        paragraphs = [p.get_text().strip() for p in soup.find_all("p")[:15]]
+
+    links = []
+    for link in soup.find_all("a", href=True):
+        href = link.get("href")
+        text = link.get_text().strip()
+        if href and text and 3 < len(text) < 100 and \
+           (href.startswith("http") or href.startswith("/")):
+            links.append((text, href))
+
+    return {
+        "title":      title.get_text().strip() if title else None,
+        "tables":     tables,
+        "n_tables":   n_tables,
+        "lists":      lists,
+        "sections":   sections,
+        "paragraphs": paragraphs,
+        "links":      links,
+    }
@@ -0,0 +1,49 @@
+# backend/tools/html_parse.py
+"""
+Shared HTML parse engine for every scraper.
+
+parse_html() builds a BeautifulSoup tree with the lxml C parser
+(HTML_PARSER in config.py) and falls back to the pure-Python
+html.parser when lxml is not installed.
+
+Pass only=STRAINERS[...] to keep just the subtrees a scraper needs
+(e.g. Amazon result cards) — the rest of the page is skipped while
+parsing, so tree building and later CSS selection both get cheaper.
+"""
+
+import re
+from bs4 import BeautifulSoup, SoupStrainer, FeatureNotFound
+from config import HTML_PARSER
+
+
+# ──────────────────────────────────────────────────────────────────
+# Restricted-parse targets (SoupStrainer = parse only matching tags)
+# ──────────────────────────────────────────────────────────────────
+STRAINERS = {
+    # Amazon search page → only the organic/sponsored result cards
+    "amazon_results": SoupStrainer('div', attrs={'data-component-type': 's-search-result'}),
+    # Bing SERP → only result blocks
+    "bing_results":   SoupStrainer(['li', 'div'], class_='b_algo'),
+    # DuckDuckGo HTML → only result containers
+    "ddg_results":    SoupStrainer('div', class_=re.compile(r'^result')),
+}
+
+
+def parse_html(markup, only: SoupStrainer = None, parser: str = None,
+               from_encoding: str = None) -> BeautifulSoup:
+    """
+    Parse HTML (str or bytes) with the configured fast parser.
+
+    only          — SoupStrainer restricting the tree to matching subtrees
+    parser        — override HTML_PARSER for this call
+    from_encoding — charset hint, used only when markup is bytes
+    """
+    kwargs = {}
+    if only is not None:
+        kwargs['parse_only'] = only
+    if from_encoding and isinstance(markup, (bytes, bytearray)):
+        kwargs['from_encoding'] = from_encoding
+    try:
+        return BeautifulSoup(markup, parser or HTML_PARSER, **kwargs)
+    except FeatureNotFound:
+        return BeautifulSoup(markup, 'html.parser', **kwargs)
@@ -0,0 +1,453 @@
+# backend/tools/http_cache.py
+"""
+On-disk HTTP response cache with conditional revalidation.
+
+Every cached URL is stored as two files under HTTP_CACHE_DIR:
+  <key>.json  — status, headers, validators, stored_at, freshness lifetime
+  <key>.body  — raw response bytes
+
+Lookup order for cached_get():
+  1. Fresh entry                  → served from disk, no network
+  2. Stale entry + SWR allowed    → served from disk, refreshed in background
+  3. Stale entry with validators  → conditional GET (If-None-Match /
+                                    If-Modified-Since); 304 reuses the body
+  4. Miss                         → plain GET, stored if cacheable
+
+Freshness comes from (first match wins):
+  HTTP_CACHE_DOMAIN_TTL override → Cache-Control s-maxage / max-age →
+  Expires − Date → HTTP_CACHE_DEFAULT_TTL.
+The domain override sets the fresh lifetime only; serving it stale still
+needs HTTP_CACHE_STALE_WHILE_REVALIDATE.
+"no-store" is always honoured; "no-cache" forces revalidation.
+Bot-wall / captcha interstitials (stream_fetch.bot_wall) are never
+stored. The key is the URL alone, so requests carrying credentials —
+a Cookie / Authorization header or a session with cookies — bypass
+the cache entirely.
+
+The directory is capped at HTTP_CACHE_MAX_BYTES: past the cap the least
+recently used entries are deleted (every hit touches the .json mtime).
+
+cached_get(use_case=..., stop=...) downloads through tools/stream_fetch.py
+(byte cap + early stop). A body cut short is stored flagged "partial" and
+only served to later calls with the same use case / stop rule.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from tools import stream_fetch
+from config import (
+    HTTP_CACHE_ENABLED, HTTP_CACHE_DIR, HTTP_CACHE_DEFAULT_TTL,
+    HTTP_CACHE_MAX_STALE, HTTP_CACHE_STALE_WHILE_REVALIDATE,
+    HTTP_CACHE_DOMAIN_TTL, HTTP_CACHE_MAX_BYTES,
+)
+
+_CACHEABLE_STATUS = {200, 203, 300, 301, 404, 410}
+
+_write_lock   = threading.Lock()
+_usage        = None           # bytes on disk, counted on the first store
+_refreshing   = set()          # keys with a background revalidation in flight
+_refresh_lock = threading.Lock()
+
+
+# ──────────────────────────────────────────────────────────────────
+# Response wrapper
+# ──────────────────────────────────────────────────────────────────
+class CachedResponse:
+    """
+    Minimal requests.Response stand-in returned for every cached_get().
+
+    cache_status is one of: "hit", "stale", "revalidated", "miss", "bypass".
+    """
+
+    def __init__(self, url, status_code, headers, content, cache_status,
+                 truncated=False):
+        self.url          = url
+        self.status_code  = status_code
+        self.headers      = CaseInsensitiveDict(headers or {})
+        self.content      = content or b''
+        self.cache_status = cache_status
+        self.truncated    = truncated
+        self.request      = None
+
+    @property
+    def from_cache(self) -> bool:
+        return self.cache_status in ("hit", "stale", "revalidated")
+
+    @property
+    def encoding(self) -> str:
+        m = re.search(r'charset=([\w\-]+)', self.headers.get('Content-Type', ''), re.I)
+        return m.group(1) if m else 'utf-8'
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+# ──────────────────────────────────────────────────────────────────
+# Freshness rules
+# ──────────────────────────────────────────────────────────────────
+def _cache_control(headers) -> dict:
+    """Parse Cache-Control into {directive: value-or-True}."""
+    out = {}
+    for part in (headers.get('Cache-Control') or '').split(','):
+        part = part.strip().lower()
+        if not part:
+            continue
+        name, _, val = part.partition('=')
+        out[name.strip()] = val.strip().strip('"') if val else True
+    return out
+
+
+def _seconds(val):
+    try:
+        return max(int(val), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _http_date(val):
+    try:
+        return parsedate_to_datetime(val).timestamp() if val else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _domain_ttl(url: str):
+    host = (urlsplit(url).hostname or '').lower()
+    for domain, ttl in HTTP_CACHE_DOMAIN_TTL.items():
+        if host == domain or host.endswith('.' + domain):
+            return ttl
+    return None
+
+
+def _freshness(url: str, headers) -> tuple:
+    """Return (lifetime_seconds, swr_window_seconds, must_revalidate)."""
+    override = _domain_ttl(url)
+    if override is not None:
+        return override, 0, False
+
+    cc   = _cache_control(headers)
+    swr  = _seconds(cc.get('stale-while-revalidate')) or 0
+    must = 'must-revalidate' in cc or 'proxy-revalidate' in cc
+    if 'no-cache' in cc:
+        return 0, swr, must
+    for directive in ('s-maxage', 'max-age'):
+        age = _seconds(cc.get(directive))
+        if age is not None:
+            return age, swr, must
+    expires = _http_date(headers.get('Expires'))
+    if expires is not None:
+        date = _http_date(headers.get('Date')) or time.time()
+        return max(int(expires - date), 0), swr, must
+    return HTTP_CACHE_DEFAULT_TTL, swr, must
+
+
+def _wall_key(url: str):
+    """stream_fetch.BLOCK_MARKERS key for the URL's site (amazon.in → amazon)."""
+    host = (urlsplit(url).hostname or '').lower()
+    return next((k for k in stream_fetch.BLOCK_MARKERS if f"{k}." in host), None)
+
+
+def _storable(url: str, status: int, headers, body: bytes) -> bool:
+    return status in _CACHEABLE_STATUS and 'no-store' not in _cache_control(headers) \
+        and not stream_fetch.bot_wall(body, _wall_key(url))
+
+
+def _authenticated(session, headers) -> bool:
+    """Request carries credentials the URL-only cache key cannot tell apart."""
+    sent = CaseInsensitiveDict(session.headers if session is not None else {})
+    sent.update(headers or {})
+    return 'Cookie' in sent or 'Authorization' in sent or \
+        (session is not None and len(session.cookies) > 0)
+
+
+# ──────────────────────────────────────────────────────────────────
+# Disk storage
+# ──────────────────────────────────────────────────────────────────
+def _full_url(url: str, params=None) -> str:
+    if not params:
+        return url
+    sep = '&' if '?' in url else '?'
+    return url + sep + urlencode(sorted(params.items()), doseq=True)
+
+
+def _paths(full_url: str) -> tuple:
+    key  = hashlib.sha256(full_url.encode('utf-8')).hexdigest()
+    base = os.path.join(HTTP_CACHE_DIR, key[:2], key)
+    return key, base + '.json', base + '.body'
+
+
+def _load(full_url: str):
+    _, meta_path, body_path = _paths(full_url)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    if meta.get('url') != full_url:
+        return None, None
+    return meta, body
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _scan() -> list:
+    """[(mtime, base path, bytes)] of every stored entry."""
+    entries = []
+    for root, _, files in os.walk(HTTP_CACHE_DIR):
+        for name in files:
+            if not name.endswith('.json'):
+                continue
+            base = os.path.join(root, name[:-5])
+            try:
+                st   = os.stat(base + '.json')
+                size = st.st_size + os.path.getsize(base + '.body')
+            except OSError:
+                continue
+            entries.append((st.st_mtime, base, size))
+    return entries
+
+
+def _account_locked(nbytes: int):
+    """Add a write to the usage count; evict LRU entries past the cap."""
+    global _usage
+    if _usage is None:
+        _usage = sum(e[2] for e in _scan())
+    _usage += nbytes
+    if _usage <= HTTP_CACHE_MAX_BYTES:
+        return
+    entries = sorted(_scan())
+    _usage  = sum(e[2] for e in entries)
+    target  = HTTP_CACHE_MAX_BYTES * 0.9
+    for _, base, size in entries:
+        if _usage <= target:
+            break
+        for ext in ('.json', '.body'):
+            try:
+                os.remove(base + ext)
+            except OSError:
+                pass
+        _usage -= size
+
+
+def _store(full_url: str, status: int, headers, body: bytes, partial: str = None):
+    if not _storable(full_url, status, headers, body):
+        return None
+    lifetime, swr, must = _freshness(full_url, headers)
+    meta = {
+        "url":           full_url,
+        "status":        status,
+        "headers":       dict(headers),
+        "stored_at":     time.time(),
+        "lifetime":      lifetime,
+        "swr":           swr,
+        "must_revalidate": must,
+        "etag":          headers.get('ETag'),
+        "last_modified": headers.get('Last-Modified'),
+        "partial":       partial,
+    }
+    _, meta_path, body_path = _paths(full_url)
+    try:
+        with _write_lock:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            data = json.dumps(meta).encode('utf-8')
+            _atomic_write(body_path, body or b'')
+            _atomic_write(meta_path, data)
+            _account_locked(len(body or b'') + len(data))
+    except OSError:
+        return None
+    return meta
+
+
+def _touch(full_url: str, meta: dict, headers):
+    """Record a 304 — merge new headers and restart the freshness clock."""
+    merged = CaseInsensitiveDict(meta.get('headers', {}))
+    merged.update(headers or {})
+    lifetime, swr, must = _freshness(full_url, merged)
+    meta.update({
+        "headers":       dict(merged),
+        "stored_at":     time.time(),
+        "lifetime":      lifetime,
+        "swr":           swr,
+        "must_revalidate": must,
+        "etag":          merged.get('ETag'),
+        "last_modified": merged.get('Last-Modified'),
+    })
+    _, meta_path, _ = _paths(full_url)
+    try:
+        with _write_lock:
+            _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+    except OSError:
+        pass
+    return meta
+
+
+def store_response(url: str, status: int, headers, body: bytes, params=None):
+    """Store a response fetched outside cached_get() (e.g. an instrumented fetch)."""
+    if HTTP_CACHE_ENABLED:
+        _store(_full_url(url, params), status, CaseInsensitiveDict(headers or {}), body)
+
+
+def _age(meta: dict) -> float:
+    return time.time() - meta.get('stored_at', 0)
+
+
+def is_fresh(url: str, params=None) -> bool:
+    """True when a fresh copy is on disk (no network needed)."""
+    if not HTTP_CACHE_ENABLED:
+        return False
+    meta, _ = _load(_full_url(url, params))
+    return bool(meta) and _age(meta) < meta.get('lifetime', 0)
+
+
+# ──────────────────────────────────────────────────────────────────
+# Fetching
+# ──────────────────────────────────────────────────────────────────
+def _partial_tag(limit) -> str:
+    """Label stored with a truncated body — "<use_case>/<stop rule>"."""
+    return "/".join(str(x or "") for x in limit) if limit else None
+
+
+def _get(full_url: str, session, headers, timeout, limit=None):
+    """Plain GET, or a capped streaming GET when limit = (use_case, stop)."""
+    if limit:
+        return stream_fetch.get(full_url, limit[0], session=session, stop=limit[1],
+                                headers=headers, timeout=timeout)
+    getter = session.get if session is not None else requests.get
+    return getter(full_url, headers=headers, timeout=timeout)
+
+
+def _fresh_response(full_url, r, limit) -> CachedResponse:
+    """Store a network response and wrap it."""
+    truncated = getattr(r, 'truncated', False)
+    _store(full_url, r.status_code, r.headers, r.content,
+           _partial_tag(limit) if truncated else None)
+    return CachedResponse(full_url, r.status_code, r.headers, r.content, "miss",
+                          truncated)
+
+
+def _conditional_headers(meta: dict, headers) -> dict:
+    h = dict(headers or {})
+    if meta.get('etag'):
+        h['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        h['If-Modified-Since'] = meta['last_modified']
+    return h
+
+
+def _cached(full_url, meta, body, cache_status) -> CachedResponse:
+    try:
+        os.utime(_paths(full_url)[1])        # LRU order for eviction
+    except OSError:
+        pass
+    return CachedResponse(full_url, meta['status'], meta['headers'], body,
+                          cache_status, bool(meta.get('partial')))
+
+
+def _revalidate(full_url, meta, body, session, headers, timeout,
+                limit=None) -> CachedResponse:
+    r = _get(full_url, session, _conditional_headers(meta, headers), timeout, limit)
+    if r.status_code == 304:
+        meta = _touch(full_url, meta, r.headers)
+        return _cached(full_url, meta, body, "revalidated")
+    return _fresh_response(full_url, r, limit)
+
+
+def _background_revalidate(full_url, meta, body, session, headers, timeout,
+                           limit=None):
+    with _refresh_lock:
+        if full_url in _refreshing:
+            return
+        _refreshing.add(full_url)
+
+    def _run():
+        try:
+            _revalidate(full_url, meta, body, session, headers, timeout, limit)
+        except Exception:
+            pass
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(full_url)
+
+    threading.Thread(target=_run, daemon=True).start()
+
+
+def cached_get(url: str, params: dict = None, session=None, headers: dict = None,
+               timeout: float = 10, stale_while_revalidate: bool = None,
+               use_case: str = None, stop: str = None) -> CachedResponse:
+    """
+    GET through the on-disk cache.
+
+    session                — optional requests.Session (keeps its headers;
+                             one holding cookies bypasses the cache)
+    stale_while_revalidate — serve a stale copy immediately and refresh it
+                             in the background (defaults to config; origin
+                             "stale-while-revalidate=N" is always honoured)
+    use_case / stop        — stream the download with the FETCH_MAX_BYTES cap
+                             and STOP_RULES early stop (tools/stream_fetch.py)
+    Network errors fall back to a stale copy when one exists.
+    """
+    full_url = _full_url(url, params)
+    limit    = (use_case, stop) if use_case else None
+    if not HTTP_CACHE_ENABLED or _authenticated(session, headers):
+        r = _get(full_url, session, headers, timeout, limit)
+        return CachedResponse(full_url, r.status_code, r.headers, r.content, "bypass",
+                              getattr(r, 'truncated', False))
+
+    if stale_while_revalidate is None:
+        stale_while_revalidate = HTTP_CACHE_STALE_WHILE_REVALIDATE
+
+    meta, body = _load(full_url)
+    # A truncated body only answers the same use case / stop rule
+    if meta is not None and meta.get('partial') not in (None, _partial_tag(limit)):
+        meta = None
+    if meta is None:
+        return _fresh_response(full_url, _get(full_url, session, headers, timeout, limit),
+                               limit)
+
+    age        = _age(meta)
+    lifetime   = meta.get('lifetime', 0)
+    serve_stale = not meta.get('must_revalidate') and age < lifetime + HTTP_CACHE_MAX_STALE
+    if age < lifetime:
+        return _cached(full_url, meta, body, "hit")
+
+    swr_ok = age < lifetime + (meta.get('swr') or 0) or \
+             (stale_while_revalidate and serve_stale)
+    if swr_ok and not meta.get('must_revalidate'):
+        _background_revalidate(full_url, meta, body, session, headers, timeout, limit)
+        return _cached(full_url, meta, body, "stale")
+
+    try:
+        return _revalidate(full_url, meta, body, session, headers, timeout, limit)
+    except requests.exceptions.RequestException:
+        if serve_stale:
+            return _cached(full_url, meta, body, "stale")
+        raise
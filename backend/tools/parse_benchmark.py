@@ -0,0 +1,100 @@
+# backend/tools/parse_benchmark.py
+"""
+HTML parse microbenchmark — html.parser vs lxml vs lxml + SoupStrainer.
+
+Usage (from backend/):
+  python -m tools.parse_benchmark                      # fetch live platform pages
+  python -m tools.parse_benchmark amazon=page.html ... # recorded pages
+  python -m tools.parse_benchmark --repeat 20
+
+For every platform page it reports mean parse time per mode plus how many
+result cards each mode found, so a restricted parse that drops cards is
+visible next to its speed-up.
+"""
+
+import argparse
+import time
+
+from tools.html_parse import parse_html, STRAINERS
+
+
+# platform → (live search URL, strainer key or None, card selector)
+PLATFORM_PAGES = {
+    "amazon":   ("https://www.amazon.in/s?k=hp+laptop",
+                 "amazon_results", 'div[data-component-type="s-search-result"]'),
+    "flipkart": ("https://www.flipkart.com/search?q=hp+laptop",
+                 None, 'a[href*="/p/"]'),
+    "bing":     ("https://www.bing.com/search?q=hp+laptop+price+site%3Aamazon.in&mkt=en-IN",
+                 "bing_results", 'li.b_algo'),
+    "ddg":      ("https://html.duckduckgo.com/html/?q=hp+laptop+price+site%3Aamazon.in",
+                 "ddg_results", 'div.result__body'),
+}
+
+
+def _time_parse(html: str, repeat: int, **kwargs) -> tuple:
+    soup = None
+    t0   = time.perf_counter()
+    for _ in range(repeat):
+        soup = parse_html(html, **kwargs)
+    return (time.perf_counter() - t0) * 1000 / repeat, soup
+
+
+def benchmark_page(platform: str, html: str, repeat: int = 10) -> dict:
+    _, strainer_key, card_sel = PLATFORM_PAGES.get(platform, (None, None, 'a[href]'))
+    modes = [("html.parser", {"parser": "html.parser"}),
+             ("lxml",        {"parser": "lxml"})]
+    if strainer_key:
+        modes.append((f"lxml+{strainer_key}",
+                      {"parser": "lxml", "only": STRAINERS[strainer_key]}))
+
+    rows = []
+    for label, kwargs in modes:
+        ms, soup = _time_parse(html, repeat, **kwargs)
+        rows.append({"mode": label, "ms": ms, "cards": len(soup.select(card_sel))})
+    base = rows[0]["ms"] or 1e-9
+    for r in rows:
+        r["speedup"] = base / (r["ms"] or 1e-9)
+    return {"platform": platform, "size_kb": len(html.encode('utf-8')) / 1024,
+            "rows": rows}
+
+
+def _fetch(url: str) -> str:
+    from tools.ecommerce import _session
+    r = _session().get(url, timeout=15)
+    r.raise_for_status()
+    return r.text
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("pages", nargs="*",
+                    help="platform=path.html (defaults to live pages for every platform)")
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    pages = []
+    if args.pages:
+        for spec in args.pages:
+            platform, _, path = spec.partition("=")
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((platform, f.read()))
+    else:
+        for platform, (url, _, _) in PLATFORM_PAGES.items():
+            try:
+                pages.append((platform, _fetch(url)))
+            except Exception as e:
+                print(f"⚠️  {platform}: fetch failed ({str(e)[:60]})")
+
+    print(f"{'PLATFORM':<10} {'SIZE KB':>8}  {'MODE':<26} {'MS/PARSE':>9} {'SPEEDUP':>8} {'CARDS':>6}")
+    print(f"{'-'*10} {'-'*8}  {'-'*26} {'-'*9} {'-'*8} {'-'*6}")
+    for platform, html in pages:
+        res = benchmark_page(platform, html, args.repeat)
+        for i, r in enumerate(res["rows"]):
+            name = platform if i == 0 else ""
+            size = f"{res['size_kb']:.0f}" if i == 0 else ""
+            print(f"{name:<10} {size:>8}  {r['mode']:<26} {r['ms']:>9.2f} "
+                  f"{r['speedup']:>7.1f}x {r['cards']:>6}")
+
+
+if __name__ == "__main__":
+    main()
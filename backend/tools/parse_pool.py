@@ -0,0 +1,92 @@
+# backend/tools/parse_pool.py
+"""
+Parse-worker process pool.
+
+Scrapers hand raw response bytes to run(); a ProcessPoolExecutor worker
+runs one of the pure extractors in tools/extractors.py and sends back a
+compact record. Request threads only wait on the future, so concurrent
+price comparisons parse on all cores instead of queueing on one GIL.
+
+PARSE_POOL_WORKERS = 0 parses inline (no subprocesses). If the pool
+breaks (worker killed, spawn failure) the call is retried inline and the
+pool is rebuilt on the next request. A parse that exceeds
+PARSE_POOL_TIMEOUT is cancelled (if still queued) and run inline.
+
+Workers are started with "forkserver" ("spawn" where it is missing),
+never fork: the pool is created lazily from a request thread of a
+multi-threaded server, and a forked child could inherit locks held by
+other threads (session pool, caches, sqlite) and deadlock.
+"""
+
+import multiprocessing
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from config import PARSE_POOL_WORKERS, PARSE_POOL_TIMEOUT
+
+_pool      = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(backend_dir: str):
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+
+
+def _start_method() -> str:
+    methods = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            _pool = ProcessPoolExecutor(max_workers=PARSE_POOL_WORKERS,
+                                        mp_context=multiprocessing.get_context(_start_method()),
+                                        initializer=_init_worker,
+                                        initargs=(backend_dir,))
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def run(fn, *args, **kwargs):
+    """Run extractor fn(*args) in a parse worker and return its record."""
+    if PARSE_POOL_WORKERS <= 0:
+        return fn(*args, **kwargs)
+    try:
+        future = _get_pool().submit(fn, *args, **kwargs)
+    except BrokenProcessPool:
+        _reset_pool()
+        return fn(*args, **kwargs)
+    try:
+        return future.result(timeout=PARSE_POOL_TIMEOUT)
+    except FutureTimeout:
+        future.cancel()
+        return fn(*args, **kwargs)
+    except BrokenProcessPool:
+        _reset_pool()
+        return fn(*args, **kwargs)
+
+
+def shutdown():
+    """Stop worker processes (FastAPI shutdown hook)."""
+    _reset_pool()
+
+
+def charset(response):
+    """Charset declared in Content-Type, or None to let the parser sniff it."""
+    m = re.search(r'charset=([\w\-]+)', response.headers.get('Content-Type', ''), re.I)
+    return m.group(1) if m else None
@@ -0,0 +1,196 @@
+# backend/tools/platform_health.py
+"""
+Per-platform health tracker with a circuit breaker.
+
+Every direct scrape and every fallback engine (bing, ddg, direct:<domain>)
+reports its outcome here:
+  "ok"      — page served (price found or not)
+  "block"   — bot wall / captcha / 403 / 429 / 503
+  "timeout" — timeout or connection failure
+
+Breaker states per key:
+  closed     normal — requests go through
+  open       PLATFORM_BREAKER_THRESHOLD consecutive blocks/timeouts →
+             requests are skipped until the cooldown expires
+  half_open  cooldown over — exactly one probe request is let through;
+             success closes the breaker, failure re-opens it with the
+             cooldown doubled (capped at PLATFORM_BREAKER_MAX_COOLDOWN)
+
+rank() orders a fallback chain: usable keys first, then by the
+exponentially weighted mean latency — the cheapest working fallback is
+tried first. State is in-memory (per server process) and exposed via
+GET /ecommerce/health.
+"""
+
+import threading
+import time
+
+from config import (
+    PLATFORM_BREAKER_THRESHOLD, PLATFORM_BREAKER_COOLDOWN,
+    PLATFORM_BREAKER_MAX_COOLDOWN,
+)
+
+_FAILURES = ("block", "timeout")
+_EWMA     = 0.3          # weight of the newest latency sample
+_PROBE_TIMEOUT = 60      # seconds before an unanswered half-open probe is retried
+
+_lock   = threading.Lock()
+_health = {}             # key → record dict
+
+
+def _entry(key: str) -> dict:
+    rec = _health.get(key)
+    if rec is None:
+        rec = _health[key] = {
+            "state":        "closed",
+            "consecutive":  0,
+            "cooldown":     PLATFORM_BREAKER_COOLDOWN,
+            "opened_at":    None,
+            "probing":      False,
+            "probe_at":     None,
+            "ok":           0,
+            "block":        0,
+            "timeout":      0,
+            "skipped":      0,
+            "latency_ms":   None,
+            "last_outcome": None,
+            "last_at":      None,
+        }
+    return rec
+
+
+def _usable(rec: dict, now: float) -> bool:
+    """closed, or open with the cooldown elapsed (→ half-open probe)."""
+    if rec["state"] == "closed":
+        return True
+    if rec["state"] == "open":
+        return now - rec["opened_at"] >= rec["cooldown"]
+    # a probe that never reported back (crashed caller) expires
+    return not rec["probing"] or now - rec["probe_at"] > _PROBE_TIMEOUT
+
+
+def allow(key: str) -> bool:
+    """
+    True when a request to key may go out. In half-open state only one
+    caller gets True until that probe reports back via record() or is
+    handed back via release().
+    """
+    now = time.time()
+    with _lock:
+        rec = _entry(key)
+        if not _usable(rec, now):
+            rec["skipped"] += 1
+            return False
+        if rec["state"] != "closed":
+            rec["state"]    = "half_open"
+            rec["probing"]  = True
+            rec["probe_at"] = now
+        return True
+
+
+def release(key: str):
+    """
+    Hand back a half-open probe that ended without record() — answered
+    without a network fetch (catalog mirror, error before the request).
+    The next allow() lets a new probe through.
+    """
+    with _lock:
+        rec = _health.get(key)
+        if rec is not None:
+            rec["probing"] = False
+
+
+def record(key: str, outcome: str, elapsed_ms: float = None):
+    """Report one request outcome ("ok" | "block" | "timeout")."""
+    now = time.time()
+    with _lock:
+        rec = _entry(key)
+        rec[outcome]         = rec.get(outcome, 0) + 1
+        rec["last_outcome"]  = outcome
+        rec["last_at"]       = now
+        rec["probing"]       = False
+        if elapsed_ms is not None:
+            prev = rec["latency_ms"]
+            rec["latency_ms"] = elapsed_ms if prev is None \
+                                else (1 - _EWMA) * prev + _EWMA * elapsed_ms
+
+        if outcome not in _FAILURES:
+            rec.update(state="closed", consecutive=0, opened_at=None,
+                       cooldown=PLATFORM_BREAKER_COOLDOWN)
+            return
+
+        rec["consecutive"] += 1
+        if rec["state"] == "half_open":
+            rec["cooldown"]  = min(rec["cooldown"] * 2, PLATFORM_BREAKER_MAX_COOLDOWN)
+            rec["state"]     = "open"
+            rec["opened_at"] = now
+        elif rec["state"] == "closed" and rec["consecutive"] >= PLATFORM_BREAKER_THRESHOLD:
+            rec["state"]     = "open"
+            rec["opened_at"] = now
+
+
+def is_open(key: str) -> bool:
+    """True while key is being skipped (open, cooldown not yet over)."""
+    with _lock:
+        rec = _health.get(key)
+        return bool(rec) and not _usable(rec, time.time())
+
+
+def rank(keys: list) -> list:
+    """
+    Fallback order — usable keys first, cheapest (lowest mean latency)
+    first among them; keys without samples keep their given order ahead
+    of slower known ones so they get measured.
+    """
+    now = time.time()
+    with _lock:
+        def sort_key(item):
+            i, key = item
+            rec = _health.get(key)
+            if rec is None:
+                return (0, 0.0, i)
+            return (0 if _usable(rec, now) else 1, rec["latency_ms"] or 0.0, i)
+        return [key for _, key in sorted(enumerate(keys), key=sort_key)]
+
+
+def expected_latency(key: str, default: float) -> float:
+    """Mean latency of key in seconds (default when not measured yet)."""
+    with _lock:
+        rec = _health.get(key)
+        ms  = rec["latency_ms"] if rec else None
+    return default if ms is None else ms / 1000.0
+
+
+def snapshot() -> dict:
+    """Breaker state, counters and success rate per key (endpoint payload)."""
+    now = time.time()
+    out = {}
+    with _lock:
+        for key, rec in sorted(_health.items()):
+            total = rec["ok"] + rec["block"] + rec["timeout"]
+            retry = None
+            if rec["state"] == "open":
+                retry = max(round(rec["opened_at"] + rec["cooldown"] - now), 0)
+            out[key] = {
+                "state":        rec["state"],
+                "consecutive_failures": rec["consecutive"],
+                "retry_in_s":   retry,
+                "ok":           rec["ok"],
+                "blocked":      rec["block"],
+                "timeouts":     rec["timeout"],
+                "skipped":      rec["skipped"],
+                "success_rate": round(rec["ok"] / total, 3) if total else None,
+                "latency_ms":   round(rec["latency_ms"]) if rec["latency_ms"] is not None else None,
+                "last_outcome": rec["last_outcome"],
+                "last_age_s":   round(now - rec["last_at"]) if rec["last_at"] else None,
+            }
+    return out
+
+
+def reset(key: str = None):
+    """Forget one key (or everything)."""
+    with _lock:
+        if key is None:
+            _health.clear()
+        else:
+            _health.pop(key, None)
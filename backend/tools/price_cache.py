@@ -0,0 +1,174 @@
+# backend/tools/price_cache.py
+"""
+Price result cache per (product, platform).
+
+Sits in front of scrape_platform_real_time() and _bing_platform() so a
+product compared seconds ago is answered without re-scraping. Entries
+are keyed by the canonical product key from tools/product_index.py
+("HP laptops" == "laptop hp") plus the platform key.
+
+  fresh  (age < PRICE_CACHE_TTL[platform])         → served as-is
+  stale  (age < ttl + PRICE_CACHE_MAX_STALE)       → with
+         PRICE_CACHE_STALE_WHILE_REVALIDATE the stale price is returned
+         immediately and one background refresh is started; otherwise
+         the platform is re-scraped in the caller's thread. A background
+         refresh that finds no price keeps the stale entry and backs off
+         for PRICE_CACHE_NEGATIVE_TTL before trying again
+  misses (page served, no price found) are cached for
+         PRICE_CACHE_NEGATIVE_TTL; a fetch() that could not look at all
+         (circuit open, scrape error) raises Unanswered and nothing is
+         cached, so the platform is retried as soon as it recovers
+
+Every returned record carries "cached" (bool) and "age_s" (seconds since
+the price was scraped). The cache is in-memory, LRU-bounded by
+PRICE_CACHE_MAX_ENTRIES.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from tools.product_index import canonical_key
+from tools import deadline
+from config import (
+    PRICE_CACHE_ENABLED, PRICE_CACHE_TTL, PRICE_CACHE_NEGATIVE_TTL,
+    PRICE_CACHE_MAX_STALE, PRICE_CACHE_STALE_WHILE_REVALIDATE,
+    PRICE_CACHE_MAX_ENTRIES,
+)
+
+_lock       = threading.Lock()
+_entries    = OrderedDict()     # (product_key, platform) → (stored_at, record|None)
+_refreshing = set()
+_backoff    = {}                # key → time before which no background refresh runs
+_stats      = {"hit": 0, "stale": 0, "miss": 0}
+
+
+class Unanswered(Exception):
+    """fetch() got no page to judge (breaker open, scrape error) — never cached."""
+
+
+def product_key(product: str) -> str:
+    return canonical_key(product)
+
+
+def _ttl(platform: str) -> int:
+    base = platform.split(':', 1)[0]
+    return PRICE_CACHE_TTL.get(platform, PRICE_CACHE_TTL.get(base, PRICE_CACHE_TTL['default']))
+
+
+def _annotate(record, stored_at: float, cached: bool):
+    if record is None:
+        return None
+    out = dict(record)
+    out['cached'] = cached
+    out['age_s']  = int(time.time() - stored_at) if cached else 0
+    return out
+
+
+def _count(kind: str):
+    with _lock:
+        _stats[kind] += 1
+
+
+def _put(key, record):
+    with _lock:
+        _entries[key] = (time.time(), dict(record) if record else None)
+        _entries.move_to_end(key)
+        while len(_entries) > PRICE_CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def _refresh_async(key, fetch):
+    with _lock:
+        if key in _refreshing or _backoff.get(key, 0) > time.time():
+            return
+        _refreshing.add(key)
+
+    def _run():
+        record = None
+        try:
+            record = fetch()
+        except Exception:
+            pass
+        try:
+            if record is not None:
+                _put(key, record)
+                with _lock:
+                    _backoff.pop(key, None)
+            else:                       # keep the last good price
+                with _lock:
+                    _backoff[key] = time.time() + PRICE_CACHE_NEGATIVE_TTL
+        finally:
+            with _lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=_run, daemon=True).start()
+
+
+def get_or_fetch(product: str, platform: str, fetch, swr: bool = None):
+    """
+    Cached price record for (product, platform); fetch() scrapes it on a
+    miss. Returns the record with "cached"/"age_s" added, or None.
+    """
+    if not PRICE_CACHE_ENABLED:
+        try:
+            return _annotate(fetch(), time.time(), False)
+        except Unanswered:
+            return None
+    if swr is None:
+        swr = PRICE_CACHE_STALE_WHILE_REVALIDATE
+
+    key = (product_key(product), platform)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+
+    if entry is not None:
+        stored_at, record = entry
+        age = time.time() - stored_at
+        ttl = _ttl(platform) if record is not None else PRICE_CACHE_NEGATIVE_TTL
+        if age < ttl:
+            _count("hit")
+            return _annotate(record, stored_at, True)
+        if swr and record is not None and age < ttl + PRICE_CACHE_MAX_STALE:
+            _count("stale")
+            _refresh_async(key, fetch)
+            return _annotate(record, stored_at, True)
+
+    _count("miss")
+    try:
+        record = fetch()
+    except Unanswered:
+        return None
+    if record is not None or not deadline.expired():
+        _put(key, record)          # a miss caused by the deadline is not a real "no price"
+    return _annotate(record, time.time(), False)
+
+
+def is_fresh(product: str, platform: str) -> bool:
+    """True when get_or_fetch() would answer without scraping."""
+    if not PRICE_CACHE_ENABLED:
+        return False
+    with _lock:
+        entry = _entries.get((product_key(product), platform))
+    if entry is None:
+        return False
+    stored_at, record = entry
+    ttl = _ttl(platform) if record is not None else PRICE_CACHE_NEGATIVE_TTL
+    return time.time() - stored_at < ttl
+
+
+def invalidate(product: str = None, platform: str = None):
+    """Drop entries matching product and/or platform (everything if neither)."""
+    pk = product_key(product) if product else None
+    with _lock:
+        for key in [k for k in _entries
+                    if (pk is None or k[0] == pk) and (platform is None or k[1] == platform)]:
+            del _entries[key]
+            _backoff.pop(key, None)
+
+
+def stats() -> dict:
+    with _lock:
+        return {**_stats, "entries": len(_entries)}
@@ -0,0 +1,236 @@
+# backend/tools/product_index.py
+"""
+Canonical product keys + index of resolved product pages.
+
+canonical(product) turns a free-form product phrase into a stable key:
+  1. model numbers are pulled out first ("15s-fq5111tu" → "15sfq5111tu")
+  2. remaining words are stemmed (laptops → laptop, watches → watch)
+     and spelling variants folded (television → tv, mobile → phone)
+  3. brand aliases come from ecommerce.BRAND_SITES — keys on the same
+     site are one brand (xiaomi / redmi / mi → mi); only the brand name
+     itself is dropped from the token list, sub-brands and product lines
+     (redmi, xiaomi, iphone) stay tokens so "redmi 12" ≠ "xiaomi 12"
+  4. key = "<brand>|<sorted tokens + models>"
+So "HP laptops", "laptop hp" and "hp laptop" share the key "hp|laptop".
+
+The index remembers, per canonical key and platform, the product-page URL
+a successful scrape resolved to (Amazon /dp/, Flipkart /p/, Myntra
+/buy, Shopify /products/). A repeat comparison fetches that page
+directly and skips search-result scraping. Entries older than
+PRODUCT_INDEX_MAX_AGE, or whose page stops yielding a price, are dropped.
+
+Persisted to PRODUCT_INDEX_PATH (JSON) every PRODUCT_INDEX_SAVE_EVERY
+updates and on shutdown.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config import (
+    PRODUCT_INDEX_PATH, PRODUCT_INDEX_MAX_AGE, PRODUCT_INDEX_MAX_ENTRIES,
+    PRODUCT_INDEX_SAVE_EVERY,
+)
+
+# Word variants folded before stemming
+VARIANTS = {
+    "television": "tv", "televisions": "tv",
+    "mobile": "phone", "mobiles": "phone", "smartphone": "phone",
+    "smartphones": "phone", "cellphone": "phone",
+    "notebook": "laptop", "notebooks": "laptop",
+}
+
+# Product-page URL shapes per platform type
+PRODUCT_URL_PATTERNS = {
+    "amazon":   re.compile(r'/(?:dp|gp/product)/([A-Z0-9]{10})'),
+    "flipkart": re.compile(r'/p/itm[0-9a-z]+', re.I),
+    "myntra":   re.compile(r'/\d+/buy'),
+    "official": re.compile(r'/products?/[^/?#]+'),
+}
+
+_MODEL_RE = re.compile(r'[a-z0-9]+(?:[-/][a-z0-9]+)*')
+
+_lock    = threading.Lock()
+_index   = None          # key → entry dict
+_pending = 0
+_brands  = None          # (alias → canonical brand, brand names)
+
+
+# ──────────────────────────────────────────────────────────────────
+# Normalization
+# ──────────────────────────────────────────────────────────────────
+def _host_label(url: str) -> str:
+    """Registrable name of a site — www.sony.co.in → sony, in.jbl.com → jbl."""
+    host = (urlsplit(url).hostname or '').split('.')
+    if len(host) > 2 and host[-2] in ('co', 'com'):
+        return host[-3]
+    return host[-2] if len(host) > 1 else host[0]
+
+
+def _brand_aliases() -> tuple:
+    """
+    (alias → brand, brand names) from BRAND_SITES. Aliases on the same
+    site are one brand, but only the brand name itself is droppable:
+    sub-brands sharing a URL (redmi, poco on mi.com) are different
+    product lines at different prices and must stay in the key.
+    """
+    global _brands
+    if _brands is None:
+        from tools.ecommerce import BRAND_SITES
+        by_site = {}
+        for alias, url in BRAND_SITES.items():
+            by_site.setdefault(_host_label(url), []).append((alias.strip(), url))
+        brands, pure = {}, set()
+        for label, items in by_site.items():
+            names = [a for a, _ in items]
+            canon = label if label in names else names[0]
+            pure.add(canon)
+            for alias, _ in items:
+                brands[alias] = canon
+        _brands = (brands, pure)
+    return _brands
+
+
+def _stem(word: str) -> str:
+    word = VARIANTS.get(word, word)
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith(('ches', 'shes', 'sses', 'xes')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def canonical(product: str) -> dict:
+    """{"key", "brand", "tokens", "models"} for a product phrase."""
+    text          = (product or '').lower()
+    aliases, pure = _brand_aliases()
+
+    brand = None
+    for alias in sorted(aliases, key=len, reverse=True):     # "mi tv" before "mi"
+        if re.search(r'\b' + re.escape(alias) + r'\b', text):
+            brand = aliases[alias]
+            break
+
+    models, tokens = [], []
+    for raw in _MODEL_RE.findall(text):
+        if any(c.isdigit() for c in raw) and (len(raw) > 2 or '-' in raw):
+            models.append(re.sub(r'[-/]', '', raw))
+            continue
+        for word in re.split(r'[-/]', raw):
+            word = _stem(word)
+            if word and not (word in pure and aliases.get(word) == brand):
+                tokens.append(word)
+
+    tokens = sorted(set(tokens))
+    models = sorted(set(models))
+    key    = f"{brand or '-'}|{' '.join(sorted(set(tokens + models)))}"
+    return {"key": key, "brand": brand, "tokens": tokens, "models": models}
+
+
+def canonical_key(product: str) -> str:
+    return canonical(product)["key"]
+
+
+# ──────────────────────────────────────────────────────────────────
+# Index of resolved product pages
+# ──────────────────────────────────────────────────────────────────
+def _load():
+    global _index
+    if _index is None:
+        try:
+            with open(PRODUCT_INDEX_PATH, 'r', encoding='utf-8') as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_locked():
+    global _pending
+    try:
+        os.makedirs(os.path.dirname(PRODUCT_INDEX_PATH), exist_ok=True)
+        tmp = f"{PRODUCT_INDEX_PATH}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(_index, f, indent=1)
+        os.replace(tmp, PRODUCT_INDEX_PATH)
+        _pending = 0
+    except OSError:
+        pass
+
+
+def _touch_locked():
+    global _pending
+    _pending += 1
+    if len(_index) > PRODUCT_INDEX_MAX_ENTRIES:
+        oldest = sorted(_index, key=lambda k: _index[k].get("last_seen", 0))
+        for k in oldest[:len(_index) - PRODUCT_INDEX_MAX_ENTRIES]:
+            del _index[k]
+    if _pending >= PRODUCT_INDEX_SAVE_EVERY:
+        _save_locked()
+
+
+def product_url(ptype: str, url: str):
+    """Canonical product-page URL for a platform type, or None for search/other URLs."""
+    pat = PRODUCT_URL_PATTERNS.get(ptype)
+    if not url or pat is None:
+        return None
+    m = pat.search(url)
+    if not m:
+        return None
+    if ptype == 'amazon':
+        return f"https://www.amazon.in/dp/{m.group(1)}"
+    return url.split('#')[0]
+
+
+def lookup(product: str, platform: str):
+    """Known product-page URL for (product, platform key), or None."""
+    key = canonical_key(product)
+    with _lock:
+        entry = _load().get(key)
+        page  = (entry or {}).get("urls", {}).get(platform)
+    if not page or time.time() - page.get("resolved_at", 0) > PRODUCT_INDEX_MAX_AGE:
+        return None
+    return page["url"]
+
+
+def remember(product: str, platform: str, ptype: str, record: dict):
+    """Store the product page a successful scrape resolved to."""
+    url = product_url(ptype, (record or {}).get('url'))
+    if not url:
+        return
+    info = canonical(product)
+    now  = time.time()
+    with _lock:
+        entry = _load().setdefault(info["key"], {
+            "product": product, "brand": info["brand"],
+            "models": info["models"], "seen": 0, "urls": {},
+        })
+        entry["seen"]     += 1
+        entry["last_seen"] = now
+        entry["urls"][platform] = {
+            "url": url, "title": record.get('title'), "resolved_at": now,
+        }
+        _touch_locked()
+
+
+def forget(product: str, platform: str):
+    """Drop a product page that no longer yields a price."""
+    key = canonical_key(product)
+    with _lock:
+        entry = _load().get(key)
+        if entry and entry.get("urls", {}).pop(platform, None):
+            _touch_locked()
+
+
+def save():
+    """Flush pending updates (FastAPI shutdown hook)."""
+    with _lock:
+        if _index is not None and _pending:
+            _save_locked()
@@ -0,0 +1,167 @@
+# backend/tools/scan_benchmark.py
+"""
+Text-extraction microbenchmark — previous multi-regex functions vs the
+precompiled engine in tools/text_scan.py.
+
+Usage (from backend/):
+  python -m tools.scan_benchmark                      # fetch live platform pages
+  python -m tools.scan_benchmark amazon=page.html ... # recorded pages
+  python -m tools.scan_benchmark --repeat 50 --floor 15000
+
+Each page is parsed once to text; then, per task, the old and new
+implementation are timed on the same text. The MATCH column shows
+whether both returned the same values, so a speed-up that changes
+results is visible.
+
+  prices    all_prices(): one findall per currency spelling + filter
+  first     parse_inr():  one search per currency spelling, per node
+  contacts  extract_page(): separate e-mail / phone / price findall
+  cards     Flipkart strategy 2: find_all(string=regex) + parse_inr per
+            node, vs one first_price() over each card's text
+"""
+
+import argparse
+import re
+import time
+
+from tools import text_scan
+from tools.html_parse import parse_html
+from tools.parse_benchmark import PLATFORM_PAGES, _fetch
+
+_INR_PATTERNS = [r'₹\s*([0-9]+(?:\.[0-9]{1,2})?)',
+                 r'Rs\.?\s*([0-9]+(?:\.[0-9]{1,2})?)',
+                 r'INR\s*([0-9]+(?:\.[0-9]{1,2})?)']
+
+
+# ──────────────────────────────────────────────────────────────────
+# Previous implementations (reference)
+# ──────────────────────────────────────────────────────────────────
+def legacy_parse_inr(text: str):
+    if not text:
+        return None
+    text = re.sub(r'[,\xa0\u200b]', '', str(text)).strip()
+    for pat in _INR_PATTERNS:
+        m = re.search(pat, text, re.IGNORECASE)
+        if m:
+            try:
+                return float(m.group(1))
+            except Exception:
+                continue
+    return None
+
+
+def legacy_all_prices(text: str, floor: int) -> list:
+    text  = re.sub(r'[,]', '', str(text))
+    found = []
+    for pat in _INR_PATTERNS:
+        for m in re.findall(pat, text, re.IGNORECASE):
+            try:
+                v = float(m)
+                if floor <= v <= text_scan.PRICE_MAX:
+                    found.append(v)
+            except Exception:
+                continue
+    return sorted(set(found))
+
+
+def legacy_contacts(text: str) -> dict:
+    return {
+        "emails": list(set(re.findall(
+            r'\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Z|a-z]{2,}\b', text)))[:5],
+        "phones": list(set(re.findall(r'(?:\+91[\s\-]?)?[6-9]\d{9}', text)))[:3],
+        "prices": list(set(re.findall(r'₹\s*[\d,]+', text)))[:5],
+    }
+
+
+def _contacts(text: str) -> dict:
+    return text_scan.collect(text, {"emails": 5, "phones": 3, "prices": 5})
+
+
+def _same_contacts(a: dict, b: dict) -> bool:
+    return all(len(a[k]) == len(b[k]) for k in ("emails", "phones", "prices"))
+
+
+# ──────────────────────────────────────────────────────────────────
+# Timing
+# ──────────────────────────────────────────────────────────────────
+def _time(fn, repeat: int, *args) -> tuple:
+    out = None
+    t0  = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(*args)
+    return (time.perf_counter() - t0) * 1000 / repeat, out
+
+
+def legacy_card_price(card, floor: int):
+    for node in card.find_all(string=re.compile(r'₹\s*[0-9]')):
+        p = legacy_parse_inr(str(node))
+        if p and floor <= p <= text_scan.PRICE_MAX:
+            return p
+    return None
+
+
+def benchmark_text(text: str, floor: int, repeat: int = 20, cards: list = ()) -> list:
+    nodes = [line for line in text.splitlines() if line.strip()]
+    tasks = [
+        ("prices",   lambda: legacy_all_prices(text, floor),
+                     lambda: text_scan.prices(text, floor), None),
+        ("first",    lambda: [legacy_parse_inr(n) for n in nodes],
+                     lambda: [text_scan.first_price(n) for n in nodes], None),
+        ("contacts", lambda: legacy_contacts(text),
+                     lambda: _contacts(text), _same_contacts),
+    ]
+    if cards:
+        tasks.append(("cards", lambda: [legacy_card_price(c, floor) for c in cards],
+                               lambda: [text_scan.first_price(c.get_text(' '), floor)
+                                        for c in cards], None))
+    rows = []
+    for name, old, new, same in tasks:
+        old_ms, old_out = _time(old, repeat)
+        new_ms, new_out = _time(new, repeat)
+        rows.append({
+            "task":    name,
+            "old_ms":  old_ms,
+            "new_ms":  new_ms,
+            "speedup": old_ms / (new_ms or 1e-9),
+            "match":   same(old_out, new_out) if same else old_out == new_out,
+        })
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("pages", nargs="*",
+                    help="platform=path.html (defaults to live pages for every platform)")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--floor", type=int, default=500)
+    args = ap.parse_args(argv)
+
+    pages = []
+    if args.pages:
+        for spec in args.pages:
+            platform, _, path = spec.partition("=")
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((platform, f.read()))
+    else:
+        for platform, (url, _, _) in PLATFORM_PAGES.items():
+            try:
+                pages.append((platform, _fetch(url)))
+            except Exception as e:
+                print(f"⚠️  {platform}: fetch failed ({str(e)[:60]})")
+
+    print(f"{'PLATFORM':<10} {'TEXT KB':>8}  {'TASK':<9} {'OLD MS':>8} {'NEW MS':>8} "
+          f"{'SPEEDUP':>8} {'MATCH':>6}")
+    print(f"{'-'*10} {'-'*8}  {'-'*9} {'-'*8} {'-'*8} {'-'*8} {'-'*6}")
+    for platform, html in pages:
+        soup  = parse_html(html)
+        cards = soup.select(PLATFORM_PAGES.get(platform, (None, None, 'div'))[2])[:20]
+        text  = soup.get_text('\n')
+        for i, r in enumerate(benchmark_text(text, args.floor, args.repeat, cards)):
+            name = platform if i == 0 else ""
+            size = f"{len(text.encode('utf-8')) / 1024:.0f}" if i == 0 else ""
+            print(f"{name:<10} {size:>8}  {r['task']:<9} {r['old_ms']:>8.2f} "
+                  f"{r['new_ms']:>8.2f} {r['speedup']:>7.1f}x {'yes' if r['match'] else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# backend/tools/scheduler.py
+"""
+Bulk price comparison with a cross-request platform scheduler.
+
+compare_bulk(products) prices a whole list of products in one call.
+Instead of running one full comparison per product, every
+(product, platform) pair becomes a job and the jobs are scheduled
+globally:
+
+  per-host caps     at most BULK_DOMAIN_CONCURRENCY[host] fetches run
+                    against one host at a time. The slot is taken per
+                    fetch inside ecommerce._fetch (host_slot()), so the
+                    Bing / DuckDuckGo / direct fallbacks a platform job
+                    falls into are capped too. The semaphores are
+                    module-level: concurrent bulk requests share the
+                    same budget instead of doubling the load
+  interleaving      jobs are dispatched round-robin across platforms, so
+                    consecutive hits on one site are spread out
+  shared sessions   the whole batch runs inside
+                    ecommerce.shared_sessions() — one Session (cookies,
+                    keep-alive connections) per host for every product
+
+Duplicate products (same canonical key, tools/product_index.py) are
+priced once. Products beyond BULK_MAX_PRODUCTS are not priced and are
+returned under "skipped". The result carries per-product comparisons
+plus aggregate throughput (products/min) and per-platform success rates
+for the batch.
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from config import BULK_MAX_PRODUCTS, BULK_MAX_WORKERS, BULK_DOMAIN_CONCURRENCY
+from tools import deadline
+from tools.product_index import canonical_key
+
+_lock       = threading.Lock()
+_semaphores = {}          # host → BoundedSemaphore (shared by all requests)
+_POLL       = 0.1         # seconds between dispatch passes when every worker is busy
+_limited    = contextvars.ContextVar("bulk_host_limits", default=False)
+
+
+def _cap(host: str) -> int:
+    for domain, cap in BULK_DOMAIN_CONCURRENCY.items():
+        if host == domain or host.endswith('.' + domain):
+            return cap
+    return BULK_DOMAIN_CONCURRENCY['default']
+
+
+def _semaphore(host: str):
+    with _lock:
+        sem = _semaphores.get(host)
+        if sem is None:
+            sem = _semaphores[host] = threading.BoundedSemaphore(_cap(host))
+        return sem
+
+
+@contextmanager
+def host_slot(url: str):
+    """
+    Hold one of the host's BULK_DOMAIN_CONCURRENCY slots for a fetch.
+    A no-op outside compare_bulk(). Raises deadline.DeadlineExceeded
+    when the deadline passes while waiting.
+    """
+    if not _limited.get():
+        yield
+        return
+    sem  = _semaphore((urlsplit(url).hostname or '').lower())
+    left = deadline.remaining()
+    if not sem.acquire(timeout=max(left, 0) if left is not None else None):
+        raise deadline.DeadlineExceeded()
+    try:
+        yield
+    finally:
+        sem.release()
+
+
+def _run_jobs(jobs: list, run, end=None) -> list:
+    """
+    Run (key, payload) jobs round-robin across keys, at most
+    BULK_MAX_WORKERS at a time. Returns [(key, payload, result | None,
+    status)] in completion order; status is "done", "error" or
+    "timed_out".
+    """
+    queues = OrderedDict()
+    for key, payload in jobs:
+        queues.setdefault(key, deque()).append(payload)
+
+    done     = []
+    cond     = threading.Condition()
+    inflight = [0]
+    pool     = ThreadPoolExecutor(max_workers=max(min(BULK_MAX_WORKERS, len(jobs)), 1))
+
+    def _finish(key, payload, fut):
+        try:
+            item = (key, payload, fut.result(), "done")
+        except Exception:
+            item = (key, payload, None, "error")
+        with cond:
+            done.append(item)
+            inflight[0] -= 1
+            cond.notify()
+
+    order = deque(queues)                # round-robin over platforms
+    try:
+        while order:
+            with cond:
+                while inflight[0] >= BULK_MAX_WORKERS and not deadline.expired_at(end):
+                    cond.wait(_POLL)
+            if deadline.expired_at(end):
+                break
+            key = order[0]
+            order.rotate(-1)
+            payload = queues[key].popleft()
+            if not queues[key]:
+                order.remove(key)
+            with cond:
+                inflight[0] += 1
+            fut = deadline.submit(pool, run, key, payload, end=end)
+            fut.add_done_callback(lambda f, k=key, p=payload: _finish(k, p, f))
+
+        with cond:
+            while inflight[0]:
+                if deadline.expired_at(end):
+                    break
+                cond.wait(_POLL)
+            finished = list(done)
+    finally:
+        pool.shutdown(wait=False)
+
+    seen = {(k, id(p)) for k, p, _, _ in finished}
+    for key, payload in jobs:
+        if (key, id(payload)) not in seen:
+            finished.append((key, payload, None, "timed_out"))
+    return finished
+
+
+def compare_bulk(products: list, deadline_s: float = None) -> dict:
+    """
+    Price every product on every platform with globally scheduled fetches.
+
+    Returns {products: [{product, floor, best, results, timed_out}],
+    skipped: [queries beyond BULK_MAX_PRODUCTS], throughput: {products,
+    unique, completed, skipped, jobs, elapsed_s, products_per_min},
+    platforms: {key: {jobs, ok, fallback, no_price, timed_out,
+    success_rate, avg_latency_ms}}, deadline_s}.
+    """
+    from tools import ecommerce as ec
+
+    products = [p for p in (products or []) if p and p.strip()]
+    skipped  = products[BULK_MAX_PRODUCTS:]
+    products = products[:BULK_MAX_PRODUCTS]
+    t0       = time.perf_counter()
+    end      = deadline.at(deadline_s)
+
+    # ── one plan per unique product ───────────────────────────────
+    plans = OrderedDict()                          # canonical key → plan
+    order = []                                     # canonical key per input product
+    for query in products:
+        plan = ec._plan_comparison(query)
+        order.append(canonical_key(plan['product']))
+        plans.setdefault(order[-1], plan)
+
+    jobs = []
+    for ckey, plan in plans.items():
+        for platform in plan['platforms']:
+            jobs.append((ec._health_key(platform), {"ckey": ckey, "platform": platform}))
+
+    def _run(key, job):
+        plan = plans[job["ckey"]]
+        return ec._platform_price(job["platform"], plan['product'], plan['floor'])
+
+    token = _limited.set(True)
+    try:
+        with ec.shared_sessions():
+            finished = _run_jobs(jobs, _run, end)
+    finally:
+        _limited.reset(token)
+
+    # ── per-product comparisons ───────────────────────────────────
+    records = {ckey: [] for ckey in plans}
+    for key, job, rec, status in finished:
+        if rec is None:
+            rec = ec._price_record(job["platform"], None, None,
+                                   "timed_out" if status == "timed_out" else None)
+        records[job["ckey"]].append((key, rec))
+
+    by_key = {}
+    for ckey, plan in plans.items():
+        summary = ec._summary([rec for _, rec in records[ckey]], t0)
+        by_key[ckey] = {"product": plan['product'], "floor": plan['floor'],
+                        "best": summary['best'], "results": summary['results'],
+                        "timed_out": summary['timed_out']}
+
+    # ── aggregate statistics ──────────────────────────────────────
+    platforms = {}
+    for ckey, recs in records.items():
+        for key, rec in recs:
+            st = platforms.setdefault(key, {"jobs": 0, "ok": 0, "fallback": 0,
+                                            "no_price": 0, "timed_out": 0, "_lat": []})
+            st["jobs"] += 1
+            if rec['status'] == 'ok':
+                st["ok"] += 1
+                if rec['via'] == 'fallback':
+                    st["fallback"] += 1
+                if rec.get('latency_ms') is not None and not rec.get('cached'):
+                    st["_lat"].append(rec['latency_ms'])
+            else:
+                st[rec['status']] = st.get(rec['status'], 0) + 1
+    for st in platforms.values():
+        lat = st.pop("_lat")
+        st["success_rate"]   = round(st["ok"] / st["jobs"], 3) if st["jobs"] else None
+        st["avg_latency_ms"] = round(sum(lat) / len(lat)) if lat else None
+
+    elapsed   = time.perf_counter() - t0
+    completed = sum(1 for ckey in order if not by_key[ckey]['timed_out'])
+    return {
+        "products":   [by_key[ckey] for ckey in order],
+        "skipped":    skipped,
+        "throughput": {
+            "products":         len(products),
+            "unique":           len(plans),
+            "completed":        completed,          # every platform answered in time
+            "skipped":          len(skipped),       # beyond BULK_MAX_PRODUCTS, not priced
+            "jobs":             len(jobs),
+            "elapsed_s":        round(elapsed, 2),
+            "products_per_min": round(completed / elapsed * 60, 1) if elapsed > 0 else None,
+        },
+        "platforms":  dict(sorted(platforms.items())),
+        "deadline_s": deadline_s,
+    }
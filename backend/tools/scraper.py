@@ -1,7 +1,9 @@
 # backend/tools/scraper.py
 import requests
-from bs4 import BeautifulSoup
 from config import REQUEST_TIMEOUT, MAX_SCRAPE_CONTENT, WEB_REQUEST_DELAY
+from tools.http_cache import cached_get, is_fresh
+from tools import parse_pool
+from tools.extractors import extract_outline
 import time
 
 
@@ -19,7 +21,9 @@ def scrape_and_summarize(url):
 
             result += f"🔄 Attempt {attempt + 1}/{max_retries}...\n"
 
-            time.sleep(WEB_REQUEST_DELAY)
+            # Politeness delay only when we are about to hit the origin
+            if not is_fresh(url):
+                time.sleep(WEB_REQUEST_DELAY)
 
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -27,17 +31,20 @@ def scrape_and_summarize(url):
                 "Accept-Language": "en-US,en;q=0.5"
             }
 
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            # Streamed and capped — output is cut to MAX_SCRAPE_CONTENT anyway
+            response = cached_get(url, headers=headers, timeout=REQUEST_TIMEOUT,
+                                  use_case="scrape")
 
             response.raise_for_status()
 
-            result += f"✅ Success on attempt {attempt+1}\n\n{'='*60}\n\n"
+            result += f"✅ Success on attempt {attempt+1}\n"
+            if response.truncated:
+                result += f"✂️ Large page — parsed first {len(response.content) // 1024} KB\n"
+            result += f"\n{'='*60}\n\n"
 
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Remove unwanted elements
-            for element in soup(["script", "style", "nav", "footer", "header", "aside", "iframe"]):
-                element.decompose()
+            # Parse + extract in a worker process — we only get plain data back
+            page = parse_pool.run(extract_outline, response.content,
+                                  parse_pool.charset(response))
 
             content_found = False
 
@@ -45,31 +52,25 @@ def scrape_and_summarize(url):
             # Page Title
             # -----------------------------
 
-            title = soup.find("title")
-
-            if title:
-                result += f"📌 Title: {title.get_text().strip()}\n\n"
+            if page["title"] is not None:
+                result += f"📌 Title: {page['title']}\n\n"
 
             # -----------------------------
             # Tables
             # -----------------------------
 
-            tables = soup.find_all("table")
-
-            if tables:
-                result += f"📊 TABLES FOUND ({len(tables)}):\n{'='*60}\n\n"
-                result += extract_tables_formatted(tables)
+            if page["tables"]:
+                result += f"📊 TABLES FOUND ({page['n_tables']}):\n{'='*60}\n\n"
+                result += extract_tables_formatted(page["tables"])
                 result += "\n"
 
             # -----------------------------
             # Lists
             # -----------------------------
 
-            lists = soup.find_all(["ul", "ol"])
-
-            if lists:
+            if page["lists"]:
                 result += f"\n📋 LISTS AS TABLES\n{'-'*60}\n\n"
-                result += extract_lists_as_tables(lists[:3])
+                result += extract_lists_as_tables(page["lists"])
 
             # -----------------------------
             # Structured content
@@ -77,16 +78,12 @@ def scrape_and_summarize(url):
 
             result += f"\n📄 CONTENT\n{'-'*60}\n\n"
 
-            for heading in soup.find_all(["h1", "h2", "h3"])[:10]:
-
-                heading_text = heading.get_text().strip()
-
-                if not heading_text or len(heading_text) < 3:
-                    continue
+            for section in page["sections"]:
 
                 content_found = True
 
-                level = heading.name
+                heading_text = section["heading"]
+                level = section["level"]
 
                 if level == "h1":
                     result += f"\n## {heading_text}\n{'='*40}\n"
@@ -95,37 +92,13 @@ def scrape_and_summarize(url):
                 else:
                     result += f"\n#### {heading_text}\n"
 
-                next_elem = heading.find_next_sibling()
-
-                para_count = 0
-
-                while next_elem and para_count < 2:
-
-                    if next_elem.name == "p":
-
-                        para_text = next_elem.get_text().strip()
-
-                        if para_text and len(para_text) > 20:
-                            result += f"\n{para_text}\n"
-                            para_count += 1
-
-                    elif next_elem.name in ["h1", "h2", "h3"]:
-                        break
-
-                    elif next_elem.name in ["ul", "ol"]:
-
-                        items = next_elem.find_all("li")[:5]
+                for kind, block in section["blocks"]:
 
-                        for item in items:
-
-                            text = item.get_text().strip()
-
-                            if text:
-                                result += f"  • {text}\n"
-
-                        para_count += 1
-
-                    next_elem = next_elem.find_next_sibling()
+                    if kind == "p":
+                        result += f"\n{block}\n"
+                    else:
+                        for text in block:
+                            result += f"  • {text}\n"
 
             # -----------------------------
             # Fallback paragraphs
@@ -135,11 +108,7 @@ def scrape_and_summarize(url):
 
                 result += "\n📝 Main Content\n\n"
 
-                paragraphs = soup.find_all("p")
-
-                for p in paragraphs[:15]:
-
-                    text = p.get_text().strip()
+                for text in page["paragraphs"]:
 
                     if text and len(text) > 30:
                         result += f"{text}\n\n"
@@ -148,21 +117,7 @@ def scrape_and_summarize(url):
             # Extract links
             # -----------------------------
 
-            links = soup.find_all("a", href=True)
-
-            valid_links = []
-
-            for link in links:
-
-                href = link.get("href")
-
-                text = link.get_text().strip()
-
-                if href and text and len(text) > 3 and len(text) < 100:
-
-                    if href.startswith("http") or href.startswith("/"):
-
-                        valid_links.append((text, href))
+            valid_links = page["links"]
 
             if valid_links and len(valid_links) <= 10:
 
@@ -220,19 +175,18 @@ def scrape_and_summarize(url):
 # ---------------------------------------------------
 
 def extract_tables_formatted(tables):
+    """tables: list of tables, each a list of rows of cell text (first row = header)."""
 
     output = ""
 
-    for idx, table in enumerate(tables[:5], 1):
+    for idx, rows in enumerate(tables[:5], 1):
 
         output += f"Table {idx}\n"
 
-        rows = table.find_all("tr")
-
         if not rows:
             continue
 
-        headers = [th.get_text().strip() for th in rows[0].find_all(["th", "td"])]
+        headers = rows[0]
 
         rows = rows[1:]
 
@@ -242,9 +196,9 @@ def extract_tables_formatted(tables):
 
         output += "|" + "|".join("-"*(w+2) for w in col_widths) + "|\n"
 
-        for row in rows[:20]:
+        for cells in rows[:20]:
 
-            cells = [td.get_text().strip() for td in row.find_all(["td", "th"])]
+            cells = list(cells)
 
             while len(cells) < len(headers):
                 cells.append("")
@@ -263,12 +217,13 @@ def extract_tables_formatted(tables):
 # ---------------------------------------------------
 
 def extract_lists_as_tables(lists):
+    """lists: list of lists of item text."""
 
     output = ""
 
-    for idx, lst in enumerate(lists, 1):
+    for idx, items in enumerate(lists, 1):
 
-        items = lst.find_all("li")[:15]
+        items = items[:15]
 
         if not items:
             continue
@@ -278,8 +233,7 @@ def extract_lists_as_tables(lists):
         output += "| Item |\n"
         output += "|------|\n"
 
-        for item in items:
-            text = item.get_text().strip()
+        for text in items:
             if text:
                 output += f"| {text} |\n"
 
@@ -0,0 +1,117 @@
+# backend/tools/selector_stats.py
+"""
+Adaptive selector ordering for the Amazon / Flipkart scrapers.
+
+Each (platform, kind) — kind ∈ card, price, title, rating — keeps a
+decayed hit score per CSS selector:
+
+    score ← score × SELECTOR_STATS_DECAY   (every selector, every scrape)
+    score ← score + 1                      (the selector that matched)
+
+plan(platform) returns the selector lists from extractors.SELECTOR_SETS
+sorted by descending score (unseen selectors keep their default order
+after the scored ones), so the usual winner is tried first and CSS
+selection stops after one or two select() calls instead of ten. With a
+decay of 0.8 a new layout overtakes a long-standing winner after about
+four scrapes.
+
+The extractors take the first selector that matches, so order decides
+which element is returned. Scores only reorder the precise selectors
+among themselves; extractors.BROAD_SELECTORS (which also match MRP or
+strike-through prices) stay behind them however often they win, and
+cannot reinforce themselves past a precise match.
+
+Scores persist to SELECTOR_STATS_PATH (JSON) every
+SELECTOR_STATS_SAVE_EVERY updates and on shutdown.
+"""
+
+import json
+import os
+import threading
+
+from config import SELECTOR_STATS_PATH, SELECTOR_STATS_DECAY, SELECTOR_STATS_SAVE_EVERY
+from tools.extractors import SELECTOR_SETS, BROAD_SELECTORS
+
+_lock    = threading.Lock()
+_scores  = None        # {"platform/kind": {selector: score}}
+_pending = 0           # updates since the last save
+
+
+def _load():
+    global _scores
+    if _scores is None:
+        try:
+            with open(SELECTOR_STATS_PATH, 'r', encoding='utf-8') as f:
+                _scores = json.load(f)
+        except (OSError, ValueError):
+            _scores = {}
+    return _scores
+
+
+def _save_locked():
+    global _pending
+    try:
+        os.makedirs(os.path.dirname(SELECTOR_STATS_PATH), exist_ok=True)
+        tmp = f"{SELECTOR_STATS_PATH}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(_scores, f, indent=1)
+        os.replace(tmp, SELECTOR_STATS_PATH)
+        _pending = 0
+    except OSError:
+        pass
+
+
+def ordered(platform: str, kind: str, selectors: list) -> list:
+    """
+    selectors sorted by decayed hit score within their tier — precise
+    first, BROAD_SELECTORS last (stable for ties / unseen).
+    """
+    with _lock:
+        scores = dict(_load().get(f"{platform}/{kind}", {}))
+    rank = {sel: i for i, sel in enumerate(selectors)}
+    return sorted(selectors, key=lambda sel: (sel in BROAD_SELECTORS,
+                                              -scores.get(sel, 0.0), rank[sel]))
+
+
+def plan(platform: str) -> dict:
+    """{kind: ordered selector list} for an extractor's selectors= argument."""
+    return {kind: ordered(platform, kind, sels)
+            for kind, sels in SELECTOR_SETS.get(platform, {}).items()}
+
+
+def record(platform: str, matched: dict):
+    """
+    Register one scrape's winners — {kind: selector or None}. Kinds that
+    were tried but matched nothing (None) only decay.
+    """
+    global _pending
+    if not matched:
+        return
+    with _lock:
+        data = _load()
+        for kind, sel in matched.items():
+            key    = f"{platform}/{kind}"
+            scores = data.setdefault(key, {})
+            for s in list(scores):
+                scores[s] *= SELECTOR_STATS_DECAY
+                if scores[s] < 0.01:
+                    del scores[s]
+            if sel:
+                scores[sel] = scores.get(sel, 0.0) + 1.0
+        _pending += 1
+        if _pending >= SELECTOR_STATS_SAVE_EVERY:
+            _save_locked()
+
+
+def snapshot() -> dict:
+    """Current scores, best first (debugging)."""
+    with _lock:
+        return {key: dict(sorted(scores.items(), key=lambda kv: -kv[1]))
+                for key, scores in _load().items()}
+
+
+def save():
+    """Flush pending updates (FastAPI shutdown hook)."""
+    with _lock:
+        if _scores is not None and _pending:
+            _save_locked()
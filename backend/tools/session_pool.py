@@ -0,0 +1,264 @@
+# backend/tools/session_pool.py
+"""
+Warm per-domain session pool for the marketplace scrapers.
+
+Amazon, Flipkart and Myntra want cookies from their home page before a
+search is served. Instead of every scrape opening a new session and
+paying that warm-up round trip (plus Amazon's 0.5s pause), a background
+thread keeps SESSION_POOL_SIZE warmed sessions per platform ready:
+
+  borrow(platform)   context manager — yields an idle warm session; when
+                     none is idle a new one is built from the platform's
+                     last cookie jar (no network round trip) and the
+                     refresher is woken to top the pool back up
+  report_block(s)    the session hit a bot wall — it is dropped instead
+                     of returned, and the platform's jar is re-warmed
+  start() / stop()   background refresher (FastAPI startup / shutdown)
+
+Jars are re-warmed every SESSION_POOL_REFRESH seconds and after a block.
+Cookie jars (with the User-Agent they were issued to) persist to
+SESSION_POOL_PATH, so a restart begins warm.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from config import (
+    SESSION_POOL_ENABLED, SESSION_POOL_PATH, SESSION_POOL_SIZE,
+    SESSION_POOL_REFRESH,
+)
+
+# Warm-up recipe per platform
+RECIPES = {
+    "amazon": {
+        "home": "https://www.amazon.in/",
+    },
+    "flipkart": {
+        "home":    "https://www.flipkart.com/",
+        "cookies": {"T": ("0", ".flipkart.com")},
+        "headers": {
+            "sec-ch-ua": '"Chromium";v="124", "Google Chrome";v="124"',
+            "sec-ch-ua-mobile": "?0",
+            "sec-ch-ua-platform": '"Windows"',
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-Site": "same-origin",
+            "Sec-Fetch-User": "?1",
+        },
+    },
+    "myntra": {
+        "home":    "https://www.myntra.com/",
+        "headers": {"X-Myntra-Abtest": "false"},
+    },
+}
+
+_CHECK_EVERY = 30        # seconds between refresher passes
+
+_lock    = threading.Lock()
+_idle    = {p: deque() for p in RECIPES}     # platform → warm sessions
+_jars    = None          # platform → {"ua", "cookies", "warmed_at"}
+_stale   = set()         # platforms whose jar must be re-warmed
+_wake    = threading.Event()
+_stop    = threading.Event()
+_thread  = None
+_stats   = {"borrowed": 0, "cold": 0, "warmups": 0, "blocks": 0}
+
+
+# ──────────────────────────────────────────────────────────────────
+# Cookie jars (persisted)
+# ──────────────────────────────────────────────────────────────────
+def _load():
+    global _jars
+    if _jars is None:
+        try:
+            with open(SESSION_POOL_PATH, 'r', encoding='utf-8') as f:
+                _jars = json.load(f)
+        except (OSError, ValueError):
+            _jars = {}
+    return _jars
+
+
+def _save_locked():
+    try:
+        os.makedirs(os.path.dirname(SESSION_POOL_PATH), exist_ok=True)
+        tmp = f"{SESSION_POOL_PATH}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(_jars, f, indent=1)
+        os.replace(tmp, SESSION_POOL_PATH)
+    except OSError:
+        pass
+
+
+def _dump_cookies(s) -> list:
+    return [{"name": c.name, "value": c.value, "domain": c.domain,
+             "path": c.path, "expires": c.expires, "secure": c.secure}
+            for c in s.cookies]
+
+
+# ──────────────────────────────────────────────────────────────────
+# Session construction
+# ──────────────────────────────────────────────────────────────────
+def _build(platform: str, jar: dict = None):
+    """Session with the platform's headers and (optionally) a saved jar."""
+    from tools.ecommerce import _new_session, _UA
+
+    recipe = RECIPES[platform]
+    s = _new_session(recipe["home"])
+    s.headers["User-Agent"] = (jar or {}).get("ua") or random.choice(_UA)
+    s.headers.update(recipe.get("headers", {}))
+    for name, (value, domain) in recipe.get("cookies", {}).items():
+        s.cookies.set(name, value, domain=domain)
+    now = time.time()
+    for c in (jar or {}).get("cookies", []):
+        if c.get("expires") and c["expires"] < now:
+            continue
+        s.cookies.set(c["name"], c["value"], domain=c["domain"], path=c["path"],
+                      expires=c.get("expires"), secure=c.get("secure", False))
+    return s
+
+
+def _warm(platform: str):
+    """Fresh session + home-page round trip → new jar for the platform."""
+    from tools import stream_fetch
+
+    s = _build(platform)
+    try:
+        stream_fetch.get(RECIPES[platform]["home"], "cookies", session=s, timeout=5)
+    except Exception:
+        s.close()
+        return None
+    with _lock:
+        _stats["warmups"] += 1
+        _load()[platform] = {"ua": s.headers["User-Agent"],
+                             "cookies": _dump_cookies(s), "warmed_at": time.time()}
+        _stale.discard(platform)
+        _save_locked()
+    return s
+
+
+def _jar_age(platform: str) -> float:
+    jar = _load().get(platform)
+    return time.time() - jar["warmed_at"] if jar else float("inf")
+
+
+def _refresh_once():
+    """Re-warm stale / expired jars and top every pool up to SESSION_POOL_SIZE."""
+    for platform in RECIPES:
+        with _lock:
+            expired = platform in _stale or _jar_age(platform) > SESSION_POOL_REFRESH
+            if expired:
+                for s in _idle[platform]:
+                    s.close()
+                _idle[platform].clear()
+            missing = SESSION_POOL_SIZE - len(_idle[platform])
+        if expired:
+            s = _warm(platform)
+            if s is None:
+                continue
+            with _lock:
+                _idle[platform].append(s)
+            missing -= 1
+        for _ in range(max(missing, 0)):
+            with _lock:
+                jar = _load().get(platform)
+            if jar is None:
+                break
+            s = _build(platform, jar)       # same jar, no round trip
+            with _lock:
+                _idle[platform].append(s)
+
+
+def _run():
+    while not _stop.is_set():
+        try:
+            _refresh_once()
+        except Exception:
+            pass
+        _wake.wait(_CHECK_EVERY)
+        _wake.clear()
+
+
+# ──────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────
+def start():
+    """Start the background refresher (FastAPI startup hook)."""
+    global _thread
+    if not SESSION_POOL_ENABLED or (_thread and _thread.is_alive()):
+        return
+    with _lock:
+        _load()
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="session-pool", daemon=True)
+    _thread.start()
+
+
+def stop():
+    """Stop the refresher and close idle sessions (FastAPI shutdown hook)."""
+    _stop.set()
+    _wake.set()
+    with _lock:
+        for q in _idle.values():
+            while q:
+                q.popleft().close()
+
+
+@contextmanager
+def borrow(platform: str):
+    """
+    Yield a ready session for platform ("amazon" | "flipkart" | "myntra").
+    The session goes back to the pool afterwards unless report_block()
+    was called for it.
+    """
+    with _lock:
+        _stats["borrowed"] += 1
+        s = _idle[platform].popleft() if _idle[platform] else None
+        jar = _load().get(platform) if s is None else None
+        if s is None:
+            _stats["cold"] += 1
+    if s is None:
+        s = _build(platform, jar)       # cold: saved cookies, or none at all
+        if jar is None and SESSION_POOL_ENABLED:
+            with _lock:
+                _stale.add(platform)
+        _wake.set()
+    try:
+        yield s
+    finally:
+        with _lock:
+            keep = (SESSION_POOL_ENABLED and not getattr(s, "_blocked", False)
+                    and platform not in _stale
+                    and len(_idle[platform]) < SESSION_POOL_SIZE)
+            if keep:
+                _idle[platform].append(s)
+        if not keep:
+            s.close()
+
+
+def report_block(s, platform: str):
+    """The session met a bot wall — drop it and re-warm the platform's jar."""
+    s._blocked = True
+    with _lock:
+        _stats["blocks"] += 1
+        _stale.add(platform)
+    _wake.set()
+
+
+def snapshot() -> dict:
+    """Pool sizes, jar ages and counters (health endpoint payload)."""
+    with _lock:
+        jars = _load()
+        return {
+            "platforms": {
+                p: {"idle": len(_idle[p]),
+                    "jar_age_s": round(time.time() - jars[p]["warmed_at"]) if p in jars else None,
+                    "stale": p in _stale}
+                for p in RECIPES
+            },
+            **_stats,
+        }
@@ -0,0 +1,165 @@
+# backend/tools/stream_fetch.py
+"""
+Size-capped streaming downloads with early termination.
+
+get() streams the response body in FETCH_CHUNK_SIZE chunks and stops as
+soon as one of these is true:
+  • the use-case byte cap from FETCH_MAX_BYTES is reached
+  • a stop rule (STOP_RULES) has seen enough target elements — e.g. the
+    first 15 Amazon result cards are complete — via an incremental lxml
+    HTMLPullParser fed with every chunk
+
+The returned requests.Response carries the bytes read so far in
+.content / .text and a .truncated flag, so every existing caller and
+parse-worker extractor works unchanged on the shortened body.
+.stopped_early tells a stop-rule cut apart from the byte cap: a caller
+whose fallback parse needs the whole page refetches without the rule. Closing a
+response early drops its keep-alive connection; the saved transfer on
+multi-megabyte result pages is worth far more than one new handshake.
+
+Under an overall deadline (tools/deadline.py) the request timeout is cut
+to the remaining budget and the download stops — truncated — when the
+budget runs out mid-body.
+"""
+
+import requests
+
+from config import FETCH_CHUNK_SIZE, FETCH_MAX_BYTES, REQUEST_TIMEOUT
+from tools.parse_pool import charset
+from tools import deadline
+
+
+# ──────────────────────────────────────────────────────────────────
+# Early-stop rules — rule → (tag, {attr: token-or-substring}, count)
+# Counts match how many elements the extractors actually look at.
+# ──────────────────────────────────────────────────────────────────
+STOP_RULES = {
+    # Amazon search page — extract_amazon checks the first 15 cards
+    "amazon_results":   ("div", {"data-component-type": "s-search-result"}, 15),
+    # Flipkart search page — ~2 product links per card, first 20 cards.
+    # Only the card strategy fits in that prefix; _scrape_flipkart refetches
+    # the whole page when it has to fall back to the page scan.
+    "flipkart_results": ("a",   {"href": "/p/"}, 40),
+    # Bing SERP / DuckDuckGo HTML — snippet extractors use the first 10
+    "bing_results":     ("li",  {"class": "b_algo"}, 10),
+    "ddg_results":      ("div", {"class": "result"}, 10),
+}
+
+
+# ──────────────────────────────────────────────────────────────────
+# Bot-wall pages — matched on the lower-cased body of small responses.
+# Bare "captcha" is not a marker: small legitimate pages load reCAPTCHA
+# on login/newsletter forms.
+# ──────────────────────────────────────────────────────────────────
+WALL_MARKERS  = (
+    b'<title>access denied</title>',               # Akamai edge block
+    b'<title>just a moment...</title>',            # Cloudflare challenge
+    b'/cdn-cgi/challenge-platform/',
+)
+BLOCK_MARKERS = {
+    'amazon':   (b'/errors/validatecaptcha', b'api-services-support@amazon.com',
+                 b'<title>robot check</title>'),
+    'flipkart': (b'<title>flipkart recaptcha</title>', b'are you a human?'),
+}
+_WALL_MAX_BYTES = 40000          # real result pages are far larger
+
+
+def bot_wall(body: bytes, key: str = None) -> bool:
+    """True for an interstitial — generic markers plus BLOCK_MARKERS[key]."""
+    body = body or b''
+    if len(body) >= _WALL_MAX_BYTES:
+        return False
+    body = body.lower()
+    return any(m in body for m in WALL_MARKERS + BLOCK_MARKERS.get(key, ()))
+
+
+class _StopProbe:
+    """Incremental parser that reports when a stop rule is satisfied."""
+
+    def __init__(self, rule: str, encoding: str = None):
+        from lxml import etree
+        self.tag, self.attrs, self.needed = STOP_RULES[rule]
+        kwargs = {"encoding": encoding} if encoding else {}
+        self.parser = etree.HTMLPullParser(events=("end",), tag=self.tag, **kwargs)
+        self.found  = 0
+
+    def _matches(self, el) -> bool:
+        for name, want in self.attrs.items():
+            val = el.get(name) or ''
+            if name == 'class':
+                if want not in val.split():
+                    return False
+            elif want not in val:
+                return False
+        return True
+
+    def feed(self, chunk: bytes) -> bool:
+        """Feed one chunk; True once enough target elements have closed."""
+        self.parser.feed(chunk)
+        for _, el in self.parser.read_events():
+            if self._matches(el):
+                self.found += 1
+        return self.found >= self.needed
+
+
+def read_capped(response, max_bytes: int = None, stop: str = None) -> tuple:
+    """
+    Read a stream=True response up to max_bytes, ending early once the
+    stop rule is met. Returns (body_bytes, truncated).
+    """
+    body, truncated, _ = _read(response, max_bytes, stop)
+    return body, truncated
+
+
+def _read(response, max_bytes: int = None, stop: str = None) -> tuple:
+    """read_capped() plus whether the stop rule (not the cap) ended the read."""
+    probe = None
+    if stop:
+        try:
+            probe = _StopProbe(stop, charset(response))
+        except Exception:
+            probe = None          # lxml missing / bad charset → byte cap only
+
+    chunks, size = [], 0
+    try:
+        if max_bytes == 0:
+            return b'', True, False
+        for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+            if not chunk:
+                continue
+            if max_bytes is not None and size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                return b''.join(chunks), True, False
+            chunks.append(chunk)
+            size += len(chunk)
+            if deadline.expired():
+                return b''.join(chunks), True, False
+            if probe is not None:
+                try:
+                    if probe.feed(chunk):
+                        return b''.join(chunks), True, True
+                except Exception:
+                    probe = None
+        return b''.join(chunks), False, False
+    finally:
+        response.close()
+
+
+def get(url: str, use_case: str, session=None, stop: str = None,
+        timeout: float = REQUEST_TIMEOUT, **kwargs) -> requests.Response:
+    """
+    Streaming GET capped at FETCH_MAX_BYTES[use_case].
+
+    session — optional requests.Session (headers/cookies kept)
+    stop    — STOP_RULES key for early termination on result pages
+    The response has .content already filled and .truncated /
+    .stopped_early set.
+    """
+    getter = session.get if session is not None else requests.get
+    r      = getter(url, stream=True, timeout=deadline.timeout(timeout), **kwargs)
+    body, truncated, stopped = _read(r, FETCH_MAX_BYTES.get(use_case), stop)
+    r._content          = body
+    r._content_consumed = True
+    r.truncated         = truncated
+    r.stopped_early     = stopped
+    return r